@@ -1,83 +1,301 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+import logging
 import pickle
+import random
+import time
 import traceback
 import pandas as pd
 import os
-import uuid
-import json
-from datathon_package.applicants import process_applicants_data
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.artifact import artifact_mtime
+from datathon_package.serving import PredictionService, MicroBatcher, ModelStore
+from datathon_package.cache import PredictionCache, LocalCacheBackend, RedisCacheBackend, file_checksum
+from datathon_package.metrics import MetricsRegistry, BATCH_SIZE_BUCKETS, SIZE_BUCKETS
 
 app = Flask(__name__)
 
+# Logs por requisição: LOG_LEVEL=DEBUG registra cada requisição e o corpo de uma amostra
+# delas (DEBUG_LOG_SAMPLE_RATE); SERVER_TIMING_HEADERS=1 devolve os tempos por etapa no header Server-Timing
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+DEBUG_LOG_SAMPLE_RATE = float(os.getenv("DEBUG_LOG_SAMPLE_RATE", "0.01"))
+SERVER_TIMING_HEADERS = os.getenv("SERVER_TIMING_HEADERS", "0") == "1"
+
+logger = logging.getLogger("api")
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+logger.setLevel(LOG_LEVEL)
+
 # Caminho absoluto ao diretório atual (onde este script está localizado)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Artefato de serving (booster nativo + metadados) exportado pelo treino
+SERVING_ARTIFACT_DIR = os.getenv("SERVING_ARTIFACT_DIR", os.path.join("models", "serving"))
+# Intervalo entre verificações de um novo artefato (0 desativa o hot reload)
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", "5"))
+
 # Caminho do modelo
 MODEL_PATH = os.path.join("models", "lgbm_oversample_model.pkl")
 
-# Carrega o modelo
-print(f"[INFO] Carregando modelo de: {MODEL_PATH}")
-try:
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
-    print("[INFO] Modelo carregado com sucesso.")
-except Exception as e:
-    print(f"[ERRO] Falha ao carregar modelo: {e}")
-    raise
+# Caminho do featurizer salvo junto com o modelo
+FEATURIZER_PATH = os.path.join("models", "applicant_featurizer.pkl")
+
+if artifact_mtime(SERVING_ARTIFACT_DIR) is not None:
+    # Carregado já no import (no master, com preload_app) e compartilhado entre os workers por
+    # copy-on-write; cada worker só recarrega quando o treino exporta um novo artefato
+    model_store = ModelStore(SERVING_ARTIFACT_DIR, check_interval=MODEL_RELOAD_INTERVAL_SECONDS)
+    model_store.get()
+    model = featurizer = None
+    MODEL_VERSION = None
+    print(f"[INFO] Artefato de serving carregado de: {SERVING_ARTIFACT_DIR} (versão {model_store.version})")
+else:
+    model_store = None
+
+    # Carrega o modelo
+    print(f"[INFO] Carregando modelo de: {MODEL_PATH}")
+    try:
+        with open(MODEL_PATH, "rb") as f:
+            model = pickle.load(f)
+        print("[INFO] Modelo carregado com sucesso.")
+    except Exception as e:
+        print(f"[ERRO] Falha ao carregar modelo: {e}")
+        raise
+
+    # Carrega o featurizer (uma única vez, compartilhado por todas as requisições)
+    if os.path.exists(FEATURIZER_PATH):
+        featurizer = ApplicantFeaturizer.load(FEATURIZER_PATH)
+        print(f"[INFO] Featurizer carregado de: {FEATURIZER_PATH}")
+    else:
+        # Modelos antigos não têm featurizer salvo: usa as colunas registradas no próprio modelo
+        featurizer = ApplicantFeaturizer().fit(pd.DataFrame(columns=model.feature_name_))
+        print("[INFO] Featurizer não encontrado; usando as colunas do modelo.")
+
+    MODEL_VERSION = file_checksum(MODEL_PATH)
+
+# Micro-batching: requisições concorrentes dentro da janela viram uma única chamada ao modelo
+PREDICT_BATCH_WINDOW_MS = float(os.getenv("PREDICT_BATCH_WINDOW_MS", "5"))
+PREDICT_BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))
+# Tempo máximo de espera pela predição (0 desativa); passado o limite a resposta é 504
+PREDICT_TIMEOUT_SECONDS = float(os.getenv("PREDICT_TIMEOUT_SECONDS", "10"))
+
+# Cache de predições: a versão do modelo (checksum do .pkl ou do artefato) faz parte da chave
+PREDICTION_CACHE_BACKEND = os.getenv("PREDICTION_CACHE_BACKEND", "memory")
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "100000"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600"))
+
+if PREDICTION_CACHE_BACKEND == "redis":
+    cache_backend = RedisCacheBackend(
+        os.getenv("PREDICTION_CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl_seconds=PREDICTION_CACHE_TTL_SECONDS
+    )
+elif PREDICTION_CACHE_BACKEND == "memory":
+    cache_backend = LocalCacheBackend(PREDICTION_CACHE_MAX_ENTRIES, ttl_seconds=PREDICTION_CACHE_TTL_SECONDS)
+else:
+    cache_backend = None
+prediction_cache = PredictionCache(cache_backend, MODEL_VERSION) if cache_backend is not None else None
+print(f"[INFO] Cache de predições: {PREDICTION_CACHE_BACKEND}")
+
+# Threads do LightGBM por chamada de predição em cada worker (0 usa o padrão do LightGBM)
+SCORING_NUM_THREADS = int(os.getenv("SCORING_NUM_THREADS", "1"))
+
+# Métricas no formato do Prometheus em /metrics (por processo/worker)
+metrics_registry = MetricsRegistry()
+REQUESTS = metrics_registry.counter("api_requests_total", "Requisições por endpoint e status HTTP", ["endpoint", "status"])
+ERRORS = metrics_registry.counter("api_errors_total", "Requisições com erro (4xx/5xx) por endpoint", ["endpoint"])
+REQUEST_SECONDS = metrics_registry.histogram("api_request_seconds", "Latência total por endpoint", ["endpoint"])
+STAGE_SECONDS = metrics_registry.histogram(
+    "api_stage_seconds", "Tempo por etapa (parse, featurize, predict, serialize)", ["stage"]
+)
+REQUEST_BYTES = metrics_registry.histogram(
+    "api_request_bytes", "Tamanho do corpo das requisições", ["endpoint"], buckets=SIZE_BUCKETS
+)
+BATCH_SIZE = metrics_registry.histogram(
+    "api_batch_size", "Candidatos pontuados por chamada ao modelo", buckets=BATCH_SIZE_BUCKETS
+)
+CACHE_ERRORS = metrics_registry.counter(
+    "api_cache_errors_total", "Falhas do backend do cache (a requisição segue sem cache)", ["operation"]
+)
+
+def observe_stage(stage: str, seconds: float, n_rows: int) -> None:
+    # featurize/predict são medidos por chamada ao modelo (um lote do micro-batching)
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if stage == "predict":
+        BATCH_SIZE.observe(n_rows)
+
+def observe_cache_error(operation: str, error: Exception) -> None:
+    CACHE_ERRORS.inc(operation=operation)
+    logger.warning("Falha no cache de predições (%s): %s", operation, error)
+
+if isinstance(cache_backend, RedisCacheBackend):
+    cache_backend.error_observer = observe_cache_error
+
+service = PredictionService(
+    model, featurizer, cache=prediction_cache, store=model_store, num_threads=SCORING_NUM_THREADS or None,
+    stage_observer=observe_stage
+)
+batcher = MicroBatcher(service.predict_many, max_batch_size=PREDICT_BATCH_MAX_SIZE, max_wait_ms=PREDICT_BATCH_WINDOW_MS)
 
 @app.route("/health", methods=["GET"])
 def health():
     return jsonify({"status": "ok"}), 200
 
+@app.route("/ready", methods=["GET"])
+def ready():
+    # Só aceita tráfego depois do aquecimento do modelo (ver warm_up)
+    if not service.ready:
+        return jsonify({"status": "warming_up"}), 503
+    return jsonify({"status": "ready"}), 200
+
+def describe_model() -> dict:
+    """
+    Returns the source, version and scoring path of the model being served (body of /model).
+    """
+    scoring = {
+        "fast_path": service.fast_path,
+        "native_calls": service.native_calls,
+        "fallback_calls": service.fallback_calls,
+        "num_threads": SCORING_NUM_THREADS,
+    }
+    if model_store is None:
+        return {"source": MODEL_PATH, "version": MODEL_VERSION, **scoring}
+    return {
+        "source": SERVING_ARTIFACT_DIR,
+        "version": model_store.version,
+        "reloads": model_store.reloads,
+        **scoring,
+    }
+
+def describe_cache() -> dict:
+    """
+    Returns the prediction cache counters (body of /cache/stats).
+    """
+    if prediction_cache is None:
+        return {"backend": None}
+    return prediction_cache.stats(service.model_version)
+
+@app.route("/model", methods=["GET"])
+def model_info():
+    return jsonify(describe_model()), 200
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(metrics_registry.render(), mimetype=MetricsRegistry.CONTENT_TYPE)
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(describe_cache()), 200
+
+def _request_size() -> int:
+    return request.content_length or 0
+
+def _log_request(endpoint: str, content) -> None:
+    logger.debug("Requisição recebida no %s (%d bytes)", endpoint, _request_size())
+    # Dump do corpo só em DEBUG e para uma amostra das requisições
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < DEBUG_LOG_SAMPLE_RATE:
+        logger.debug("JSON recebido: %s", content)
+
+def _respond(endpoint: str, body: dict, status: int, timings: dict, start: float):
+    """
+    Serializes the response and records the request metrics (and the optional Server-Timing header).
+    """
+    serialize_start = time.perf_counter()
+    response = jsonify(body)
+    timings["serialize"] = time.perf_counter() - serialize_start
+    timings["total"] = time.perf_counter() - start
+
+    STAGE_SECONDS.observe(timings["parse"], stage="parse")
+    STAGE_SECONDS.observe(timings["serialize"], stage="serialize")
+    REQUEST_SECONDS.observe(timings["total"], endpoint=endpoint)
+    REQUEST_BYTES.observe(_request_size(), endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    if status >= 400:
+        ERRORS.inc(endpoint=endpoint)
+
+    if SERVER_TIMING_HEADERS:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+        )
+    return response, status
+
 @app.route("/predict", methods=["POST"])
 def predict():
+    start = time.perf_counter()
+    timings = {"parse": 0.0}
     try:
-        print("[INFO] Requisição recebida no /predict")
         content = request.get_json()
-        print("[DEBUG] JSON recebido:", content)
+        timings["parse"] = time.perf_counter() - start
+        _log_request("/predict", content)
 
         if not content or not isinstance(content, dict):
-            return jsonify({"error": "Formato de JSON inválido"}), 400
+            return _respond("/predict", {"error": "Formato de JSON inválido"}, 400, timings, start)
 
-        # Salva os dados recebidos como um JSON temporário
-        temp_id = str(uuid.uuid4())
-        temp_path = f"/tmp/temp_applicants_{temp_id}.json"
+        # Janela 0 desativa o micro-batching
+        model_start = time.perf_counter()
+        if PREDICT_BATCH_WINDOW_MS > 0:
+            results = batcher.submit(content).result(timeout=PREDICT_TIMEOUT_SECONDS or None)
+        else:
+            results = service.predict(content)
+        timings["model"] = time.perf_counter() - model_start
 
-        with open(temp_path, "w") as f:
-            json.dump(content, f)
+        return _respond("/predict", {"results": results}, 200, timings, start)
 
-        # Processa o arquivo com a função existente
-        df = pd.read_json(temp_path)
-        print("[INFO] Pré-processamento inicial:")
-        print(df.head())
+    except FutureTimeoutError:
+        # O lote continua no micro-batcher; a thread da requisição é liberada
+        logger.error("Predição excedeu %.1fs no /predict", PREDICT_TIMEOUT_SECONDS)
+        return _respond("/predict", {"error": "Tempo limite da predição excedido."}, 504, timings, start)
 
-        df_features = process_applicants_data(temp_path, predict=True)
-
-        os.remove(temp_path)
+    except Exception as e:
+        logger.error("Erro na predição: %s", e)
+        return _respond("/predict", {
+            "error": str(e),
+            "trace": traceback.format_exc()
+        }, 500, timings, start)
 
-        if df_features.empty:
-            return jsonify({"error": "Nenhum dado processado"}), 400
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    start = time.perf_counter()
+    timings = {"parse": 0.0}
+    try:
+        content = request.get_json()
+        timings["parse"] = time.perf_counter() - start
+        _log_request("/predict/batch", content)
 
-        # Predições
-        preds = model.predict(df_features)
-        probas = model.predict_proba(df_features)[:, 1]
+        # Aceita um único payload com vários candidatos ou uma lista de payloads
+        payloads = [content] if isinstance(content, dict) else content
+        if not payloads or not isinstance(payloads, list) or not all(isinstance(p, dict) and p for p in payloads):
+            return _respond("/predict/batch", {"error": "Formato de JSON inválido"}, 400, timings, start)
 
-        results = []
-        for i in range(len(preds)):
-            results.append({
-                "applicant_id": df_features.index[i] if df_features.index.name else i,
-                "prediction": int(preds[i]),
-                "probability": round(float(probas[i]), 4)
-            })
+        # Um único featurize-and-score para todos os candidatos
+        model_start = time.perf_counter()
+        results = service.predict_many(payloads)
+        timings["model"] = time.perf_counter() - model_start
 
-        return jsonify({"results": results}), 200
+        if isinstance(content, dict):
+            return _respond("/predict/batch", {"results": results[0]}, 200, timings, start)
+        return _respond("/predict/batch", {"results": results}, 200, timings, start)
 
     except Exception as e:
-        print("[ERRO] Erro na predição:", e)
-        return jsonify({
+        logger.error("Erro na predição em lote: %s", e)
+        return _respond("/predict/batch", {
             "error": str(e),
             "trace": traceback.format_exc()
-        }), 500
+        }, 500, timings, start)
+
+def warm_up():
+    """
+    Warms the model up in the serving process. Under gunicorn it runs in each worker
+    after the fork (see gunicorn.conf.py), so the OpenMP thread pool is never created
+    in the master process.
+    """
+    try:
+        service.warm_up()
+        print(f"[INFO] Modelo aquecido (pid {os.getpid()}).")
+    except Exception as e:
+        print(f"[ERRO] Falha ao aquecer o modelo: {e}")
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5007, debug=True)
+    # Servidor de desenvolvimento; em produção use gunicorn (gunicorn.conf.py)
+    warm_up()
+    app.run(host="0.0.0.0", port=5007, debug=os.getenv("FLASK_DEBUG", "0") == "1")
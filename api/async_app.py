@@ -0,0 +1,230 @@
+# Variante assíncrona da API (aiohttp), com as mesmas rotas e contratos da API Flask:
+#   PYTHONPATH=. python api/async_app.py
+#   gunicorn -c gunicorn.conf.py --worker-class aiohttp.GunicornWebWorker api.async_app:app
+# O corpo é lido sem bloquear o event loop; parse do JSON e featurize-and-score rodam em
+# um pool limitado de threads (ver BoundedExecutor). Com a fila cheia responde 429 e,
+# passado o tempo limite da predição, 504 (também no /predict/batch).
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import traceback
+from typing import Any, Callable, Dict
+from aiohttp import web
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+from api.app import (
+    ERRORS,
+    PREDICT_BATCH_WINDOW_MS,
+    PREDICT_TIMEOUT_SECONDS,
+    REQUEST_BYTES,
+    REQUEST_SECONDS,
+    REQUESTS,
+    SERVER_TIMING_HEADERS,
+    STAGE_SECONDS,
+    DEBUG_LOG_SAMPLE_RATE,
+    batcher,
+    describe_cache,
+    describe_model,
+    logger,
+    metrics_registry,
+    service,
+    warm_up,
+)
+from datathon_package.async_serving import BoundedExecutor, QueueFullError
+from datathon_package.metrics import MetricsRegistry
+
+# Threads que fazem parse e featurize-and-score em cada worker
+ASYNC_SCORING_WORKERS = int(os.getenv("ASYNC_SCORING_WORKERS", "4"))
+# Chamadas na fila ou em andamento por worker antes de responder 429
+ASYNC_MAX_PENDING = int(os.getenv("ASYNC_MAX_PENDING", "64"))
+# Tamanho máximo do corpo das requisições (o /predict/batch recebe vários candidatos)
+ASYNC_MAX_BODY_BYTES = int(os.getenv("ASYNC_MAX_BODY_BYTES", str(32 * 1024 * 1024)))
+
+INVALID_JSON = {"error": "Formato de JSON inválido"}
+
+executor = BoundedExecutor(
+    max_workers=ASYNC_SCORING_WORKERS, max_pending=ASYNC_MAX_PENDING, timeout_seconds=PREDICT_TIMEOUT_SECONDS
+)
+
+
+class InvalidPayload(ValueError):
+    """Raised when the request body is not a valid payload for the endpoint."""
+
+
+def _is_json(content_type: str) -> bool:
+    # Mesmo critério do request.is_json do Flask
+    return content_type == "application/json" or (
+        content_type.startswith("application/") and content_type.endswith("+json")
+    )
+
+
+def _parse(endpoint: str, body: bytes, content_type: str, timings: Dict[str, float]) -> Any:
+    # Mesmas exceções do request.get_json() do Flask, que os endpoints respondem com 500
+    start = time.perf_counter()
+    try:
+        if not _is_json(content_type):
+            raise UnsupportedMediaType(
+                "Did not attempt to load JSON data because the request Content-Type was not 'application/json'."
+            )
+        try:
+            content = json.loads(body)
+        except ValueError as e:
+            raise BadRequest() from e
+    finally:
+        timings["parse"] = time.perf_counter() - start
+
+    logger.debug("Requisição recebida no %s (%d bytes)", endpoint, len(body))
+    # Dump do corpo só em DEBUG e para uma amostra das requisições
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < DEBUG_LOG_SAMPLE_RATE:
+        logger.debug("JSON recebido: %s", content)
+    return content
+
+
+def _predict(body: bytes, content_type: str, timings: Dict[str, float]) -> Dict[str, Any]:
+    # Roda no pool: parse e modelo fora do event loop
+    content = _parse("/predict", body, content_type, timings)
+    if not content or not isinstance(content, dict):
+        raise InvalidPayload()
+
+    # Janela 0 desativa o micro-batching
+    model_start = time.perf_counter()
+    if PREDICT_BATCH_WINDOW_MS > 0:
+        # Libera a thread do pool se o micro-batcher travar (a resposta já saiu com 504)
+        results = batcher.submit(content).result(timeout=PREDICT_TIMEOUT_SECONDS or None)
+    else:
+        results = service.predict(content)
+    timings["model"] = time.perf_counter() - model_start
+    return {"results": results}
+
+
+def _predict_batch(body: bytes, content_type: str, timings: Dict[str, float]) -> Dict[str, Any]:
+    content = _parse("/predict/batch", body, content_type, timings)
+
+    # Aceita um único payload com vários candidatos ou uma lista de payloads
+    payloads = [content] if isinstance(content, dict) else content
+    if not payloads or not isinstance(payloads, list) or not all(isinstance(p, dict) and p for p in payloads):
+        raise InvalidPayload()
+
+    # Um único featurize-and-score para todos os candidatos
+    model_start = time.perf_counter()
+    results = service.predict_many(payloads)
+    timings["model"] = time.perf_counter() - model_start
+    return {"results": results[0] if isinstance(content, dict) else results}
+
+
+def _respond(endpoint: str, body: dict, status: int, timings: dict, start: float, size: int, **kwargs) -> web.Response:
+    """
+    Serializes the response and records the request metrics (and the optional Server-Timing header).
+    """
+    serialize_start = time.perf_counter()
+    response = web.json_response(body, status=status, **kwargs)
+    timings["serialize"] = time.perf_counter() - serialize_start
+    timings["total"] = time.perf_counter() - start
+
+    STAGE_SECONDS.observe(timings.get("parse", 0.0), stage="parse")
+    STAGE_SECONDS.observe(timings["serialize"], stage="serialize")
+    REQUEST_SECONDS.observe(timings["total"], endpoint=endpoint)
+    REQUEST_BYTES.observe(size, endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    if status >= 400:
+        ERRORS.inc(endpoint=endpoint)
+
+    if SERVER_TIMING_HEADERS:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+        )
+    return response
+
+
+async def _handle(
+    request: web.Request,
+    endpoint: str,
+    handler: Callable[[bytes, str, Dict[str, float]], Dict[str, Any]]
+) -> web.Response:
+    start = time.perf_counter()
+    body = await request.read()
+    # Dict próprio da chamada no pool: só é lido depois que ela termina. Após um 504 a thread
+    # ainda pode escrever nele, então a resposta usa um dict novo
+    timings: Dict[str, float] = {}
+    try:
+        result = await executor.run(handler, body, request.content_type, timings)
+        return _respond(endpoint, result, 200, timings, start, len(body))
+    except InvalidPayload:
+        return _respond(endpoint, INVALID_JSON, 400, timings, start, len(body))
+    except QueueFullError:
+        # Backpressure: o cliente tenta de novo em vez de aumentar a fila
+        return _respond(
+            endpoint, {"error": "Servidor ocupado, tente novamente."}, 429, {}, start, len(body),
+            headers={"Retry-After": "1"}
+        )
+    except asyncio.TimeoutError:
+        logger.error("Predição excedeu %.1fs no %s", PREDICT_TIMEOUT_SECONDS, endpoint)
+        return _respond(endpoint, {"error": "Tempo limite da predição excedido."}, 504, {}, start, len(body))
+    except Exception as e:
+        logger.error("Erro na predição: %s", e)
+        return _respond(endpoint, {"error": str(e), "trace": traceback.format_exc()}, 500, timings, start, len(body))
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"}, status=200)
+
+
+async def ready(request: web.Request) -> web.Response:
+    # Só aceita tráfego depois do aquecimento do modelo (ver warm_up)
+    if not service.ready:
+        return web.json_response({"status": "warming_up"}, status=503)
+    return web.json_response({"status": "ready"}, status=200)
+
+
+async def model_info(request: web.Request) -> web.Response:
+    return web.json_response(describe_model(), status=200)
+
+
+async def metrics(request: web.Request) -> web.Response:
+    return web.Response(text=metrics_registry.render(), headers={"Content-Type": MetricsRegistry.CONTENT_TYPE})
+
+
+async def cache_stats(request: web.Request) -> web.Response:
+    return web.json_response(describe_cache(), status=200)
+
+
+async def predict(request: web.Request) -> web.Response:
+    return await _handle(request, "/predict", _predict)
+
+
+async def predict_batch(request: web.Request) -> web.Response:
+    return await _handle(request, "/predict/batch", _predict_batch)
+
+
+async def _warm_up(app: web.Application) -> None:
+    # Em cada worker, fora do event loop
+    await asyncio.get_running_loop().run_in_executor(None, warm_up)
+
+
+async def _shutdown(app: web.Application) -> None:
+    executor.shutdown()
+
+
+def create_app() -> web.Application:
+    """
+    Builds the aiohttp application with the same routes and contracts as the Flask API.
+    """
+    application = web.Application(client_max_size=ASYNC_MAX_BODY_BYTES)
+    application.router.add_get("/health", health)
+    application.router.add_get("/ready", ready)
+    application.router.add_get("/model", model_info)
+    application.router.add_get("/metrics", metrics)
+    application.router.add_get("/cache/stats", cache_stats)
+    application.router.add_post("/predict", predict)
+    application.router.add_post("/predict/batch", predict_batch)
+    application.on_startup.append(_warm_up)
+    application.on_cleanup.append(_shutdown)
+    return application
+
+
+app = create_app()
+
+if __name__ == "__main__":
+    web.run_app(app, host="0.0.0.0", port=int(os.getenv("ASYNC_API_PORT", "5007")))
@@ -0,0 +1,73 @@
+"""
+Benchmark do process_certification_column: versão legada (cópia do DataFrame,
+count_certifications por linha + um .apply por faixa) contra a vetorizada
+(str.count sobre os valores distintos + comparações de arrays).
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_certifications.py --rows 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from datathon_package.feature import process_certification_column
+from synthetic import CERTIFICACOES
+
+
+def legacy_process_certification_column(df, column):
+    df = df.copy()
+
+    def count_certifications(val):
+        if pd.isna(val) or str(val).strip() == '':
+            return 0
+        return len([x for x in str(val).split(',') if x.strip() != ''])
+
+    df['certificacoes_count'] = df[column].apply(count_certifications)
+    df['certificacoes_0'] = df['certificacoes_count'].apply(lambda x: 1 if x == 0 else 0)
+    df['certificacoes_1_3'] = df['certificacoes_count'].apply(lambda x: 1 if 1 <= x <= 3 else 0)
+    df['certificacoes_5_mais'] = df['certificacoes_count'].apply(lambda x: 1 if x >= 5 else 0)
+    df.drop(columns=[column], inplace=True)
+    return df
+
+
+def make_certifications(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    # Valores frequentes misturados com listas livres (alta cardinalidade)
+    common = rng.choice(np.array(CERTIFICACOES + [None], dtype=object), size=rows)
+    names = np.array(['AWS', 'Azure', 'GCP', 'PMP', 'ITIL', 'Scrum', 'Java', 'Oracle', 'SAP', 'CCNA'])
+    free = np.array([', '.join(rng.choice(names, size=k, replace=False)) for k in rng.integers(1, 8, rows // 4)],
+                    dtype=object)
+    common[rng.choice(rows, size=len(free), replace=False)] = free
+    return pd.DataFrame({'certificacoes': common})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for rows in args.rows:
+        df = make_certifications(rows, rng)
+        runs = [
+            ("vetorizado", lambda d, c: process_certification_column(d, c)),
+        ]
+        if not args.skip_legacy:
+            runs.insert(0, ("legado", legacy_process_certification_column))
+
+        outputs = {}
+        for name, fn in runs:
+            start = time.perf_counter()
+            outputs[name] = fn(df, 'certificacoes')
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>9} {name:>11}: {elapsed:8.3f}s  {rows / elapsed:>12,.0f} linhas/s")
+
+        if "legado" in outputs:
+            same = all((outputs["legado"].to_numpy() == outputs[name].to_numpy()).all() for name in outputs)
+            print(f"{rows:>9} saídas idênticas: {bool(same)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara a validação cruzada legada (um cross_val_score por métrica, 5 x 5 ajustes)
+com a validação em passada única (5 ajustes, métricas a partir das probabilidades OOF).
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_cv.py --rows 50000 --n-jobs 1 2
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+from datathon_package.model_selection import cross_validate_oof
+
+
+def legacy_evaluate_model_cv(model, X, y, cv_folds=5):
+    skf = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
+    return {
+        "accuracy": cross_val_score(model, X, y, cv=skf, scoring="accuracy").mean(),
+        "precision": cross_val_score(model, X, y, cv=skf, scoring="precision").mean(),
+        "recall": cross_val_score(model, X, y, cv=skf, scoring="recall").mean(),
+        "f1": cross_val_score(model, X, y, cv=skf, scoring="f1").mean(),
+        "roc_auc": cross_val_score(model, X, y, cv=skf, scoring="roc_auc").mean(),
+    }
+
+
+def make_data(rows: int, n_features: int = 36):
+    # Formato da master table: flags binárias e uma contagem
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.integers(0, 2, size=(rows, n_features)), columns=[f"f{i}" for i in range(n_features)])
+    X["certificacoes_count"] = rng.integers(0, 8, rows)
+    logits = X.iloc[:, :5].sum(axis=1) - 2.5 + rng.normal(0, 1, rows)
+    return X, pd.Series((logits > 0).astype(int))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    X, y = make_data(args.rows)
+    model = LGBMClassifier(n_estimators=300, random_state=42, verbose=-1)
+
+    start = time.perf_counter()
+    legacy = legacy_evaluate_model_cv(model, X, y)
+    print(f"{'legado (25 ajustes)':>24}: {time.perf_counter() - start:8.2f}s")
+
+    for n_jobs in args.n_jobs:
+        start = time.perf_counter()
+        metrics, _, _ = cross_validate_oof(model, X, y, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+        same = all(np.isclose(metrics[k], legacy[k]) for k in legacy)
+        print(f"{f'passada única n_jobs={n_jobs}':>24}: {elapsed:8.2f}s  métricas idênticas: {same}")
+
+
+if __name__ == "__main__":
+    main()
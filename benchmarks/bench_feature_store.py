@@ -0,0 +1,98 @@
+"""
+Compara a carga do treino a partir da master table em Parquet (leitura + drop das
+colunas de ID/target) com o feature store mapeado em memória, e a construção do
+Dataset do LightGBM sem e com o cache binário. Cada carga roda em um subprocesso
+separado para medir o pico de RSS.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_feature_store.py --rows 500000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datathon_package.applicants import transform_applicants
+from datathon_package.feature_store import load_feature_store, load_lgb_dataset, write_feature_store
+from datathon_package.schema import apply_master_schema, master_feature_columns, read_master_parquet, write_master_parquet
+from synthetic import make_applicants_payload
+
+
+def build_master(n_rows: int) -> pd.DataFrame:
+    df = transform_applicants(make_applicants_payload(n_rows))
+    ids = pd.to_numeric(df['ID']).astype('Int64')
+    rng = np.random.default_rng(42)
+    df = df.assign(ID=ids, prospect_codigo=ids, target=rng.integers(0, 2, len(df)))
+    return apply_master_schema(df)
+
+
+def peak_rss_mb() -> float:
+    # VmHWM é zerado no exec (ru_maxrss herdaria o pico do processo pai)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_case(mode: str, path: str) -> None:
+    start = time.perf_counter()
+    if mode == "parquet":
+        df = read_master_parquet(path, columns=master_feature_columns(path))
+        X = df.drop(columns=["target"])
+        y = df["target"].astype(int)
+    else:
+        store = load_feature_store(path)
+        X = store.frame()
+        y = pd.Series(store.y).astype(int)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if mode == "parquet":
+        import lightgbm as lgb
+        lgb.Dataset(X, label=y, params={"verbose": -1}).construct()
+    else:
+        load_lgb_dataset(store)
+    dataset_seconds = time.perf_counter() - start
+    print(json.dumps({"load_s": load_seconds, "dataset_s": dataset_seconds, "peak_rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        load_case(*args.case)
+        return
+
+    df_master = build_master(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet_path = os.path.join(tmp, "master_table.parquet")
+        store_dir = os.path.join(tmp, "feature_store")
+        write_master_parquet(df_master, parquet_path)
+        write_feature_store(df_master, store_dir)
+        del df_master
+
+        # A segunda carga do feature store encontra o Dataset em cache
+        cases = [("parquet", parquet_path), ("store", store_dir), ("store", store_dir)]
+        print(f"{'carga':>14} {'leitura (s)':>12} {'Dataset (s)':>12} {'pico RSS (MB)':>14}")
+        for i, (mode, path) in enumerate(cases):
+            out = subprocess.run(
+                [sys.executable, __file__, "--case", mode, path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(out)
+            label = mode if i < 2 else "store (cache)"
+            print(f"{label:>14} {result['load_s']:>12.2f} {result['dataset_s']:>12.2f} {result['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark do generate_flags_and_category_column: implementação legada
+(um .apply por categoria) contra o encoder vetorizado, num frame sintético.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_flags.py --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from datathon_package.applicants import MAPPING_NIVEL_ACADEMICO, NIVEL_ACADEMICO_VALORES
+from datathon_package.feature import generate_flags_and_category_column
+
+
+def legacy_generate_flags(df, source_column, mapping, default_flag_column=None):
+    df = df.copy()
+    for value, col_name in mapping.items():
+        df[col_name] = df[source_column].apply(lambda x: 1 if x == value else 0)
+    if default_flag_column:
+        df[default_flag_column] = df[source_column].apply(lambda x: 0 if x in mapping else 1)
+    df.drop(columns=[source_column], inplace=True)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    values = np.array(NIVEL_ACADEMICO_VALORES + ['Outro'], dtype=object)
+    df = pd.DataFrame({'nivel_academico': rng.choice(values, size=args.rows)})
+    column = 'nivel_academico'
+
+    runs = [("vetorizado", generate_flags_and_category_column)]
+    if not args.skip_legacy:
+        runs.insert(0, ("legado", legacy_generate_flags))
+
+    results = {}
+    for name, fn in runs:
+        start = time.perf_counter()
+        out = fn(df, column, MAPPING_NIVEL_ACADEMICO, 'nivel_academico_outros')
+        elapsed = time.perf_counter() - start
+        results[name] = out
+        memory_mb = out.memory_usage(deep=False).sum() / 1e6
+        print(f"{name:>12}: {elapsed:8.3f}s  {args.rows / elapsed:>12,.0f} linhas/s  {memory_mb:8.1f} MB")
+
+    if "legado" in results:
+        same = (results["legado"].to_numpy() == results["vetorizado"].to_numpy()).all()
+        print("Saídas idênticas:", bool(same))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compara tempo e pico de memória (RSS) da leitura completa com pd.read_json
+contra a leitura em streaming por lotes, para applicants e prospects.
+Cada medição roda em um subprocesso separado para isolar o pico de RSS.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_ingestion.py --applicants 200000 --vagas 20000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import make_applicants_payload, make_prospects_payload
+
+
+def run_case(kind: str, path: str, chunksize: int) -> None:
+    import datathon_package.applicants as applicants
+    import datathon_package.prospects as prospects
+
+    # Sem Postgres no benchmark
+    applicants.ingest_dataframe_to_postgres = lambda *args, **kwargs: None
+    prospects.ingest_dataframe_to_postgres = lambda *args, **kwargs: None
+
+    start = time.perf_counter()
+    if kind == "applicants":
+        df = applicants.process_applicants_data(path, chunksize=chunksize or None)
+    else:
+        df = prospects.process_prospects_data(path, chunksize=chunksize or None)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"rows": len(df), "seconds": elapsed, "peak_rss_mb": peak_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applicants", type=int, default=200_000)
+    parser.add_argument("--vagas", type=int, default=20_000)
+    parser.add_argument("--chunksize", type=int, default=10_000)
+    parser.add_argument("--case", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        kind, path, chunksize = args.case
+        run_case(kind, path, int(chunksize))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {
+            "applicants": os.path.join(tmp, "applicants.json"),
+            "prospects": os.path.join(tmp, "prospects.json"),
+        }
+        with open(files["applicants"], "w") as f:
+            json.dump(make_applicants_payload(args.applicants), f, ensure_ascii=False)
+        with open(files["prospects"], "w") as f:
+            json.dump(make_prospects_payload(args.vagas, args.applicants), f, ensure_ascii=False)
+
+        print(f"{'arquivo':>10} {'modo':>10} {'MB':>8} {'linhas':>9} {'tempo (s)':>10} {'pico RSS (MB)':>14}")
+        for kind, path in files.items():
+            size_mb = os.path.getsize(path) / 1e6
+            for mode, chunksize in (("completo", 0), ("streaming", args.chunksize)):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--case", kind, path, str(chunksize)],
+                    capture_output=True, text=True, check=True
+                ).stdout.strip().splitlines()[-1]
+                result = json.loads(out)
+                print(f"{kind:>10} {mode:>10} {size_mb:>8.1f} {result['rows']:>9} "
+                      f"{result['seconds']:>10.2f} {result['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
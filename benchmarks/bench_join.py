@@ -0,0 +1,105 @@
+"""
+Compara o merge da master table:
+
+  - antigo: IDs convertidos para Int64 (nullable) e pd.merge das duas tabelas inteiras
+  - novo: chaves int32, índice dos IDs dos candidatos (reaproveitando a ordem já
+    ordenada, merge-join) e coleta por posição só das colunas mantidas
+
+Mede só a junção e a função completa (junção + remoção de colunas constantes + esquema
+compacto, etapas iguais nos dois caminhos). Por padrão usa 10x o volume da base original (~42 mil candidatos, ~53 mil prospects).
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_join.py --applicants 420000 --prospects 530000
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from datathon_package.generate_master_table import join_master_rows, merge_master_table
+from datathon_package.schema import apply_master_schema
+from datathon_package.utils import drop_constant_binary_columns
+
+
+def legacy_join_master_rows(df_applicants: pd.DataFrame, df_prospects: pd.DataFrame) -> pd.DataFrame:
+    df_applicants = df_applicants.assign(ID=pd.to_numeric(df_applicants['ID'], errors='coerce').astype('Int64'))
+    df_prospects = df_prospects.assign(
+        prospect_codigo=pd.to_numeric(df_prospects['prospect_codigo'], errors='coerce').astype('Int64')
+    )
+    df_applicants = df_applicants.dropna(subset=['ID'])
+    df_prospects = df_prospects.dropna(subset=['prospect_codigo'])
+    df_master = pd.merge(df_applicants, df_prospects, left_on='ID', right_on='prospect_codigo', how='inner')
+    return df_master.drop(columns=['prospect_situacao_candidado'], errors='ignore')
+
+
+def legacy_merge_master_table(df_applicants: pd.DataFrame, df_prospects: pd.DataFrame) -> pd.DataFrame:
+    df_master = drop_constant_binary_columns(legacy_join_master_rows(df_applicants, df_prospects))
+    return apply_master_schema(df_master)
+
+
+def build_frames(n_applicants: int, n_prospects: int, n_flags: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    # Mesmo formato da saída de process_applicants_data: ID int64 ordenado, flags 0/1 e salário
+    ids = np.sort(rng.choice(n_applicants * 2, size=n_applicants, replace=False)) + 1
+    df_applicants = pd.DataFrame({'ID': ids})
+    for i in range(n_flags):
+        df_applicants[f'flag_{i}'] = rng.integers(0, 2, n_applicants).astype(np.uint8)
+    df_applicants['certificacoes_count'] = rng.integers(0, 10, n_applicants)
+    df_applicants['salario'] = rng.random(n_applicants) * 10000
+    # Saída de process_prospects_data: códigos como texto, parte sem candidato correspondente
+    codigos = rng.integers(1, n_applicants * 2 + 1, n_prospects).astype(str)
+    df_prospects = pd.DataFrame({
+        'prospect_codigo': codigos,
+        'prospect_situacao_candidado': rng.choice(['Aprovado', 'Recusado', 'Desistiu'], n_prospects),
+        'target': rng.integers(0, 2, n_prospects).astype(np.uint8),
+    })
+    return df_applicants, df_prospects
+
+
+def timed(fn, *args, **kwargs):
+    # Silencia o relatório de colunas constantes
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applicants", type=int, default=420000)
+    parser.add_argument("--prospects", type=int, default=530000)
+    parser.add_argument("--flags", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df_applicants, df_prospects = build_frames(args.applicants, args.prospects, args.flags)
+
+    runs = {
+        "antigo": (legacy_join_master_rows, legacy_merge_master_table, {}),
+        "novo": (join_master_rows, merge_master_table, {}),
+        "novo ordenado": (join_master_rows, merge_master_table, {"applicants_sorted": True}),
+    }
+    results, times = {}, {}
+    for name, (join_fn, merge_fn, kwargs) in runs.items():
+        join_s = min(timed(join_fn, df_applicants, df_prospects, **kwargs)[1] for _ in range(args.repeat))
+        results[name], merge_s = min(
+            (timed(merge_fn, df_applicants, df_prospects, **kwargs) for _ in range(args.repeat)), key=lambda r: r[1]
+        )
+        times[name] = (join_s, merge_s)
+
+    for name in ("novo", "novo ordenado"):
+        pdt.assert_frame_equal(results[name], results["antigo"])
+
+    print(f"{'caminho':>14} {'junção (s)':>11} {'total (s)':>10} {'linhas':>9}")
+    for name, (join_s, merge_s) in times.items():
+        print(f"{name:>14} {join_s:>11.3f} {merge_s:>10.3f} {len(results[name]):>9}")
+    print(f"ganho na junção: {times['antigo'][0] / times['novo ordenado'][0]:.1f}x (merge-join), "
+          f"{times['antigo'][0] / times['novo'][0]:.1f}x (ordenando as chaves); "
+          f"total: {times['antigo'][1] / times['novo ordenado'][1]:.1f}x")
+
+if __name__ == "__main__":
+    main()
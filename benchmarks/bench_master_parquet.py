@@ -0,0 +1,99 @@
+"""
+Compara a master table no formato antigo (flags int64, IDs Int64, target float64,
+to_parquet padrão) com o esquema compacto (uint8/uint16, Int32, zstd com dicionário):
+tamanho do arquivo, tempo de escrita/leitura e pico de RSS da carga do treino
+(leitura + matriz passada ao SMOTE), cada carga em um subprocesso separado.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_master_parquet.py --rows 500000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datathon_package.applicants import transform_applicants
+from datathon_package.schema import apply_master_schema, write_master_parquet, master_feature_columns
+from synthetic import make_applicants_payload
+
+
+def build_master(n_rows: int) -> pd.DataFrame:
+    df = transform_applicants(make_applicants_payload(n_rows))
+    ids = pd.to_numeric(df['ID']).astype('Int64')
+    rng = np.random.default_rng(42)
+    df = df.assign(ID=ids, prospect_codigo=ids, target=rng.integers(0, 2, len(df)).astype(float))
+    # Formato antigo: tudo em int64/float64
+    return df.astype({col: 'int64' for col in df.columns if df[col].dtype == np.uint8})
+
+
+def peak_rss_mb() -> float:
+    # VmHWM é zerado no exec (ru_maxrss herdaria o pico do processo pai)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_case(mode: str, path: str) -> None:
+    start = time.perf_counter()
+    if mode == "antigo":
+        df = pd.read_parquet(path)
+        X = df.drop(columns=["ID", "prospect_codigo", "target"]).to_numpy()
+    else:
+        df = pd.read_parquet(path, columns=master_feature_columns(path))
+        X = df.drop(columns=["target"]).to_numpy(dtype=np.int16)
+    elapsed = time.perf_counter() - start
+    peak_mb = peak_rss_mb()
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_mb, "x_mb": X.nbytes / 1e6}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        load_case(*args.case)
+        return
+
+    legacy = build_master(args.rows)
+    compact = apply_master_schema(legacy)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"antigo": os.path.join(tmp, "legacy.parquet"), "compacto": os.path.join(tmp, "compact.parquet")}
+
+        start = time.perf_counter()
+        legacy.to_parquet(paths["antigo"], index=False)
+        write_seconds = {"antigo": time.perf_counter() - start}
+        start = time.perf_counter()
+        write_master_parquet(compact, paths["compacto"])
+        write_seconds["compacto"] = time.perf_counter() - start
+
+        memory_mb = {
+            "antigo": legacy.memory_usage(deep=True).sum() / 1e6,
+            "compacto": compact.memory_usage(deep=True).sum() / 1e6,
+        }
+
+        print(f"{'formato':>10} {'arquivo (MB)':>13} {'escrita (s)':>12} {'carga (s)':>10} "
+              f"{'DataFrame (MB)':>15} {'X (MB)':>8} {'pico RSS (MB)':>14}")
+        for mode, path in paths.items():
+            out = subprocess.run(
+                [sys.executable, __file__, "--case", mode, path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(out)
+            print(f"{mode:>10} {os.path.getsize(path) / 1e6:>13.2f} {write_seconds[mode]:>12.2f} "
+                  f"{result['seconds']:>10.2f} {memory_mb[mode]:>15.1f} {result['x_mb']:>8.1f} "
+                  f"{result['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compara a vazão do /predict sob carga concorrente, com um candidato por requisição:
+
+  - legado: featurizer.transform + model.predict + model.predict_proba por requisição
+  - micro-batch: MicroBatcher agrupando as requisições concorrentes em um único predict_proba
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_microbatch.py --requests 2000 --clients 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lightgbm import LGBMClassifier
+
+from datathon_package.applicants import transform_applicants
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.serving import PredictionService, MicroBatcher
+from synthetic import make_applicants_payload
+
+
+def build_service(n_train: int) -> PredictionService:
+    payload = make_applicants_payload(n_train)
+    featurizer = ApplicantFeaturizer().fit(transform_applicants(payload))
+    X = featurizer.transform(payload)
+    y = (X.sum(axis=1).to_numpy() + X.index.astype(int).to_numpy() % 3) % 2
+    model = LGBMClassifier(n_estimators=200, verbose=-1).fit(X, y)
+    return PredictionService(model, featurizer)
+
+
+def legacy_predict(service: PredictionService, payload: dict) -> list:
+    df_features = service.featurizer.transform(payload)
+    preds = service.model.predict(df_features)
+    probas = service.model.predict_proba(df_features)[:, 1]
+    return [
+        {"applicant_id": i, "id": df_features.index[i], "prediction": int(preds[i]), "probability": round(float(probas[i]), 4)}
+        for i in range(len(preds))
+    ]
+
+
+def run(fn, payloads: list, clients: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(fn, payloads))
+    return len(payloads) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    service = build_service(2000)
+    batcher = MicroBatcher(service.predict_many, max_batch_size=args.max_batch, max_wait_ms=args.window_ms)
+    raw = make_applicants_payload(args.requests, seed=7)
+    payloads = [{applicant_id: record} for applicant_id, record in raw.items()]
+
+    # Mesmos resultados nos dois caminhos
+    assert legacy_predict(service, payloads[0]) == batcher.submit(payloads[0]).result()
+
+    legacy_rps = run(lambda p: legacy_predict(service, p), payloads, args.clients)
+    batched_rps = run(lambda p: batcher.submit(p).result(), payloads, args.clients)
+
+    print(f"{'caminho':>12} {'req/s':>10}")
+    print(f"{'legado':>12} {legacy_rps:>10.1f}")
+    print(f"{'micro-batch':>12} {batched_rps:>10.1f}")
+    print(f"ganho: {batched_rps / legacy_rps:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
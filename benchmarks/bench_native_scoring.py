@@ -0,0 +1,71 @@
+"""
+Compara a latência de PredictionService.score (já com as features calculadas):
+
+  - wrapper: LGBMClassifier.predict_proba sobre um DataFrame (validação do sklearn/pandas)
+  - nativo: lightgbm.Booster.predict direto no array float32 contíguo, com num_threads fixo
+
+Mede uma linha por chamada (requisição individual) e lotes de --batch linhas.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_native_scoring.py --trees 300 --batch 64
+"""
+import argparse
+import time
+
+import numpy as np
+from lightgbm import LGBMClassifier
+
+from datathon_package.applicants import transform_applicants
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.serving import PredictionService
+from synthetic import make_applicants_payload
+
+
+def latency_us(fn, X_list: list) -> float:
+    fn(X_list[0])
+    start = time.perf_counter()
+    for X in X_list:
+        fn(X)
+    return (time.perf_counter() - start) / len(X_list) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train", type=int, default=5000)
+    parser.add_argument("--trees", type=int, default=300)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    payload = make_applicants_payload(args.train)
+    featurizer = ApplicantFeaturizer().fit(transform_applicants(payload))
+    X_train = featurizer.transform(payload)
+    y = (X_train.sum(axis=1).to_numpy() + X_train.index.astype(int).to_numpy() % 3) % 2
+    model = LGBMClassifier(n_estimators=args.trees, verbose=-1).fit(X_train, y)
+
+    wrapper = PredictionService(model, featurizer, use_native=False)
+    native = PredictionService(model, featurizer, num_threads=args.threads)
+    assert native.fast_path
+
+    X = X_train.to_numpy(dtype=np.float32)
+    rows = [X[i:i + 1] for i in range(args.calls)]
+    batches = [X[i:i + args.batch] for i in range(0, len(X) - args.batch + 1, args.batch)]
+
+    # Mesmos rótulos e probabilidades nos dois caminhos
+    for a, b in zip(wrapper.score(X), native.score(X)):
+        np.testing.assert_allclose(a, b, atol=1e-9)
+
+    print(f"{'caminho':>10} {'1 linha (us)':>14} {f'lote {args.batch} (us)':>14} {'us/linha lote':>14}")
+    results = {}
+    for name, service in (("wrapper", wrapper), ("nativo", native)):
+        row_us = latency_us(service.score, rows)
+        batch_us = latency_us(service.score, batches)
+        results[name] = (row_us, batch_us)
+        print(f"{name:>10} {row_us:>14.1f} {batch_us:>14.1f} {batch_us / args.batch:>14.2f}")
+    print(f"ganho: {results['wrapper'][0] / results['nativo'][0]:.1f}x por linha, "
+          f"{results['wrapper'][1] / results['nativo'][1]:.1f}x por lote")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compara a latência por requisição do /predict antes e depois do caminho em memória:
+
+  - legado: json.dump em /tmp + pd.read_json + process_applicants_data(temp_path)
+  - novo: transform_applicants(payload)
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_predict_transform.py --repeat 200
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+
+import pandas as pd
+
+from datathon_package.applicants import process_applicants_data, transform_applicants
+from synthetic import make_applicants_payload
+
+
+def legacy_path(content: dict) -> pd.DataFrame:
+    temp_path = f"/tmp/temp_applicants_{uuid.uuid4()}.json"
+    with open(temp_path, "w") as f:
+        json.dump(content, f)
+    pd.read_json(temp_path)
+    df = process_applicants_data(temp_path, predict=True)
+    os.remove(temp_path)
+    return df
+
+
+def in_memory_path(content: dict) -> pd.DataFrame:
+    return transform_applicants(content)
+
+
+def measure(fn, payload: dict, repeat: int) -> list:
+    fn(payload)  # aquecimento
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'applicants':>10} {'caminho':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for size in args.sizes:
+        payload = make_applicants_payload(size)
+        for name, fn in (("legado", legacy_path), ("memoria", in_memory_path)):
+            timings = sorted(measure(fn, payload, args.repeat))
+            p50 = statistics.median(timings)
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            print(f"{size:>10} {name:>10} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compara a montagem das linhas de prospects (uma por candidato em cada vaga):
+
+  - antigo: expand_dict_column na lista de prospects (uma coluna por posição), melt,
+    segunda expansão do dict de cada prospect e classify_target por linha com apply
+  - novo: build_prospects_frame, que percorre as listas uma vez e mapeia o target com map
+
+Cada caminho roda em um subprocesso separado para medir o pico de RSS (VmHWM).
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_prospects.py --vagas 20000 --max-prospects 40
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from datathon_package.prospects import SITUACOES_APROVADO, SITUACOES_REPROVADO, build_prospects_frame
+from datathon_package.utils import expand_dict_column, remove_invalid_prospect_codigo
+from synthetic import make_prospects_payload
+
+
+def legacy_build_prospects_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = expand_dict_column(df, 'prospects', 'prospects_')
+    fixed_columns = ['ID', 'titulo', 'modalidade']
+    prospect_columns = [col for col in df.columns if col.startswith("prospect")]
+    df_long = df.melt(id_vars=fixed_columns, value_vars=prospect_columns, var_name='prospect_num', value_name='prospect')
+    df_long = df_long.dropna(subset=['prospect'])
+    df_long = df_long[df_long['prospect'] != ""]
+    df_long = df_long[fixed_columns + ['prospect']]
+    df = expand_dict_column(df_long, 'prospect', 'prospect_')
+    df = df.sort_values(by='ID')
+    df = remove_invalid_prospect_codigo(df)
+    df = df[['prospect_codigo', 'prospect_situacao_candidado']]
+
+    def classify_target(status):
+        if status in SITUACOES_APROVADO:
+            return 1
+        elif status in SITUACOES_REPROVADO:
+            return 0
+        return None
+
+    df['target'] = df['prospect_situacao_candidado'].apply(classify_target)
+    return df.dropna(subset=['target'])
+
+
+def peak_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_child(path: str, n_vagas: int, max_prospects: int) -> None:
+    payload = make_prospects_payload(n_vagas, n_vagas * 5, max_prospects=max_prospects)
+    df = pd.DataFrame.from_dict(payload, orient='index').rename_axis('ID').reset_index()
+    del payload
+    base_rss = peak_rss_mb()
+    fn = legacy_build_prospects_frame if path == "antigo" else build_prospects_frame
+    start = time.perf_counter()
+    result = fn(df)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"s": elapsed, "rows": len(result), "peak_delta_mb": peak_rss_mb() - base_rss}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vagas", type=int, default=20000)
+    parser.add_argument("--max-prospects", type=int, default=40)
+    parser.add_argument("--child", choices=["antigo", "novo"])
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.vagas, args.max_prospects)
+        return
+
+    results = {}
+    print(f"{'caminho':>8} {'tempo (s)':>10} {'linhas':>9} {'pico +MB':>9}")
+    for path in ("antigo", "novo"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", path, "--vagas", str(args.vagas),
+             "--max-prospects", str(args.max_prospects)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[path] = json.loads(out.strip().splitlines()[-1])
+        r = results[path]
+        print(f"{path:>8} {r['s']:>10.2f} {r['rows']:>9} {r['peak_delta_mb']:>9.1f}")
+    assert results["antigo"]["rows"] == results["novo"]["rows"]
+    print(f"ganho: {results['antigo']['s'] / results['novo']['s']:.1f}x no tempo, "
+          f"{results['antigo']['peak_delta_mb'] - results['novo']['peak_delta_mb']:.0f} MB a menos de pico")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Tempo de ajuste e pico de memória (RSS) da validação cruzada para cada estratégia de
+balanceamento aplicada dentro dos folds, e o SMOTE legado aplicado antes da validação.
+Cada estratégia roda em um subprocesso separado para isolar o pico de RSS.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_resampling.py --rows 100000
+    PYTHONPATH=. python benchmarks/bench_resampling.py --master-path ./data/processed/master_table.parquet
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+
+from datathon_package.model_selection import cross_validate_oof, smote_resample, RESAMPLING_STRATEGIES
+from datathon_package.schema import master_feature_columns, read_master_parquet
+
+
+def peak_rss_mb() -> float:
+    # VmHWM é zerado no exec (ru_maxrss herdaria o pico do processo pai)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_data(master_path: str, rows: int):
+    if master_path:
+        df = read_master_parquet(master_path, columns=master_feature_columns(master_path))
+        return df.drop(columns=["target"]), df["target"].astype(int)
+    # Formato da master table: flags uint8, classe positiva minoritária (~25%)
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.integers(0, 2, size=(rows, 36), dtype=np.uint8), columns=[f"f{i}" for i in range(36)])
+    logits = X.iloc[:, :5].sum(axis=1) - 3.2 + rng.normal(0, 1, rows)
+    return X, pd.Series((logits > 0).astype(int))
+
+
+def run_case(strategy: str, master_path: str, rows: int) -> None:
+    X, y = load_data(master_path, rows)
+    model = LGBMClassifier(n_estimators=300, random_state=42, verbose=-1)
+    start = time.perf_counter()
+    if strategy == "smote_antes_cv":
+        # Fluxo antigo: SMOTE na base toda e validação sobre os dados sintéticos
+        X, y = smote_resample(X, y)
+        metrics, _, _ = cross_validate_oof(model, X, y)
+    else:
+        metrics, _, _ = cross_validate_oof(model, X, y, resampling=strategy)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "roc_auc": metrics["roc_auc"],
+                      "f1": metrics["f1"]}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--master-path", default="")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.master_path, args.rows)
+        return
+
+    print(f"{'estratégia':>16} {'tempo (s)':>10} {'pico RSS (MB)':>14} {'roc_auc':>8} {'f1':>8}")
+    for strategy in ("smote_antes_cv",) + RESAMPLING_STRATEGIES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--case", strategy, "--rows", str(args.rows), "--master-path", args.master_path],
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        print(f"{strategy:>16} {result['seconds']:>10.2f} {result['peak_rss_mb']:>14.1f} "
+              f"{result['roc_auc']:>8.4f} {result['f1']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
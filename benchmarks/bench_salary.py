@@ -0,0 +1,82 @@
+"""
+Benchmark do process_salary_column: parser legado (re.search + um .apply por faixa)
+contra a versão vetorizada (str.extract + np.digitize).
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_salary.py --rows 100000 1000000
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from datathon_package.feature import process_salary_column
+from synthetic import REMUNERACAO
+
+
+def legacy_process_salary_column(df, column):
+    df = df.copy()
+
+    def extract_salary(value):
+        if pd.isna(value) or str(value).strip() == '' or str(value).strip() == '0':
+            return 0.0
+        match = re.search(r'(\d{1,3}(?:[\.\d{3}]*)(?:,\d{2})?|\d+)', str(value))
+        if match:
+            raw = match.group(1).replace('.', '').replace(',', '.')
+            try:
+                return float(raw)
+            except ValueError:
+                return 0.0
+        return 0.0
+
+    df['remuneracao_valor'] = df[column].apply(extract_salary)
+    df['horista0_100'] = df['remuneracao_valor'].apply(lambda x: 1 if 0 <= x < 100 else 0)
+    df['horista_100_300'] = df['remuneracao_valor'].apply(lambda x: 1 if 100 <= x < 300 else 0)
+    df['horista300_500'] = df['remuneracao_valor'].apply(lambda x: 1 if 300 <= x < 500 else 0)
+    df['horista500_1000'] = df['remuneracao_valor'].apply(lambda x: 1 if 500 <= x < 1000 else 0)
+    df['mensalista1000_5000'] = df['remuneracao_valor'].apply(lambda x: 1 if 1000 <= x < 5000 else 0)
+    df['mensalista_5000_10000'] = df['remuneracao_valor'].apply(lambda x: 1 if 5000 <= x < 10000 else 0)
+    df['mensalista_10k_15k'] = df['remuneracao_valor'].apply(lambda x: 1 if 10000 <= x < 15000 else 0)
+    df['mensalista20k_mais'] = df['remuneracao_valor'].apply(lambda x: 1 if x >= 20000 else 0)
+    df.drop(columns=[column, 'remuneracao_valor'], inplace=True)
+    return df
+
+
+def make_salaries(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    # Mistura os formatos comuns com valores livres (alta cardinalidade)
+    common = rng.choice(np.array(REMUNERACAO, dtype=object), size=rows)
+    free = np.array([f"R$ {v:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+                     for v in rng.uniform(50, 40000, size=rows // 2)], dtype=object)
+    common[rng.choice(rows, size=len(free), replace=False)] = free
+    return pd.DataFrame({'remuneracao': common})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for rows in args.rows:
+        df = make_salaries(rows, rng)
+        runs = [("vetorizado", process_salary_column)]
+        if not args.skip_legacy:
+            runs.insert(0, ("legado", legacy_process_salary_column))
+
+        outputs = {}
+        for name, fn in runs:
+            start = time.perf_counter()
+            outputs[name] = fn(df, 'remuneracao')
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>9} {name:>11}: {elapsed:8.3f}s  {rows / elapsed:>12,.0f} linhas/s")
+
+        if "legado" in outputs:
+            same = (outputs["legado"].to_numpy() == outputs["vetorizado"].to_numpy()).all()
+            print(f"{rows:>9} saídas idênticas: {bool(same)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Geradores de dados sintéticos no mesmo formato dos exports brutos
+(applicants.json e prospects.json), usados pelos benchmarks.
+"""
+import random
+from typing import Any, Dict
+
+SABENDO_DE_NOS_POR = ['Indicação de colaborador', 'Indicação de cliente', 'Site', 'LinkedIn', '']
+ESTADO_CIVIL = ['', 'Casado', 'Divorciado', 'Solteiro', 'Separado Judicialmente', 'União Estável', 'Viúvo']
+NIVEL_ACADEMICO = [
+    '', 'Pós Graduação Completo', 'Ensino Superior Completo', 'Mestrado Completo',
+    'Ensino Médio Completo', 'Ensino Técnico Completo', 'Ensino Superior Incompleto',
+    'Ensino Superior Cursando', 'Doutorado Completo',
+]
+NIVEL_PROFISSIONAL = ['', 'Analista', 'Especialista', 'Sênior', 'Júnior', 'Pleno', 'Líder', 'Outro', 'NA']
+CERTIFICACOES = [
+    '', 'SAP Certified', 'AWS Certified, Azure Fundamentals',
+    'PMP, ITIL, Scrum Master, SAP Certified, Java SE, Oracle DBA',
+    'Scrum Master, ITIL',
+]
+REMUNERACAO = ['', '0', 'R$ 2.500,00 mensal', 'R$115 p/h', '5000', '22000 mensais', '8.000,00', '350']
+SITUACOES = [
+    'Contratado pela Decision', 'Não Aprovado pelo Cliente', 'Prospect',
+    'Encaminhado ao Requisitante', 'Desistiu', 'Aprovado', 'Recusado',
+]
+
+
+def make_applicant_record(rng: random.Random) -> Dict[str, Any]:
+    return {
+        'infos_basicas': {
+            'sabendo_de_nos_por': rng.choice(SABENDO_DE_NOS_POR),
+            'nome': 'Fulano de Tal',
+        },
+        'informacoes_pessoais': {
+            'estado_civil': rng.choice(ESTADO_CIVIL),
+        },
+        'informacoes_profissionais': {
+            'certificacoes': rng.choice(CERTIFICACOES),
+            'remuneracao': rng.choice(REMUNERACAO),
+            'nivel_profissional': rng.choice(NIVEL_PROFISSIONAL),
+        },
+        'formacao_e_idiomas': {
+            'nivel_academico': rng.choice(NIVEL_ACADEMICO),
+        },
+        'cargo_atual': {
+            'data_ultima_promocao': '01-01-2020',
+        },
+    }
+
+
+def make_applicants_payload(n: int, seed: int = 42, start_id: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Gera n candidatos no formato {ID: registro} do applicants.json.
+    """
+    rng = random.Random(seed)
+    return {str(start_id + i): make_applicant_record(rng) for i in range(n)}
+
+
+def make_prospects_payload(
+    n_vagas: int,
+    n_applicants: int,
+    max_prospects: int = 20,
+    seed: int = 42,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Gera n_vagas vagas no formato {ID: registro} do prospects.json, com prospects
+    apontando para códigos de candidato entre 1 e n_applicants.
+    """
+    rng = random.Random(seed)
+    payload = {}
+    for i in range(n_vagas):
+        prospects = [
+            {
+                'nome': 'Fulano de Tal',
+                'codigo': str(rng.randint(1, n_applicants)),
+                'situacao_candidado': rng.choice(SITUACOES),
+                'data_candidatura': '01-01-2021',
+                'ultima_atualizacao': '02-01-2021',
+                'comentario': '',
+                'recrutador': 'Recrutador',
+            }
+            for _ in range(rng.randint(0, max_prospects))
+        ]
+        payload[str(i + 1)] = {'titulo': 'Vaga', 'modalidade': '', 'prospects': prospects}
+    return payload
@@ -1,7 +1,18 @@
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict
-from datathon_package.utils import transpose_and_prepare_dataframe, expand_dict_column, detect_nulls_and_nans, ingest_dataframe_to_postgres
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Union
+from datathon_package.utils import (
+    transpose_and_prepare_dataframe,
+    expand_dict_column,
+    detect_nulls_and_nans,
+    ingest_dataframe_to_postgres,
+    iter_json_batches,
+    coerce_numeric_ids,
+    parallel_map,
+    split_by_id_ranges
+)
+from datathon_package.profiling import profile_iter, profile_stage
 from datathon_package.feature import (
     generate_flags_and_category_column,
     process_certification_column,
@@ -9,103 +20,184 @@ from datathon_package.feature import (
     process_promotion_date_column
 )
 
-def process_applicants_data(applicants_path: str, predict=False) -> pd.DataFrame:
+# Seleção de colunas desejadas
+SELECTED_COLUMNS = [
+    'ID',
+    'infos_basicas_sabendo_de_nos_por',
+    'informacoes_pessoais_estado_civil',
+    'informacoes_profissionais_certificacoes',
+    'informacoes_profissionais_remuneracao',
+    'informacoes_profissionais_nivel_profissional',
+    'formacao_e_idiomas_nivel_academico',
+]
+
+# Seção e campo do registro bruto de onde vem cada coluna selecionada
+SELECTED_FIELDS = {
+    'infos_basicas_sabendo_de_nos_por': ('infos_basicas', 'sabendo_de_nos_por'),
+    'informacoes_pessoais_estado_civil': ('informacoes_pessoais', 'estado_civil'),
+    'informacoes_profissionais_certificacoes': ('informacoes_profissionais', 'certificacoes'),
+    'informacoes_profissionais_remuneracao': ('informacoes_profissionais', 'remuneracao'),
+    'informacoes_profissionais_nivel_profissional': ('informacoes_profissionais', 'nivel_profissional'),
+    'formacao_e_idiomas_nivel_academico': ('formacao_e_idiomas', 'nivel_academico'),
+}
+
+# Feature: Indicação
+MAPPING_INDICACAO = {
+    'Indicação de colaborador': 'ind_colaborador',
+    'Indicação de cliente': 'ind_cliente'
+}
+
+# Feature: Estado Civil
+ESTADO_CIVIL_VALUES = ['', 'Casado', 'Divorciado', 'Solteiro', 'Separado Judicialmente', 'União Estável', 'Viúvo']
+MAPPING_ESTADO_CIVIL = {
+    value: f"estado_civil_{value.lower().replace(' ', '_') or 'vazio'}"
+    for value in ESTADO_CIVIL_VALUES
+}
+
+# Feature: Nível Acadêmico
+NIVEL_ACADEMICO_VALORES = [
+    'nivel_academico_vazio', 'Pós Graduação Completo', 'Ensino Superior Completo', 'Mestrado Completo',
+    'Ensino Médio Completo', 'Ensino Técnico Completo', 'Ensino Superior Incompleto',
+    'Ensino Superior Cursando', 'Pós Graduação Incompleto', 'Mestrado Incompleto',
+    'Pós Graduação Cursando', 'Mestrado Cursando', 'Ensino Técnico Cursando',
+    'Doutorado Incompleto', 'Ensino Médio Incompleto', 'Ensino Fundamental Completo',
+    'Doutorado Completo', 'Ensino Técnico Incompleto', 'Ensino Médio Cursando',
+    'Ensino Fundamental Incompleto', 'Doutorado Cursando', 'Ensino Fundamental Cursando'
+]
+MAPPING_NIVEL_ACADEMICO = {
+    valor: f"nivel_academico_{valor.lower().replace(' ', '_').replace('ç', 'c').replace('ã', 'a')}"
+    for valor in NIVEL_ACADEMICO_VALORES
+}
+
+# Feature: Nível Profissional
+NIVEL_PROFISSIONAL_OUTROS = ['', 'Outro', 'outro', 'NA', 'nA', 'na', 'Na', 'None']
+
+
+def normalize_nivel_academico(series: pd.Series) -> pd.Series:
     """
-    Processes the applicants JSON file and returns a transformed DataFrame with engineered features.
+    Replaces missing or empty academic levels with the 'nivel_academico_vazio' category.
+    """
+    return series.fillna('').replace('', 'nivel_academico_vazio')
+
+
+def normalize_nivel_profissional(series: pd.Series) -> pd.Series:
+    """
+    Groups missing and placeholder professional levels into the 'outros' category.
+    """
+    return series.fillna('').replace(to_replace=NIVEL_PROFISSIONAL_OUTROS, value='outros')
+
+
+def nivel_profissional_column_name(valor: str) -> str:
+    """
+    Returns the flag column name generated for a normalized professional level.
+    """
+    return f"nivel_profissional_{valor.lower().replace(' ', '_').replace('ç', 'c')}"
+
+
+def flatten_applicants(data: Union[Dict[str, Any], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Flattens decoded applicants data into one row per applicant with the selected source columns.
 
     Args:
-        applicants_path (str): Path to the applicants JSON file.
+        data (Union[Dict[str, Any], pd.DataFrame]): Either the decoded JSON payload
+            ({ID: {section: {...}}}) or a DataFrame in the same layout returned by
+            pd.read_json (one column per applicant ID).
 
     Returns:
-        pd.DataFrame: Processed DataFrame.
+        pd.DataFrame: DataFrame with the columns in SELECTED_COLUMNS, sorted by ID (numeric
+            IDs are converted to integers, as pd.read_json does).
     """
-    df = pd.read_json(applicants_path)
+    if isinstance(data, pd.DataFrame):
+        df = data.copy(deep=False)
+    else:
+        df = pd.DataFrame.from_dict(data)
+    # IDs numéricos como no pd.read_json (e no caminho em lotes): '2' vem antes de '10'
+    df.columns = coerce_numeric_ids(pd.Series(df.columns, dtype=object))
 
-    df = transpose_and_prepare_dataframe(df)
+    with profile_stage('transpose') as stage:
+        df = transpose_and_prepare_dataframe(df)
+        stage.rows_out = len(df)
 
-    df = expand_dict_column(df, 'infos_basicas', 'infos_basicas_')
-    df = expand_dict_column(df, 'informacoes_pessoais', 'informacoes_pessoais_')
-    df = expand_dict_column(df, 'informacoes_profissionais', 'informacoes_profissionais_')
-    df = expand_dict_column(df, 'formacao_e_idiomas', 'formacao_e_idiomas_')
-    df = expand_dict_column(df, 'cargo_atual', 'cargo_atual_')
+    with profile_stage('expand_dict_column', rows_in=len(df)) as stage:
+        df = expand_dict_column(df, 'infos_basicas', 'infos_basicas_')
+        df = expand_dict_column(df, 'informacoes_pessoais', 'informacoes_pessoais_')
+        df = expand_dict_column(df, 'informacoes_profissionais', 'informacoes_profissionais_')
+        df = expand_dict_column(df, 'formacao_e_idiomas', 'formacao_e_idiomas_')
+        df = expand_dict_column(df, 'cargo_atual', 'cargo_atual_')
+        stage.rows_out = len(df)
 
-    # Seleção de colunas desejadas
-    selected_columns = [
-        'ID',
-        'infos_basicas_sabendo_de_nos_por',
-        'informacoes_pessoais_estado_civil',
-        'informacoes_profissionais_certificacoes',
-        'informacoes_profissionais_remuneracao',
-        'informacoes_profissionais_nivel_profissional',
-        'formacao_e_idiomas_nivel_academico',
-    ]
-    df = df[selected_columns]
+    return df[SELECTED_COLUMNS]
 
-    # Feature: Indicação
-    mapping_indicacao = {
-        'Indicação de colaborador': 'ind_colaborador',
-        'Indicação de cliente': 'ind_cliente'
-    }
 
+def flatten_applicant_record(applicant_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flattens a single raw applicant record into the selected source columns.
+
+    Args:
+        applicant_id (str): Applicant ID (top-level key of applicants.json).
+        record (Dict[str, Any]): Raw applicant record with its nested sections.
+
+    Returns:
+        Dict[str, Any]: Row with the columns in SELECTED_COLUMNS (None for missing fields).
+    """
+    row = {'ID': applicant_id}
+    for column, (section, field) in SELECTED_FIELDS.items():
+        values = record.get(section)
+        row[column] = values.get(field) if isinstance(values, dict) else None
+    return row
+
+
+def build_applicant_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Generates the engineered features from the flattened applicant columns.
+
+    Args:
+        df (pd.DataFrame): DataFrame with the columns in SELECTED_COLUMNS.
+
+    Returns:
+        pd.DataFrame: Processed DataFrame with engineered features.
+    """
+    with profile_stage('features', rows_in=len(df)) as stage:
+        df = _build_applicant_features(df)
+        stage.rows_out = len(df)
+    return df
+
+
+def _build_applicant_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Feature: Indicação
     df = generate_flags_and_category_column(
         df,
         source_column='infos_basicas_sabendo_de_nos_por',
-        mapping=mapping_indicacao,
+        mapping=MAPPING_INDICACAO,
         default_flag_column='ind_outros'
     )
 
     # Feature: Estado Civil
-    estado_civil_values = ['', 'Casado', 'Divorciado', 'Solteiro', 'Separado Judicialmente', 'União Estável', 'Viúvo']
-    mapping_estado_civil = {
-        value: f"estado_civil_{value.lower().replace(' ', '_') or 'vazio'}"
-        for value in estado_civil_values
-    }
-
     df = generate_flags_and_category_column(
         df,
         source_column='informacoes_pessoais_estado_civil',
-        mapping=mapping_estado_civil,
+        mapping=MAPPING_ESTADO_CIVIL,
         default_flag_column=None
     )
 
     # Feature: Nível Acadêmico
-    df['formacao_e_idiomas_nivel_academico'] = df['formacao_e_idiomas_nivel_academico'].fillna('').replace('', 'nivel_academico_vazio')
-
-    nivel_academico_valores = [
-        'nivel_academico_vazio', 'Pós Graduação Completo', 'Ensino Superior Completo', 'Mestrado Completo',
-        'Ensino Médio Completo', 'Ensino Técnico Completo', 'Ensino Superior Incompleto',
-        'Ensino Superior Cursando', 'Pós Graduação Incompleto', 'Mestrado Incompleto',
-        'Pós Graduação Cursando', 'Mestrado Cursando', 'Ensino Técnico Cursando',
-        'Doutorado Incompleto', 'Ensino Médio Incompleto', 'Ensino Fundamental Completo',
-        'Doutorado Completo', 'Ensino Técnico Incompleto', 'Ensino Médio Cursando',
-        'Ensino Fundamental Incompleto', 'Doutorado Cursando', 'Ensino Fundamental Cursando'
-    ]
-
-    mapping_nivel_academico = {
-        valor: f"nivel_academico_{valor.lower().replace(' ', '_').replace('ç', 'c').replace('ã', 'a')}"
-        for valor in nivel_academico_valores
-    }
+    df['formacao_e_idiomas_nivel_academico'] = normalize_nivel_academico(df['formacao_e_idiomas_nivel_academico'])
 
     df = generate_flags_and_category_column(
         df,
         source_column='formacao_e_idiomas_nivel_academico',
-        mapping=mapping_nivel_academico
+        mapping=MAPPING_NIVEL_ACADEMICO
     )
 
     # Feature: Nível Profissional
-    df['informacoes_profissionais_nivel_profissional'] = (
+    df['informacoes_profissionais_nivel_profissional'] = normalize_nivel_profissional(
         df['informacoes_profissionais_nivel_profissional']
-        .fillna('')
-        .replace(
-            to_replace=['', 'Outro', 'outro', 'NA', 'nA', 'na', 'Na', 'None'],
-            value='outros'
-        )
     )
 
     nivel_profissional_valores = df['informacoes_profissionais_nivel_profissional'].unique()
 
     mapping_nivel_profissional: Dict[str, str] = {
-        valor: f"nivel_profissional_{valor.lower().replace(' ', '_').replace('ç', 'c')}"
+        valor: nivel_profissional_column_name(valor)
         for valor in nivel_profissional_valores
     }
 
@@ -115,16 +207,160 @@ def process_applicants_data(applicants_path: str, predict=False) -> pd.DataFrame
         mapping=mapping_nivel_profissional
     )
 
-    # Feature: Certificações
-    df = process_certification_column(df, 'informacoes_profissionais_certificacoes')
+    # Feature: Certificações (df já é uma cópia local, sem necessidade de copiar de novo)
+    with profile_stage('certificacoes'):
+        df = process_certification_column(df, 'informacoes_profissionais_certificacoes', inplace=True)
 
     # Feature: Salário
-    df = process_salary_column(df, 'informacoes_profissionais_remuneracao')
+    with profile_stage('salario'):
+        df = process_salary_column(df, 'informacoes_profissionais_remuneracao')
 
     # Feature: Promoção
    # df = process_promotion_date_column(df, 'cargo_atual_data_ultima_promocao')
 
-    if not predict:
+    return df
+
+
+def empty_applicant_features() -> pd.DataFrame:
+    """
+    Returns a feature frame with no applicants: 'ID' plus the feature columns that do not
+    depend on the data (the professional-level flags only exist for values that occur).
+    """
+    return _build_applicant_features(pd.DataFrame(columns=SELECTED_COLUMNS))
+
+
+def transform_applicants(data: Union[Dict[str, Any], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Builds the applicant features from already-decoded data, without touching the filesystem.
+
+    Args:
+        data (Union[Dict[str, Any], pd.DataFrame]): Either the decoded JSON payload
+            ({ID: {section: {...}}}) or a DataFrame in the same layout returned by
+            pd.read_json (one column per applicant ID).
+
+    Returns:
+        pd.DataFrame: Processed DataFrame with engineered features.
+    """
+    df = flatten_applicants(data)
+    return build_applicant_features(df)
+
+
+def iter_flat_applicant_batches(
+    applicants_path: str,
+    batch_size: int,
+    ids: Optional[Set[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the applicants JSON file and yields the flattened source columns one batch at a time.
+
+    Args:
+        applicants_path (str): Path to the applicants JSON file.
+        batch_size (int): Number of applicants per batch.
+        ids (Set[str], optional): If set, only these applicant IDs are kept.
+
+    Yields:
+        pd.DataFrame: DataFrame with the columns in SELECTED_COLUMNS for each batch.
+    """
+    for batch in profile_iter('read_json', iter_json_batches(applicants_path, batch_size)):
+        with profile_stage('flatten', rows_in=len(batch)) as stage:
+            rows = [
+                flatten_applicant_record(applicant_id, record)
+                for applicant_id, record in batch
+                if ids is None or applicant_id in ids
+            ]
+            df = pd.DataFrame(rows, columns=SELECTED_COLUMNS) if rows else None
+            stage.rows_out = len(rows)
+        if df is not None:
+            yield df
+
+
+def iter_applicant_feature_batches(
+    applicants_path: str,
+    batch_size: int,
+    ids: Optional[Set[str]] = None,
+    n_jobs: int = 1
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the applicants JSON file and yields the engineered features one batch at a time.
+    Only the current batch of raw records is kept in memory; there is no transpose step.
+
+    Args:
+        applicants_path (str): Path to the applicants JSON file.
+        batch_size (int): Number of applicants per batch.
+        ids (Set[str], optional): If set, only these applicant IDs are processed.
+        n_jobs (int): Number of processes building the features of different batches.
+
+    Yields:
+        pd.DataFrame: Processed DataFrame for each batch.
+    """
+    flat_batches = iter_flat_applicant_batches(applicants_path, batch_size, ids=ids)
+    yield from parallel_map(build_applicant_features, flat_batches, n_jobs)
+
+
+def concat_applicant_feature_batches(batches: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates feature batches, filling flags of categories absent from a batch with 0,
+    and sorts the result by ID.
+
+    Args:
+        batches (Iterable[pd.DataFrame]): Feature batches from iter_applicant_feature_batches.
+
+    Returns:
+        pd.DataFrame: Processed DataFrame.
+    """
+    df = pd.concat(batches, ignore_index=True)
+
+    # Categorias (ex.: nível profissional) que não aparecem em todos os lotes
+    missing_flags = [col for col in df.columns if col != 'ID' and df[col].isna().any()]
+    if missing_flags:
+        df[missing_flags] = df[missing_flags].fillna(0).astype(np.uint8)
+
+    df['ID'] = coerce_numeric_ids(df['ID'])
+    return df.sort_values(by='ID').reset_index(drop=True)
+
+
+def process_applicants_data(
+    applicants_path: str,
+    predict=False,
+    chunksize: Optional[int] = None,
+    ingest: bool = True,
+    n_partitions: int = 1
+) -> pd.DataFrame:
+    """
+    Processes the applicants JSON file and returns a transformed DataFrame with engineered features.
+
+    Args:
+        applicants_path (str): Path to the applicants JSON file.
+        predict (bool): If True, skips the ingestion into PostgreSQL.
+        chunksize (int, optional): If set, streams the file in batches of this many applicants
+                                   instead of loading it whole with pd.read_json.
+        ingest (bool): If False, skips the ingestion into PostgreSQL (e.g. to run it in background).
+        n_partitions (int): If greater than 1, builds the features of contiguous ID ranges
+                            (or of the streamed batches) in this many processes.
+
+    Returns:
+        pd.DataFrame: Processed DataFrame.
+    """
+    if chunksize:
+        batches = list(iter_applicant_feature_batches(applicants_path, chunksize, n_jobs=n_partitions))
+        with profile_stage('concat', rows_in=sum(len(batch) for batch in batches)) as stage:
+            df = concat_applicant_feature_batches(batches)
+            stage.rows_out = len(df)
+    else:
+        with profile_stage('read_json') as stage:
+            df = pd.read_json(applicants_path)
+            stage.rows_out = df.shape[1]
+        if n_partitions > 1:
+            df = flatten_applicants(df)
+            partitions = split_by_id_ranges(df, n_partitions)
+            # Os estágios dentro dos processos filhos ficam contidos em 'features'
+            with profile_stage('features', rows_in=len(df)) as stage:
+                df = concat_applicant_feature_batches(parallel_map(build_applicant_features, partitions, n_partitions))
+                stage.rows_out = len(df)
+        else:
+            df = transform_applicants(df)
+
+    if ingest and not predict:
         ingest_dataframe_to_postgres(df, local=True, table_name="applicants", if_exists="replace")
 
     return df
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, NamedTuple, Optional
+from datathon_package.featurizer import ApplicantFeaturizer
+
+# Arquivos do artefato de serving
+BOOSTER_FILE = "model.txt"
+METADATA_FILE = "metadata.json"
+ARTIFACT_FORMAT_VERSION = 1
+
+
+class ServingArtifact(NamedTuple):
+    """Model, featurizer and metadata loaded from a serving artifact directory."""
+    model: Any
+    featurizer: ApplicantFeaturizer
+    metadata: Dict[str, Any]
+
+    @property
+    def version(self) -> str:
+        return self.metadata["checksum"][:16]
+
+
+class BoosterClassifier:
+    """
+    Minimal binary classifier over a native LightGBM Booster, with the predict_proba /
+    classes_ interface used by PredictionService.
+    """
+
+    def __init__(self, booster: Any, classes: List[Any], feature_names: List[str]):
+        self.booster = booster
+        self.classes_ = np.asarray(classes)
+        self.feature_name_ = list(feature_names)
+
+    @property
+    def booster_(self) -> Any:
+        # Mesmo atributo do LGBMClassifier (ex.: para export_serving_artifact)
+        return self.booster
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        positive = self.booster.predict(X)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def export_serving_artifact(model: Any, featurizer: ApplicantFeaturizer, output_dir: str) -> Dict[str, Any]:
+    """
+    Exports a fitted LGBMClassifier as a lean serving artifact: the native booster in
+    LightGBM's text format plus a JSON metadata file with the feature layout, the classes
+    and the booster checksum. The metadata is written last, so readers that watch it
+    never see a half-written artifact.
+
+    Args:
+        model (Any): Fitted LGBMClassifier.
+        featurizer (ApplicantFeaturizer): Fitted featurizer used in training.
+        output_dir (str): Artifact directory (created if missing).
+
+    Returns:
+        Dict[str, Any]: The written metadata.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    booster_text = model.booster_.model_to_string().encode("utf-8")
+
+    metadata = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "feature_names": list(featurizer.feature_names_),
+        "classes": np.asarray(model.classes_).tolist(),
+        "num_trees": int(model.booster_.num_trees()),
+        "checksum": _sha256(booster_text),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    _write_atomic(os.path.join(output_dir, BOOSTER_FILE), booster_text)
+    _write_atomic(os.path.join(output_dir, METADATA_FILE), json.dumps(metadata, indent=2).encode("utf-8"))
+    return metadata
+
+
+def load_serving_artifact(artifact_dir: str) -> ServingArtifact:
+    """
+    Loads a serving artifact written by export_serving_artifact.
+
+    Args:
+        artifact_dir (str): Artifact directory.
+
+    Returns:
+        ServingArtifact: Booster-backed classifier, featurizer rebuilt from the metadata, and the metadata.
+
+    Raises:
+        ValueError: If the booster does not match the checksum or the feature layout in the metadata.
+    """
+    import lightgbm as lgb
+
+    with open(os.path.join(artifact_dir, METADATA_FILE), "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    with open(os.path.join(artifact_dir, BOOSTER_FILE), "rb") as f:
+        booster_text = f.read()
+
+    if _sha256(booster_text) != metadata["checksum"]:
+        raise ValueError(f"Checksum do booster em {artifact_dir} não confere com {METADATA_FILE}.")
+
+    booster = lgb.Booster(model_str=booster_text.decode("utf-8"))
+    if booster.feature_name() != metadata["feature_names"]:
+        raise ValueError("Colunas do booster diferentes das registradas nos metadados.")
+
+    featurizer = ApplicantFeaturizer().fit(pd.DataFrame(columns=metadata["feature_names"]))
+    model = BoosterClassifier(booster, metadata["classes"], metadata["feature_names"])
+    return ServingArtifact(model, featurizer, metadata)
+
+
+def artifact_mtime(artifact_dir: str) -> Optional[float]:
+    """
+    Returns the modification time of the artifact metadata, or None if there is no artifact.
+    """
+    try:
+        return os.stat(os.path.join(artifact_dir, METADATA_FILE)).st_mtime_ns / 1e9
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a BoundedExecutor already has max_pending calls in flight."""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls (request parsing, featurize-and-score) from an asyncio event loop
+    in a bounded thread pool, so the loop never blocks on CPU work.
+
+    At most max_pending calls are queued or running at a time; run() raises QueueFullError
+    beyond that (the API answers 429) instead of letting the queue grow. Each call is
+    awaited for at most timeout_seconds: on timeout the caller gets asyncio.TimeoutError,
+    a call still waiting in the queue is dropped, and a call already running finishes in
+    its thread but keeps counting towards max_pending until it does. The pool is created
+    lazily (and again after a fork), so the executor can be built before a preforking
+    server forks its workers.
+
+    Example:
+        executor = BoundedExecutor(max_workers=4, max_pending=64, timeout_seconds=10)
+        results = await executor.run(service.predict, payload)
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, timeout_seconds: Optional[float] = 10.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.rejected = 0
+        self.timeouts = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of calls queued or running.
+        """
+        return self._pending
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs fn(*args) in the pool and returns its result.
+
+        Raises:
+            QueueFullError: If max_pending calls are already in flight.
+            asyncio.TimeoutError: If the call does not finish within timeout_seconds.
+        """
+        pool = self._executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"Fila cheia ({self.max_pending} chamadas em andamento).")
+            self._pending += 1
+
+        try:
+            future = pool.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            # O cancelamento no timeout se propaga ao Future do pool (descarta chamadas ainda na fila)
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds or None)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def shutdown(self) -> None:
+        """
+        Stops the pool after the calls already submitted.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Depois de um fork as threads do processo pai não existem mais
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+                    self._pending = 0
+                    self._pid = os.getpid()
+        return self._pool
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
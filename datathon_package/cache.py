@@ -0,0 +1,219 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from datathon_package.applicants import SELECTED_COLUMNS
+
+# Campos do candidato que entram nas features (o ID não altera o score)
+CACHE_KEY_COLUMNS = [col for col in SELECTED_COLUMNS if col != 'ID']
+
+
+def file_checksum(path: str, length: int = 16) -> str:
+    """
+    Returns a short SHA-256 checksum of a file, used as the model version.
+
+    Args:
+        path (str): Path to the file (e.g. the pickled model).
+        length (int): Number of hex characters to keep.
+
+    Returns:
+        str: Hex digest prefix.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def applicant_cache_key(row: Dict[str, Any], model_version: str) -> str:
+    """
+    Returns a stable key for a flattened applicant row and a model version.
+
+    Only the source fields used by the feature pipeline are hashed, in a fixed order,
+    so two payloads that differ only in unused fields, key order or applicant ID
+    share the same entry.
+
+    Args:
+        row (Dict[str, Any]): Row returned by flatten_applicant_record.
+        model_version (str): Version of the model that produced the score.
+
+    Returns:
+        str: Cache key.
+    """
+    canonical = json.dumps([row.get(col) for col in CACHE_KEY_COLUMNS], ensure_ascii=False, default=str)
+    return f"{model_version}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+
+class LocalCacheBackend:
+    """
+    In-process LRU cache with a per-entry TTL and a bounded number of entries.
+
+    Each entry holds a short key and a (prediction, probability) pair, so max_entries
+    bounds the memory used (roughly 250 bytes per entry).
+    """
+
+    def __init__(self, max_entries: int = 100000, ttl_seconds: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    values.append(None)
+                elif entry[1] is not None and entry[1] <= now:
+                    del self._entries[key]
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    values.append(entry[0])
+        return values
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            # Remove os menos usados recentemente além do limite
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by every worker, stored in Redis with a TTL (memory is bounded by the
+    Redis maxmemory/eviction policy). The redis package (optional extra ``cache``) is
+    imported only when no client is given.
+
+    The cache is an optimization, so Redis failures (outage, timeout) never reach the
+    caller: a failed read returns all misses and a failed write is skipped. Failures are
+    counted in errors and, if error_observer is given, reported as error_observer(operation, exc).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl_seconds: Optional[float] = 3600,
+                 prefix: str = "prediction:", client: Any = None,
+                 error_observer: Optional[Callable[[str, Exception], None]] = None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.error_observer = error_observer
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        try:
+            raw = self.client.mget([self.prefix + key for key in keys])
+        except Exception as e:
+            # Redis fora do ar: tudo vira miss e o modelo pontua normalmente
+            self._failed("get", e)
+            return [None] * len(keys)
+        return [None if value is None else tuple(json.loads(value)) for value in raw]
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.prefix + key, json.dumps(value), ex=ttl)
+            pipe.execute()
+        except Exception as e:
+            self._failed("set", e)
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        if self.error_observer is not None:
+            self.error_observer(operation, error)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class PredictionCache:
+    """
+    Caches (prediction, probability) pairs per applicant, keyed on the canonical feature
+    fields and the model version, with hit/miss counters.
+
+    model_version is the default version of the keys; callers that hot-reload the model pass
+    the version they scored with to get_many/set_many instead of changing it.
+
+    Example:
+        cache = PredictionCache(LocalCacheBackend(max_entries=10000), model_version="ab12")
+        cached = cache.get_many(rows)
+        cache.set_many(rows, [(0, 0.12), ...], model_version="cd34")
+    """
+
+    def __init__(self, backend: Any, model_version: str):
+        self.backend = backend
+        self.model_version = model_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def keys(self, rows: Sequence[Dict[str, Any]], model_version: Optional[str] = None) -> List[str]:
+        version = self.model_version if model_version is None else model_version
+        return [applicant_cache_key(row, version) for row in rows]
+
+    def get_many(self, rows: Sequence[Dict[str, Any]], model_version: Optional[str] = None) -> List[Optional[Any]]:
+        """
+        Returns the cached result of each row, or None when it is not cached.
+        """
+        values = self.backend.get_many(self.keys(rows, model_version))
+        hits = sum(value is not None for value in values)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(values) - hits
+        return values
+
+    def set_many(self, rows: Sequence[Dict[str, Any]], values: Sequence[Any],
+                 model_version: Optional[str] = None) -> None:
+        """
+        Stores the result of each row.
+        """
+        self.backend.set_many(dict(zip(self.keys(rows, model_version), values)))
+
+    def stats(self, model_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns the hit/miss counters, the hit rate, the number of entries (local backends)
+        and the number of backend errors (Redis).
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        stats = {
+            "backend": type(self.backend).__name__,
+            "model_version": self.model_version if model_version is None else model_version,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+        if hasattr(self.backend, "__len__"):
+            stats["entries"] = len(self.backend)
+        if hasattr(self.backend, "errors"):
+            stats["errors"] = self.backend.errors
+        return stats
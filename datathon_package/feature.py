@@ -1,8 +1,31 @@
+import numpy as np
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from pathlib import Path
 import re
 
+
+def encode_category_codes(series: pd.Series, mapping: Dict[str, str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Maps a categorical text column to integer codes in a single pass.
+
+    Args:
+        series (pd.Series): Source column with text categories.
+        mapping (Dict[str, str]): Dictionary where keys are source values and
+                                  values are output column names.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: Array with the position of each row's output column
+                                      (-1 for unmatched values) and the output column names.
+    """
+    columns = list(dict.fromkeys(mapping.values()))
+    column_position = {col: i for i, col in enumerate(columns)}
+    value_codes = {value: column_position[col] for value, col in mapping.items()}
+
+    codes = series.map(value_codes).fillna(-1).to_numpy(dtype=np.int64)
+    return codes, columns
+
+
 def generate_flags_and_category_column(
     df: pd.DataFrame,
     source_column: str,
@@ -22,25 +45,54 @@ def generate_flags_and_category_column(
                                              If None, unmatched values are ignored.
 
     Returns:
-        pd.DataFrame: Updated DataFrame with new binary columns and the source column removed.
+        pd.DataFrame: Updated DataFrame with new uint8 binary columns and the source column removed.
     """
-    df = df.copy()
+    codes, columns = encode_category_codes(df[source_column], mapping)
+    matched = codes >= 0
 
-    # Create binary flags for mapped values
-    for value, col_name in mapping.items():
-        df[col_name] = df[source_column].apply(lambda x: 1 if x == value else 0)
+    # Create binary flags for mapped values with a single scatter
+    flags = np.zeros((len(df), len(columns)), dtype=np.uint8)
+    flags[np.flatnonzero(matched), codes[matched]] = 1
+    flags_df = pd.DataFrame(flags, columns=columns, index=df.index)
 
     # Add default column for unmatched values
     if default_flag_column:
-        df[default_flag_column] = df[source_column].apply(lambda x: 0 if x in mapping else 1)
+        flags_df[default_flag_column] = (~matched).astype(np.uint8)
 
     # Drop the original source column
-    df.drop(columns=[source_column], inplace=True)
+    return pd.concat([df.drop(columns=[source_column]), flags_df], axis=1)
 
-    return df
+
+# Cada item não vazio da lista separada por vírgulas começa com um caractere que não é vírgula nem espaço
+CERTIFICATION_ITEM_PATTERN = re.compile(r'(?:^|,)\s*[^,\s]')
 
 
-def process_certification_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
+def count_certifications(series: pd.Series) -> np.ndarray:
+    """
+    Counts the non-empty comma-separated items of a free-text certification column.
+    Missing values count as 0.
+
+    Args:
+        series (pd.Series): Certification column (e.g. 'AWS, Azure, PMP').
+
+    Returns:
+        np.ndarray: Int64 array with the count of each row.
+    """
+    # A contagem roda uma vez por valor distinto, não por linha
+    codes, uniques = pd.factorize(series)
+    unique_counts = pd.Series(uniques, dtype=object).astype(str).str.count(CERTIFICATION_ITEM_PATTERN)
+
+    counts = np.zeros(len(series), dtype=np.int64)
+    valid = codes >= 0
+    counts[valid] = unique_counts.to_numpy(dtype=np.int64)[codes[valid]]
+    return counts
+
+
+def process_certification_column(
+    df: pd.DataFrame,
+    column: str,
+    inplace: bool = False
+) -> pd.DataFrame:
     """
     Processes a column with comma-separated certification strings and generates:
       - A count of certifications
@@ -49,29 +101,65 @@ def process_certification_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
     Args:
         df (pd.DataFrame): Input DataFrame
         column (str): Name of the certification column (comma-separated string or empty)
+        inplace (bool): If True, adds the new columns to df itself instead of building a new frame
 
     Returns:
-        pd.DataFrame: Updated DataFrame with count and binary flags, original column dropped
+        pd.DataFrame: Updated DataFrame with count and uint8 binary flags, original column dropped
     """
-    df = df.copy()
+    counts = count_certifications(df[column])
 
-    def count_certifications(val: Any) -> int:
-        if pd.isna(val) or str(val).strip() == '':
-            return 0
-        return len([x for x in str(val).split(',') if x.strip() != ''])
+    # Flags por faixa a partir de comparações sobre o array de contagens
+    new_columns = {
+        'certificacoes_count': counts,
+        'certificacoes_0': (counts == 0).astype(np.uint8),
+        'certificacoes_1_3': ((counts >= 1) & (counts <= 3)).astype(np.uint8),
+        'certificacoes_5_mais': (counts >= 5).astype(np.uint8),
+    }
 
-    # Count certifications
-    df['certificacoes_count'] = df[column].apply(count_certifications)
+    if inplace:
+        df.drop(columns=[column], inplace=True)
+        for name, values in new_columns.items():
+            df[name] = values
+        return df
 
-    # Create binary flags by range
-    df['certificacoes_0'] = df['certificacoes_count'].apply(lambda x: 1 if x == 0 else 0)
-    df['certificacoes_1_3'] = df['certificacoes_count'].apply(lambda x: 1 if 1 <= x <= 3 else 0)
-    df['certificacoes_5_mais'] = df['certificacoes_count'].apply(lambda x: 1 if x >= 5 else 0)
+    return pd.concat([df.drop(columns=[column]), pd.DataFrame(new_columns, index=df.index)], axis=1)
 
-    # Drop the original column
-    df.drop(columns=[column], inplace=True)
 
-    return df
+# Regex to extract numeric part: handles "R$ 2.500,00", "5000", "22000 mensais", etc.
+SALARY_PATTERN = re.compile(r'(\d{1,3}(?:[\.\d{3}]*)(?:,\d{2})?|\d+)')
+
+# Limites inferiores das faixas salariais e a coluna gerada para cada faixa
+# (a faixa 15000-20000 não gera coluna)
+SALARY_BIN_EDGES = [0, 100, 300, 500, 1000, 5000, 10000, 15000, 20000]
+SALARY_BIN_COLUMNS = [
+    # Faixas horista (valor < 1000)
+    'horista0_100', 'horista_100_300', 'horista300_500', 'horista500_1000',
+    # Faixas mensalista (valor >= 1000)
+    'mensalista1000_5000', 'mensalista_5000_10000', 'mensalista_10k_15k', None, 'mensalista20k_mais',
+]
+
+
+def extract_salary_values(series: pd.Series) -> np.ndarray:
+    """
+    Extracts the numeric salary value from free-text salary strings.
+    Missing, empty or unparseable values are returned as 0.
+
+    Args:
+        series (pd.Series): Salary column (e.g. 'R$ 2.500,00 mensal', 'R$115 p/h').
+
+    Returns:
+        np.ndarray: Float array with the extracted values.
+    """
+    # A regex roda uma vez por valor distinto, não por linha
+    codes, uniques = pd.factorize(series)
+    raw = pd.Series(uniques, dtype=object).astype(str).str.extract(SALARY_PATTERN, expand=False)
+    raw = raw.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    unique_values = pd.to_numeric(raw, errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+
+    values = np.zeros(len(series), dtype=np.float64)
+    valid = codes >= 0
+    values[valid] = unique_values[codes[valid]]
+    return values
 
 
 def process_salary_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
@@ -87,41 +175,26 @@ def process_salary_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
         column (str): Name of the salary column
 
     Returns:
-        pd.DataFrame: DataFrame with salary ranges as binary columns and original column removed
+        pd.DataFrame: DataFrame with salary ranges as uint8 binary columns and original column removed
     """
-    df = df.copy()
+    values = extract_salary_values(df[column])
 
-    def extract_salary(value: Any) -> float:
-        if pd.isna(value) or str(value).strip() == '' or str(value).strip() == '0':
-            return 0.0
-        # Regex to extract numeric part: handles "R$ 2.500,00", "5000", "22000 mensais", etc.
-        match = re.search(r'(\d{1,3}(?:[\.\d{3}]*)(?:,\d{2})?|\d+)', str(value))
-        if match:
-            raw = match.group(1).replace('.', '').replace(',', '.')
-            try:
-                return float(raw)
-            except ValueError:
-                return 0.0
-        return 0.0
-
-    df['remuneracao_valor'] = df[column].apply(extract_salary)
+    # Índice da faixa de cada linha em um único np.digitize
+    bins = np.digitize(values, SALARY_BIN_EDGES) - 1
 
-    # Faixas horista (valor < 1000)
-    df['horista0_100'] = df['remuneracao_valor'].apply(lambda x: 1 if 0 <= x < 100 else 0)
-    df['horista_100_300'] = df['remuneracao_valor'].apply(lambda x: 1 if 100 <= x < 300 else 0)
-    df['horista300_500'] = df['remuneracao_valor'].apply(lambda x: 1 if 300 <= x < 500 else 0)
-    df['horista500_1000'] = df['remuneracao_valor'].apply(lambda x: 1 if 500 <= x < 1000 else 0)
+    output_columns = [col for col in SALARY_BIN_COLUMNS if col is not None]
+    bin_position = np.array(
+        [output_columns.index(col) if col is not None else -1 for col in SALARY_BIN_COLUMNS] + [-1]
+    )
+    positions = bin_position[bins]
+    matched = positions >= 0
 
-    # Faixas mensalista (valor >= 1000)
-    df['mensalista1000_5000'] = df['remuneracao_valor'].apply(lambda x: 1 if 1000 <= x < 5000 else 0)
-    df['mensalista_5000_10000'] = df['remuneracao_valor'].apply(lambda x: 1 if 5000 <= x < 10000 else 0)
-    df['mensalista_10k_15k'] = df['remuneracao_valor'].apply(lambda x: 1 if 10000 <= x < 15000 else 0)
-    df['mensalista20k_mais'] = df['remuneracao_valor'].apply(lambda x: 1 if x >= 20000 else 0)
+    flags = np.zeros((len(df), len(output_columns)), dtype=np.uint8)
+    flags[np.flatnonzero(matched), positions[matched]] = 1
+    flags_df = pd.DataFrame(flags, columns=output_columns, index=df.index)
 
-    # Remove coluna original e auxiliar
-    df.drop(columns=[column, 'remuneracao_valor'], inplace=True)
-
-    return df
+    # Remove coluna original
+    return pd.concat([df.drop(columns=[column]), flags_df], axis=1)
 
 from datetime import datetime
 
@@ -0,0 +1,197 @@
+import glob
+import hashlib
+import json
+import os
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, NamedTuple, Optional
+from datathon_package.schema import MASTER_ID_COLUMNS, MASTER_TARGET_COLUMN
+
+# Arquivos do feature store
+FEATURES_FILE = "features.npy"
+TARGET_FILE = "target.npy"
+COLUMNS_FILE = "columns.json"
+DATASET_CACHE_PATTERN = "lgb_dataset_*.bin"
+FEATURE_STORE_FORMAT_VERSION = 1
+
+# Parâmetros do LightGBM (e seus nomes no LGBMClassifier) que mudam a construção do Dataset:
+# binning, amostra usada no binning e pré-filtro de features por min_data_in_leaf
+DATASET_PARAMS = (
+    "max_bin", "min_data_in_bin", "bin_construct_sample_cnt", "subsample_for_bin",
+    "min_data_in_leaf", "min_child_samples", "feature_pre_filter", "use_missing",
+    "zero_as_missing", "seed", "random_state", "data_random_seed", "linear_tree",
+)
+
+
+class FeatureStore(NamedTuple):
+    """
+    Features and target of the master table mapped from disk.
+
+    Attributes:
+        X (np.ndarray): float32 feature matrix (rows x features), a read-only memmap.
+        y (np.ndarray): uint8 target of each row.
+        feature_names (List[str]): Column of each feature in X.
+        metadata (Dict[str, Any]): Contents of columns.json.
+        path (str): Store directory.
+    """
+    X: np.ndarray
+    y: np.ndarray
+    feature_names: List[str]
+    metadata: Dict[str, Any]
+    path: str
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Returns X as a DataFrame that shares the mapped memory (no copy).
+        """
+        return pd.DataFrame(self.X, columns=self.feature_names, copy=False)
+
+
+def write_feature_store(df_master: pd.DataFrame, output_dir: str) -> Dict[str, Any]:
+    """
+    Writes the features and target of the master table as a NumPy feature store:
+    a float32 row-major matrix (features.npy), the uint8 target (target.npy) and the
+    column layout (columns.json). The matrix is filled one column at a time straight
+    into the file, and columns.json is written last, so readers never see a partial store.
+    LightGBM Datasets cached for the previous version of the store are deleted.
+
+    Args:
+        df_master (pd.DataFrame): Master table (output of merge_master_table).
+        output_dir (str): Store directory (created if missing).
+
+    Returns:
+        Dict[str, Any]: The written metadata.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Datasets em cache da versão anterior nunca mais seriam lidos
+    for stale in glob.glob(os.path.join(output_dir, DATASET_CACHE_PATTERN)):
+        os.remove(stale)
+
+    feature_names = [
+        col for col in df_master.columns if col not in MASTER_ID_COLUMNS and col != MASTER_TARGET_COLUMN
+    ]
+    labeled = df_master[MASTER_TARGET_COLUMN].notna().to_numpy()
+    n_rows = int(labeled.sum())
+
+    features_path = os.path.join(output_dir, FEATURES_FILE)
+    features = np.lib.format.open_memmap(
+        f"{features_path}.tmp", mode="w+", dtype=np.float32, shape=(n_rows, len(feature_names))
+    )
+    for j, col in enumerate(feature_names):
+        features[:, j] = df_master[col].to_numpy(dtype=np.float32, na_value=np.nan)[labeled]
+    features.flush()
+    del features
+    os.replace(f"{features_path}.tmp", features_path)
+
+    target_path = os.path.join(output_dir, TARGET_FILE)
+    with open(f"{target_path}.tmp", "wb") as f:
+        np.save(f, df_master[MASTER_TARGET_COLUMN].to_numpy()[labeled].astype(np.uint8))
+    os.replace(f"{target_path}.tmp", target_path)
+
+    metadata = {
+        "format_version": FEATURE_STORE_FORMAT_VERSION,
+        # Identifica esta gravação (chave dos Datasets do LightGBM em cache)
+        "version": uuid.uuid4().hex,
+        "feature_names": feature_names,
+        "n_rows": n_rows,
+        "dtype": "float32",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    columns_path = os.path.join(output_dir, COLUMNS_FILE)
+    with open(f"{columns_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    os.replace(f"{columns_path}.tmp", columns_path)
+    return metadata
+
+
+def feature_store_exists(store_dir: str) -> bool:
+    """
+    Returns True if store_dir holds a complete feature store.
+    """
+    return os.path.exists(os.path.join(store_dir, COLUMNS_FILE))
+
+
+def feature_store_is_stale(store_dir: str, source_path: str) -> bool:
+    """
+    Returns True if source_path (e.g. the master table Parquet) was written after the
+    store, so the store no longer matches it.
+    """
+    if not os.path.exists(source_path):
+        return False
+    return os.path.getmtime(source_path) > os.path.getmtime(os.path.join(store_dir, COLUMNS_FILE))
+
+
+def load_feature_store(store_dir: str, mmap: bool = True) -> FeatureStore:
+    """
+    Loads a feature store written by write_feature_store.
+
+    Args:
+        store_dir (str): Store directory.
+        mmap (bool): If True, memory-maps the matrix read-only instead of reading it.
+
+    Returns:
+        FeatureStore: Features, target and layout.
+
+    Raises:
+        ValueError: If the files do not match the layout in columns.json.
+    """
+    with open(os.path.join(store_dir, COLUMNS_FILE), "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    mmap_mode = "r" if mmap else None
+    X = np.load(os.path.join(store_dir, FEATURES_FILE), mmap_mode=mmap_mode)
+    y = np.load(os.path.join(store_dir, TARGET_FILE), mmap_mode=mmap_mode)
+
+    expected_shape = (metadata["n_rows"], len(metadata["feature_names"]))
+    if X.shape != expected_shape or len(y) != metadata["n_rows"]:
+        raise ValueError(f"Feature store em {store_dir} não confere com {COLUMNS_FILE}.")
+    return FeatureStore(X, y, metadata["feature_names"], metadata, store_dir)
+
+
+def dataset_cache_path(store: FeatureStore, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Returns the path of the cached LightGBM Dataset for this store and these parameters.
+    """
+    dataset_params = {name: value for name, value in (params or {}).items() if name in DATASET_PARAMS}
+    key = json.dumps({"version": store.metadata["version"], **dataset_params}, sort_keys=True, default=str)
+    return os.path.join(store.path, DATASET_CACHE_PATTERN.replace("*", hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]))
+
+
+def load_lgb_dataset(
+    store: FeatureStore,
+    params: Optional[Dict[str, Any]] = None,
+    weight: Optional[np.ndarray] = None
+) -> Any:
+    """
+    Returns a constructed LightGBM Dataset of the whole store, loading it from the binary
+    cache next to the store when the same store and binning parameters were used before,
+    so repeated training runs skip the histogram (bin) construction.
+
+    Args:
+        store (FeatureStore): Loaded feature store.
+        params (Dict[str, Any], optional): Training parameters; only the ones that affect
+                                           the Dataset construction (DATASET_PARAMS) are used.
+        weight (np.ndarray, optional): Sample weights (not cached).
+
+    Returns:
+        lightgbm.Dataset: The constructed Dataset.
+    """
+    import lightgbm as lgb
+
+    dataset_params = {"verbose": -1}
+    dataset_params.update({name: value for name, value in (params or {}).items() if name in DATASET_PARAMS})
+    path = dataset_cache_path(store, params)
+
+    if os.path.exists(path):
+        dataset = lgb.Dataset(path, params=dataset_params).construct()
+    else:
+        dataset = lgb.Dataset(
+            store.X, label=store.y, feature_name=store.feature_names, params=dataset_params
+        ).construct()
+        dataset.save_binary(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    if weight is not None:
+        dataset.set_weight(weight)
+    return dataset
@@ -0,0 +1,158 @@
+import pickle
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Union
+from datathon_package.applicants import (
+    MAPPING_ESTADO_CIVIL,
+    MAPPING_INDICACAO,
+    MAPPING_NIVEL_ACADEMICO,
+    flatten_applicants,
+    nivel_profissional_column_name,
+    normalize_nivel_academico,
+    normalize_nivel_profissional,
+)
+from datathon_package.feature import process_certification_column, process_salary_column
+
+# Colunas que não são features do modelo
+NON_FEATURE_COLUMNS = ['ID', 'prospect_codigo', 'target']
+
+
+class ApplicantFeaturizer:
+    """
+    Fitted applicant feature pipeline shared by training and serving.
+
+    The output column order is frozen at fit time, so a single applicant produces
+    exactly the same columns, in the same order, as the training data. Categories
+    not seen during training (or whose flag column was dropped from the master
+    table) are encoded as all zeros.
+
+    Example:
+        featurizer = ApplicantFeaturizer().fit(X_train)
+        X = featurizer.transform(payload)
+    """
+
+    def __init__(self):
+        self.feature_names_: Optional[List[str]] = None
+        self.vocabularies_: Optional[Dict[str, Dict[str, int]]] = None
+
+    def fit(self, X: pd.DataFrame) -> "ApplicantFeaturizer":
+        """
+        Freezes the output columns and the category vocabularies from the training features.
+
+        Args:
+            X (pd.DataFrame): Training feature frame (e.g. the master table). Only the column
+                              names are used; 'ID', 'prospect_codigo' and 'target' are ignored.
+
+        Returns:
+            ApplicantFeaturizer: The fitted featurizer.
+        """
+        self.feature_names_ = [col for col in X.columns if col not in NON_FEATURE_COLUMNS]
+        column_index = {col: i for i, col in enumerate(self.feature_names_)}
+
+        # Vocabulário de cada coluna categórica: nome da coluna de flag -> posição na saída
+        self.vocabularies_ = {
+            'infos_basicas_sabendo_de_nos_por': {
+                col: column_index[col]
+                for col in list(MAPPING_INDICACAO.values()) + ['ind_outros']
+                if col in column_index
+            },
+            'informacoes_pessoais_estado_civil': {
+                col: column_index[col] for col in MAPPING_ESTADO_CIVIL.values() if col in column_index
+            },
+            'formacao_e_idiomas_nivel_academico': {
+                col: column_index[col] for col in MAPPING_NIVEL_ACADEMICO.values() if col in column_index
+            },
+            'informacoes_profissionais_nivel_profissional': {
+                col: i for col, i in column_index.items() if col.startswith('nivel_profissional_')
+            },
+        }
+        return self
+
+    @property
+    def n_features(self) -> int:
+        self._check_fitted()
+        return len(self.feature_names_)
+
+    def transform(self, data: Union[Dict[str, Any], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Transforms raw applicants into the frozen feature layout.
+
+        Args:
+            data (Union[Dict[str, Any], pd.DataFrame]): Decoded applicants payload
+                ({ID: {section: {...}}}) or a DataFrame in pd.read_json layout.
+
+        Returns:
+            pd.DataFrame: Feature frame indexed by 'ID' with columns in feature_names_ order.
+        """
+        df = flatten_applicants(data)
+        values = self.transform_flat(df)
+        return pd.DataFrame(values, columns=self.feature_names_, index=pd.Index(df['ID'].to_numpy(), name='ID'))
+
+    def transform_flat(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Transforms already flattened applicant rows into a preallocated float32 array.
+
+        Args:
+            df (pd.DataFrame): DataFrame with the source columns returned by flatten_applicants.
+
+        Returns:
+            np.ndarray: Array of shape (len(df), n_features) in feature_names_ order.
+        """
+        self._check_fitted()
+        n_rows = len(df)
+        out = np.zeros((n_rows, len(self.feature_names_)), dtype=np.float32)
+        if n_rows == 0:
+            return out
+
+        column_index = {col: i for i, col in enumerate(self.feature_names_)}
+
+        # Flags categóricas: valor -> nome da coluna -> posição, com um único scatter por coluna
+        indicacao = df['infos_basicas_sabendo_de_nos_por']
+        self._scatter(out, indicacao.map(MAPPING_INDICACAO).fillna('ind_outros'), 'infos_basicas_sabendo_de_nos_por')
+        self._scatter(out, df['informacoes_pessoais_estado_civil'].map(MAPPING_ESTADO_CIVIL), 'informacoes_pessoais_estado_civil')
+        self._scatter(
+            out,
+            normalize_nivel_academico(df['formacao_e_idiomas_nivel_academico']).map(MAPPING_NIVEL_ACADEMICO),
+            'formacao_e_idiomas_nivel_academico'
+        )
+        nivel_profissional = normalize_nivel_profissional(df['informacoes_profissionais_nivel_profissional'])
+        self._scatter(
+            out,
+            nivel_profissional.map({v: nivel_profissional_column_name(v) for v in nivel_profissional.unique()}),
+            'informacoes_profissionais_nivel_profissional'
+        )
+
+        # Features numéricas: certificações e faixas salariais
+        numeric = df[['informacoes_profissionais_certificacoes', 'informacoes_profissionais_remuneracao']]
+        numeric = process_certification_column(numeric, 'informacoes_profissionais_certificacoes')
+        numeric = process_salary_column(numeric, 'informacoes_profissionais_remuneracao')
+        for col in numeric.columns:
+            if col in column_index:
+                out[:, column_index[col]] = numeric[col].to_numpy()
+
+        return out
+
+    def save(self, path: str) -> None:
+        """
+        Saves the fitted featurizer with pickle.
+        """
+        self._check_fitted()
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> "ApplicantFeaturizer":
+        """
+        Loads a featurizer saved with save().
+        """
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _scatter(self, out: np.ndarray, column_names: pd.Series, source_column: str) -> None:
+        positions = column_names.map(self.vocabularies_[source_column]).to_numpy(dtype=np.float64, na_value=np.nan)
+        rows = np.flatnonzero(~np.isnan(positions))
+        out[rows, positions[rows].astype(np.intp)] = 1
+
+    def _check_fitted(self) -> None:
+        if self.feature_names_ is None:
+            raise ValueError("ApplicantFeaturizer não foi ajustado. Chame fit() antes de transform().")
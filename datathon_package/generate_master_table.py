@@ -1,54 +1,372 @@
+import os
+import time
 import pandas as pd
-from datathon_package.prospects import process_prospects_data
-from datathon_package.applicants import process_applicants_data
-from datathon_package.utils import drop_constant_binary_columns, ingest_dataframe_to_postgres
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datathon_package.prospects import (
+    process_prospects_data,
+    iter_prospect_batches,
+    concat_prospect_batches
+)
+from datathon_package.applicants import (
+    process_applicants_data,
+    iter_applicant_feature_batches,
+    concat_applicant_feature_batches,
+    empty_applicant_features
+)
+from datathon_package.feature_store import write_feature_store
+from datathon_package.join import build_key_index, inner_join_positions, take_rows
+from datathon_package.incremental import (
+    fingerprint_json_records,
+    diff_fingerprints,
+    empty_manifest,
+    load_manifest,
+    save_manifest,
+    upsert_rows
+)
+from datathon_package.profiling import StageProfiler, profile_stage
+from datathon_package.schema import apply_master_schema, write_master_parquet
+from datathon_package.utils import (
+    drop_constant_binary_columns,
+    ingest_dataframe_to_postgres,
+    upsert_dataframe_to_postgres,
+    coerce_numeric_ids,
+    PostgresWriter
+)
+
+# Tamanho do lote usado pelo modo incremental quando chunksize não é informado
+INCREMENTAL_BATCH_SIZE = 10000
+
+
+def join_master_rows(
+    df_applicants: pd.DataFrame,
+    df_prospects: pd.DataFrame,
+    applicants_sorted: bool = False
+) -> pd.DataFrame:
+    """
+    Inner-joins applicants and prospects on ID = prospect_codigo.
+
+    The join runs on int32 keys against an index of the applicant IDs and gathers, by
+    position, only the columns kept in the master table (prospect_situacao_candidado is
+    left out); rows come in the same order as pd.merge(how='inner').
+
+    Args:
+        df_applicants (pd.DataFrame): Output of process_applicants_data.
+        df_prospects (pd.DataFrame): Output of process_prospects_data.
+        applicants_sorted (bool): If True, reuses the ascending ID order of df_applicants
+                                  (merge-join) instead of sorting the keys (see build_key_index).
+
+    Returns:
+        pd.DataFrame: Applicant columns followed by the prospect columns, with 'ID' and
+                      'prospect_codigo' as int32.
+    """
+    # IDs inválidos ficam fora do índice e das chaves da direita
+    index = build_key_index(df_applicants['ID'], assume_sorted=applicants_sorted)
+    left_rows, right_rows, keys = inner_join_positions(index, df_prospects['prospect_codigo'])
+
+    prospect_columns = [col for col in df_prospects.columns if col != 'prospect_situacao_candidado']
+    df_master = pd.concat(
+        [take_rows(df_applicants, left_rows), take_rows(df_prospects, right_rows, prospect_columns)],
+        axis=1
+    )
+    df_master['ID'] = keys
+    df_master['prospect_codigo'] = keys
+    return df_master
+
+
+def merge_master_table(
+    df_applicants: pd.DataFrame,
+    df_prospects: pd.DataFrame,
+    applicants_sorted: bool = False
+) -> pd.DataFrame:
+    """
+    Merges processed applicants and prospects into the master table.
+
+    Args:
+        df_applicants (pd.DataFrame): Output of process_applicants_data.
+        df_prospects (pd.DataFrame): Output of process_prospects_data.
+        applicants_sorted (bool): If True, reuses the ascending ID order of df_applicants
+                                  in the join (see join_master_rows).
+
+    Returns:
+        pd.DataFrame: Merged master table with only matched records, in the compact schema
+                      (see apply_master_schema).
+    """
+    df_master = join_master_rows(df_applicants, df_prospects, applicants_sorted)
+    df_master = drop_constant_binary_columns(df_master)
+
+    return apply_master_schema(df_master)
+
+
+def _profiled_branch(
+    name: str,
+    process_fn: Callable[..., pd.DataFrame],
+    path: str,
+    chunksize: Optional[int],
+    n_partitions: int,
+    cprofile_path: Optional[str] = None
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    # Perfil próprio do ramo: os registros voltam junto com o DataFrame (inclusive de um processo filho)
+    profiler = StageProfiler(name, cprofile_path=cprofile_path)
+    with profiler.activate():
+        with profile_stage(name) as stage:
+            df = process_fn(path, chunksize=chunksize, ingest=False, n_partitions=n_partitions)
+            stage.rows_out = len(df)
+    return df, profiler.records()
+
+
+def _branch_cprofile_path(profiler: StageProfiler, name: str) -> Optional[str]:
+    if not profiler.cprofile_path:
+        return None
+    root, ext = os.path.splitext(profiler.cprofile_path)
+    return f"{root}.{name}{ext or '.prof'}"
 
 
 def generate_master_table(
     applicants_path: str,
     prospects_path: str,
     output_path: str = './data/processed/master_table.parquet',
-    local=False
+    local=False,
+    chunksize: Optional[int] = None,
+    incremental: bool = False,
+    n_jobs: int = 1,
+    n_partitions: int = 1,
+    profiler: Optional[StageProfiler] = None,
+    feature_store_dir: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Generates and saves a master table by merging processed applicants and prospects data.
 
+    The PostgreSQL ingests run in a background writer while the merge and the Parquet
+    write proceed. Stage timings are printed and stored in df_master.attrs['timings'];
+    the detailed per-stage records (JSON read, transpose, expansions, prospects flattening, features,
+    merge, Parquet, each PostgreSQL ingest) are kept in the profiler, including the ones
+    recorded in the child processes of n_jobs > 1.
+
+    Args:
+        applicants_path (str): Path to the applicants JSON file.
+        prospects_path (str): Path to the prospects JSON file.
+        output_path (str): Path to save the output parquet file.
+        chunksize (int, optional): If set, streams both raw files in batches of this many records.
+        incremental (bool): If True, only recomputes new or changed applicants and vagas
+                            (see generate_master_table_incremental).
+        n_jobs (int): If greater than 1, processes applicants and prospects concurrently
+                      in separate processes.
+        n_partitions (int): Number of processes used inside each branch (by ID range or batch).
+        profiler (StageProfiler, optional): Profiler that receives the stage records
+                                            (e.g. to write a JSON report); a new one is used if None.
+        feature_store_dir (str, optional): If set, also writes the features and target as a
+                                           memory-mappable feature store (see write_feature_store).
+
+    Returns:
+        pd.DataFrame: Merged master table with only matched records.
+    """
+    profiler = profiler or StageProfiler("generate_master_table")
+    if incremental:
+        with profiler.activate():
+            return generate_master_table_incremental(
+                applicants_path, prospects_path, output_path, local, chunksize, feature_store_dir
+            )
+
+    with profiler.activate():
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        if n_jobs > 1:
+            # Os dois ramos são independentes até o merge
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                applicants_future = executor.submit(
+                    _profiled_branch, 'applicants', process_applicants_data, applicants_path, chunksize,
+                    n_partitions, _branch_cprofile_path(profiler, 'applicants')
+                )
+                prospects_future = executor.submit(
+                    _profiled_branch, 'prospects', process_prospects_data, prospects_path, chunksize,
+                    n_partitions, _branch_cprofile_path(profiler, 'prospects')
+                )
+                df_applicants, applicants_records = applicants_future.result()
+                df_prospects, prospects_records = prospects_future.result()
+        else:
+            df_applicants, applicants_records = _profiled_branch(
+                'applicants', process_applicants_data, applicants_path, chunksize, n_partitions
+            )
+            df_prospects, prospects_records = _profiled_branch(
+                'prospects', process_prospects_data, prospects_path, chunksize, n_partitions
+            )
+        profiler.merge(applicants_records)
+        profiler.merge(prospects_records)
+        timings['applicants'] = profiler.wall('applicants')
+        timings['prospects'] = profiler.wall('prospects')
+        timings['preprocessing'] = time.perf_counter() - start
+
+        # Ingestões no PostgreSQL fora do caminho crítico
+        writer = PostgresWriter(local)
+        writer.submit(df_applicants, table_name="applicants")
+        writer.submit(df_prospects, table_name="propects")
+
+        with profile_stage('merge', rows_in=len(df_applicants) + len(df_prospects)) as stage:
+            df_master = merge_master_table(df_applicants, df_prospects, applicants_sorted=True)
+            stage.rows_out = len(df_master)
+
+        # Salvar em Parquet
+        with profile_stage('parquet', rows_in=len(df_master)):
+            write_master_parquet(df_master, output_path)
+        if feature_store_dir:
+            with profile_stage('feature_store', rows_in=len(df_master)):
+                write_feature_store(df_master, feature_store_dir)
+
+        writer.submit(df_master, table_name="master_table")
+
+        with profile_stage('postgres_wait'):
+            postgres_timings = writer.close()
+
+    timings['merge'] = profiler.wall('merge')
+    timings['parquet'] = profiler.wall('parquet')
+    if feature_store_dir:
+        timings['feature_store'] = profiler.wall('feature_store')
+    timings['postgres_wait'] = profiler.wall('postgres_wait')
+    for table_name, seconds in postgres_timings.items():
+        timings[f'postgres_{table_name}'] = seconds
+    timings['total'] = time.perf_counter() - start
+
+    print("[MASTER TABLE] Tempos por etapa (s):")
+    for stage, seconds in timings.items():
+        print(f" - {stage}: {seconds:.2f}")
+    df_master.attrs['timings'] = timings
+
+    return df_master
+
+
+def generate_master_table_incremental(
+    applicants_path: str,
+    prospects_path: str,
+    output_path: str = './data/processed/master_table.parquet',
+    local=False,
+    chunksize: Optional[int] = None,
+    feature_store_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Incrementally refreshes the master table.
+
+    Every raw record is fingerprinted by ID and content hash and compared with the manifest
+    of the last run. Features are recomputed only for new or changed applicants and vagas;
+    the processed rows are upserted into per-source Parquet caches (kept in an 'incremental'
+    folder next to output_path) and into PostgreSQL. The first run (or a run without caches)
+    processes everything.
+
     Args:
         applicants_path (str): Path to the applicants JSON file.
         prospects_path (str): Path to the prospects JSON file.
         output_path (str): Path to save the output parquet file.
+        chunksize (int, optional): Number of raw records per streamed batch.
+        feature_store_dir (str, optional): If set, also rewrites the feature store from the
+                                           refreshed master table.
 
     Returns:
         pd.DataFrame: Merged master table with only matched records.
     """
-    df_applicants = process_applicants_data(applicants_path)
-    df_prospects = process_prospects_data(prospects_path)
+    state_dir = os.path.join(os.path.dirname(output_path) or '.', 'incremental')
+    os.makedirs(state_dir, exist_ok=True)
+    manifest_path = os.path.join(state_dir, 'manifest.json')
+    applicants_cache_path = os.path.join(state_dir, 'applicants.parquet')
+    prospects_cache_path = os.path.join(state_dir, 'prospects.parquet')
+    batch_size = chunksize or INCREMENTAL_BATCH_SIZE
 
-    # Converter IDs para inteiro, ignorando erros
-    df_applicants['ID'] = pd.to_numeric(df_applicants['ID'], errors='coerce').astype('Int64')
-    df_prospects['prospect_codigo'] = pd.to_numeric(df_prospects['prospect_codigo'], errors='coerce').astype('Int64')
+    has_cache = all(os.path.exists(path) for path in (manifest_path, applicants_cache_path, prospects_cache_path))
+    manifest = load_manifest(manifest_path) if has_cache else empty_manifest()
 
-    # Remover registros com IDs inválidos
-    df_applicants = df_applicants.dropna(subset=['ID'])
-    df_prospects = df_prospects.dropna(subset=['prospect_codigo'])
+    # Step 1: Fingerprint e delta em relação à última execução
+    with profile_stage('fingerprint'):
+        applicants_fingerprints = fingerprint_json_records(applicants_path)
+        prospects_fingerprints = fingerprint_json_records(prospects_path)
+    changed_applicants, removed_applicants = diff_fingerprints(manifest['applicants'], applicants_fingerprints)
+    changed_vagas, removed_vagas = diff_fingerprints(manifest['prospects'], prospects_fingerprints)
 
-    # Fazer merge
-    df_master = pd.merge(
-        df_applicants,
-        df_prospects,
-        left_on='ID',
-        right_on='prospect_codigo',
-        how='inner'
+    print(
+        f"[INCREMENTAL] applicants: {len(changed_applicants)} novos/alterados, {len(removed_applicants)} removidos | "
+        f"vagas: {len(changed_vagas)} novas/alteradas, {len(removed_vagas)} removidas"
     )
 
-    df_master = df_master.drop(columns=['prospect_situacao_candidado'], errors='ignore')
-    df_master = drop_constant_binary_columns(df_master)
+    # Step 2: Features apenas para o delta
+    with profile_stage('applicants', rows_in=len(changed_applicants)) as stage:
+        applicant_batches = list(iter_applicant_feature_batches(applicants_path, batch_size, ids=changed_applicants))
+        # Sem lotes, frames vazios com as colunas esperadas (primeira execução sem dados)
+        new_applicants = (
+            concat_applicant_feature_batches(applicant_batches) if applicant_batches else empty_applicant_features()
+        )
+        stage.rows_out = len(new_applicants)
+
+    with profile_stage('prospects', rows_in=len(changed_vagas)) as stage:
+        prospect_batches = list(iter_prospect_batches(prospects_path, batch_size, ids=changed_vagas, keep_vaga_id=True))
+        new_prospects = concat_prospect_batches(prospect_batches, keep_vaga_id=True)
+        stage.rows_out = len(new_prospects)
 
-    # Salvar em Parquet
-    df_master.to_parquet(output_path, index=False)
+    # Step 3: Upsert nos caches por fonte
+    cached_applicants = pd.read_parquet(applicants_cache_path) if has_cache else new_applicants.iloc[:0]
+    cached_prospects = pd.read_parquet(prospects_cache_path) if has_cache else new_prospects.iloc[:0]
 
-    ingest_dataframe_to_postgres(df_master, local, table_name="master_table", if_exists="replace")
+    applicant_keys = changed_applicants | removed_applicants
+    vaga_keys = changed_vagas | removed_vagas
 
+    df_applicants = upsert_rows(cached_applicants, new_applicants, 'ID', applicant_keys)
+    df_applicants = df_applicants.sort_values(by='ID').reset_index(drop=True)
+    df_prospects = upsert_rows(cached_prospects, new_prospects, 'vaga_id', vaga_keys)
+
+    df_applicants.to_parquet(applicants_cache_path, index=False)
+    df_prospects.to_parquet(prospects_cache_path, index=False)
+
+    # Step 4: Master table a partir dos caches (merge em memória, sem reprocessar JSON)
+    with profile_stage('merge', rows_in=len(df_applicants) + len(df_prospects)) as stage:
+        df_master = merge_master_table(df_applicants, df_prospects.drop(columns=['vaga_id']), applicants_sorted=True)
+        stage.rows_out = len(df_master)
+    with profile_stage('parquet', rows_in=len(df_master)):
+        write_master_parquet(df_master, output_path)
+    if feature_store_dir:
+        with profile_stage('feature_store', rows_in=len(df_master)):
+            write_feature_store(df_master, feature_store_dir)
+
+    # Step 5: Upsert no PostgreSQL só das chaves afetadas
+    with profile_stage('postgres'):
+        # Códigos de candidatos afetados por vagas alteradas (antes e depois da alteração)
+        old_rows = cached_prospects[cached_prospects['vaga_id'].astype(str).isin(vaga_keys)]
+        affected_codigos = set(old_rows['prospect_codigo'])
+        if not new_prospects.empty:
+            affected_codigos |= set(new_prospects['prospect_codigo'])
+
+        if not has_cache or list(df_applicants.columns) != list(cached_applicants.columns):
+            ingest_dataframe_to_postgres(df_applicants, local, table_name="applicants", if_exists="replace")
+        elif applicant_keys:
+            upsert_dataframe_to_postgres(
+                new_applicants, local, table_name="applicants", key_column='ID',
+                keys=coerce_numeric_ids(pd.Series(sorted(applicant_keys))).tolist()
+            )
+
+        prospects_table = df_prospects.drop(columns=['vaga_id'])
+        if not has_cache:
+            ingest_dataframe_to_postgres(prospects_table, local, table_name="propects", if_exists="replace")
+        elif affected_codigos:
+            upsert_dataframe_to_postgres(
+                prospects_table[prospects_table['prospect_codigo'].isin(affected_codigos)],
+                local, table_name="propects", key_column='prospect_codigo',
+                keys=[int(codigo) for codigo in sorted(affected_codigos)]
+            )
+
+        # Linhas da master table são identificadas pelo ID do candidato (= prospect_codigo)
+        affected_ids = pd.to_numeric(pd.Series(list(applicant_keys | affected_codigos), dtype=object), errors='coerce')
+        affected_ids = sorted(affected_ids.dropna().astype(int).unique())
+        if not has_cache or list(df_master.columns) != manifest.get('master_columns'):
+            ingest_dataframe_to_postgres(df_master, local, table_name="master_table", if_exists="replace")
+        elif affected_ids:
+            upsert_dataframe_to_postgres(
+                df_master[df_master['ID'].isin(affected_ids)],
+                local, table_name="master_table", key_column='ID', keys=affected_ids
+            )
+
+    # Step 6: Manifesto só é gravado depois de tudo processado
+    save_manifest(manifest_path, {
+        'applicants': applicants_fingerprints,
+        'prospects': prospects_fingerprints,
+        'master_columns': list(df_master.columns),
+    })
 
     return df_master
 
@@ -57,5 +375,7 @@ if __name__ == "__main__":
     applicants_path = './data/raw/applicants/applicants.json'
     prospects_path = './data/raw/prospects/prospects.json'
 
-    df_master = generate_master_table(applicants_path, prospects_path)
+    df_master = generate_master_table(
+        applicants_path, prospects_path, feature_store_dir='./data/processed/feature_store'
+    )
     print("Master table saved. Shape:", df_master.shape)
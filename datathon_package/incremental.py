@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Set, Tuple
+from datathon_package.utils import iter_json_records
+
+
+def record_fingerprint(record: Any) -> str:
+    """
+    Returns a stable content hash of a raw JSON record (key order does not matter).
+
+    Args:
+        record (Any): Decoded JSON record.
+
+    Returns:
+        str: Hex SHA-1 digest of the canonical JSON representation.
+    """
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def fingerprint_json_records(path: str) -> Dict[str, str]:
+    """
+    Streams a raw JSON export and fingerprints every record by ID.
+
+    Args:
+        path (str): Path to a JSON file shaped as {ID: {...}, ...}.
+
+    Returns:
+        Dict[str, str]: Mapping from record ID to content hash.
+    """
+    return {record_id: record_fingerprint(record) for record_id, record in iter_json_records(path)}
+
+
+def diff_fingerprints(previous: Dict[str, str], current: Dict[str, str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Compares two fingerprint mappings.
+
+    Args:
+        previous (Dict[str, str]): Fingerprints from the last processed run.
+        current (Dict[str, str]): Fingerprints of the current raw file.
+
+    Returns:
+        Tuple[Set[str], Set[str]]: IDs that are new or changed, and IDs that were removed.
+    """
+    changed = {record_id for record_id, digest in current.items() if previous.get(record_id) != digest}
+    removed = set(previous) - set(current)
+    return changed, removed
+
+
+def empty_manifest() -> Dict[str, Any]:
+    """
+    Returns a manifest with no processed records, which forces a full build.
+    """
+    return {'applicants': {}, 'prospects': {}, 'master_columns': None}
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """
+    Loads the incremental build manifest, or returns an empty one if it does not exist.
+    """
+    if not os.path.exists(path):
+        return empty_manifest()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    """
+    Saves the incremental build manifest atomically (write to a temp file, then rename).
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def upsert_rows(
+    cached: pd.DataFrame,
+    updates: pd.DataFrame,
+    key_column: str,
+    keys_to_replace: Iterable[Any]
+) -> pd.DataFrame:
+    """
+    Replaces the rows of a cached dataset whose key is in keys_to_replace with the updated rows.
+    Binary flag columns that exist on only one side are filled with 0.
+
+    Args:
+        cached (pd.DataFrame): Previously processed rows.
+        updates (pd.DataFrame): Newly processed rows for the new or changed keys.
+        key_column (str): Column holding the record ID.
+        keys_to_replace (Iterable[Any]): Keys (as strings) to drop from the cache, including removed ones.
+
+    Returns:
+        pd.DataFrame: Updated dataset.
+    """
+    keys_to_replace = {str(key) for key in keys_to_replace}
+    kept = cached[~cached[key_column].astype(str).isin(keys_to_replace)]
+    if updates.empty:
+        return kept.reset_index(drop=True)
+    df = pd.concat([kept, updates], ignore_index=True)
+
+    # Flags de categorias que só existem de um dos lados
+    missing_flags = [
+        col for col in df.columns
+        if col not in (key_column,) and df[col].isna().any()
+        and (col not in cached.columns or col not in updates.columns)
+    ]
+    if missing_flags:
+        df[missing_flags] = df[missing_flags].fillna(0).astype(np.uint8)
+
+    return df
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from typing import List, NamedTuple, Optional, Tuple
+
+INT32_MAX = np.iinfo(np.int32).max
+# Tabela de endereçamento direto (chave -> linha) só quando o intervalo das chaves é até
+# esse múltiplo do número de linhas indexadas; acima disso, busca binária nas chaves ordenadas
+LOOKUP_MAX_SPAN_RATIO = 8
+
+
+class KeyIndex(NamedTuple):
+    """
+    Prebuilt index of the join keys of one side (e.g. the applicants).
+
+    Attributes:
+        keys (np.ndarray): Valid keys as int32, in ascending order.
+        rows (np.ndarray): Row position in the indexed frame of each entry of keys.
+        unique (bool): True if no key repeats (each probe matches at most one row).
+        lookup (np.ndarray, optional): For unique keys in a dense range, the row of each key
+                                       offset by keys[0] (-1 where there is none).
+    """
+    keys: np.ndarray
+    rows: np.ndarray
+    unique: bool
+    lookup: Optional[np.ndarray] = None
+
+
+def int32_keys(ids: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts an ID column (strings or numbers) to non-nullable int32 join keys.
+
+    Args:
+        ids (pd.Series): ID column.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The int32 keys of the rows with a valid ID and the
+                                       positions of those rows (invalid IDs are skipped).
+
+    Raises:
+        ValueError: If an ID is not an integer or does not fit in int32.
+    """
+    values = None
+    if pd.api.types.is_integer_dtype(ids.dtype) and not pd.api.types.is_extension_array_dtype(ids.dtype):
+        values = ids.to_numpy()
+    elif ids.dtype == object and pd.api.types.infer_dtype(ids, skipna=False) == 'string':
+        # Códigos só com dígitos: conversão direta, bem mais rápida que o to_numeric
+        try:
+            values = ids.to_numpy().astype(np.int64)
+        except (ValueError, OverflowError):
+            values = None
+
+    if values is not None:
+        rows = np.arange(len(values))
+    else:
+        # IDs como texto (ou nulos): inválidos são descartados, como no to_numeric(errors='coerce')
+        numeric = pd.to_numeric(ids, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        rows = np.flatnonzero(~np.isnan(numeric))
+        values = numeric[rows]
+        if len(values) and not np.array_equal(values, np.floor(values)):
+            raise ValueError(f"Coluna '{ids.name}' tem IDs não inteiros.")
+
+    if len(values) and (values.min() < -INT32_MAX or values.max() > INT32_MAX):
+        raise ValueError(f"Coluna '{ids.name}' não cabe em int32.")
+    return values.astype(np.int32), rows
+
+
+def build_key_index(ids: pd.Series, assume_sorted: bool = False) -> KeyIndex:
+    """
+    Builds the index of one side of the join.
+
+    Args:
+        ids (pd.Series): ID column of the indexed frame.
+        assume_sorted (bool): If True and the IDs are already in ascending order (as in the
+                              frames sorted by transpose_and_prepare_dataframe), reuses that
+                              order instead of sorting, turning the join into a merge-join.
+                              The order is checked in one pass; unsorted IDs are sorted anyway.
+
+    Returns:
+        KeyIndex: Sorted int32 keys and their row positions.
+    """
+    keys, rows = int32_keys(ids)
+    if not (assume_sorted and bool(np.all(keys[1:] >= keys[:-1]))):
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+    unique = bool(np.all(keys[1:] != keys[:-1]))
+
+    lookup = None
+    if unique and len(keys):
+        span = int(keys[-1]) - int(keys[0]) + 1
+        if span <= LOOKUP_MAX_SPAN_RATIO * len(keys):
+            lookup = np.full(span, -1, dtype=np.int64)
+            lookup[keys - keys[0]] = rows
+    return KeyIndex(keys, rows, unique, lookup)
+
+
+def inner_join_positions(index: KeyIndex, ids: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Matches the IDs of the probe side against a KeyIndex (inner join).
+
+    The pairs come in the order of pd.merge(how='inner'): by row of the indexed side and,
+    for each one, by row of the probe side.
+
+    Args:
+        index (KeyIndex): Index of the left side (see build_key_index).
+        ids (pd.Series): ID column of the right (probe) side.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row positions of each matched pair in
+                                                   the left and in the right frame, and
+                                                   its int32 key.
+    """
+    keys, probe_rows = int32_keys(ids)
+
+    if index.lookup is not None:
+        # Hash join com endereçamento direto: uma leitura por chave da direita
+        offsets = keys.astype(np.int64) - int(index.keys[0])
+        inside = (offsets >= 0) & (offsets < len(index.lookup))
+        candidates = np.full(len(keys), -1, dtype=np.int64)
+        candidates[inside] = index.lookup[offsets[inside]]
+        found = candidates >= 0
+        left = candidates[found]
+        right = probe_rows[found]
+        matched = keys[found]
+        order = np.argsort(left, kind='stable')
+        return left[order], right[order], matched[order]
+
+    start = np.searchsorted(index.keys, keys, side='left')
+    if index.unique:
+        # Cada chave da direita casa com no máximo uma linha da esquerda
+        found = start < len(index.keys)
+        found[found] = index.keys[start[found]] == keys[found]
+        left = index.rows[start[found]]
+        right = probe_rows[found]
+        matched = keys[found]
+    else:
+        counts = np.searchsorted(index.keys, keys, side='right') - start
+        right = np.repeat(probe_rows, counts)
+        matched = np.repeat(keys, counts)
+        # Posição de cada par dentro do intervalo de chaves iguais da esquerda
+        offsets = np.arange(len(right)) - np.repeat(np.cumsum(counts) - counts, counts)
+        left = index.rows[np.repeat(start, counts) + offsets]
+
+    # Os pares já estão na ordem da direita: a ordenação estável pela esquerda dá a ordem do pd.merge
+    order = np.argsort(left, kind='stable')
+    return left[order], right[order], matched[order]
+
+
+def take_rows(df: pd.DataFrame, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Gathers the given rows (by position) of only the given columns, with a fresh RangeIndex.
+    """
+    if columns is not None:
+        df = df[columns]
+    return df.take(positions).reset_index(drop=True)
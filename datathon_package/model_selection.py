@@ -0,0 +1,242 @@
+import os
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.utils.class_weight import compute_sample_weight
+from typing import Any, Dict, List, Optional, Tuple
+from datathon_package.artifact import BoosterClassifier
+
+# Limiar que reproduz o predict() do classificador binário (argmax entre as duas classes)
+DECISION_THRESHOLD = 0.5
+
+# Estratégias para a classe minoritária, aplicadas só nos dados de treino de cada fold:
+#   smote: amostras sintéticas por k-NN (imblearn)
+#   random: oversampling aleatório sobre um array de índices, aplicado como sample_weight
+#   class_weight: class_weight='balanced' do LightGBM
+#   scale_pos_weight: peso da classe positiva = negativos / positivos
+#   none: sem balanceamento
+RESAMPLING_STRATEGIES = ("smote", "random", "class_weight", "scale_pos_weight", "none")
+
+
+def classification_metrics(y_true: np.ndarray, proba: np.ndarray) -> Dict[str, float]:
+    """
+    Computes the evaluation metrics from positive-class probabilities.
+
+    Args:
+        y_true (np.ndarray): Binary labels.
+        proba (np.ndarray): Positive-class probabilities.
+
+    Returns:
+        Dict[str, float]: accuracy, precision, recall, f1 and roc_auc.
+    """
+    y_pred = (proba > DECISION_THRESHOLD).astype(int)
+    return {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred, zero_division=0),
+        "recall": recall_score(y_true, y_pred, zero_division=0),
+        "f1": f1_score(y_true, y_pred, zero_division=0),
+        "roc_auc": roc_auc_score(y_true, proba),
+    }
+
+
+def threads_per_fold(n_jobs: int) -> int:
+    """
+    Returns the number of LightGBM threads per fold so that n_jobs concurrent folds
+    do not use more threads than there are cores.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, n_jobs))
+
+
+def smote_resample(X: pd.DataFrame, y: pd.Series, random_state: Optional[int] = 42) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Applies SMOTE on a signed integer copy of X (SMOTE interpolates with X[neighbour] - X[row],
+    which would overflow on uint8 flags).
+    """
+    smote_dtype = np.int16 if X.max().max() <= np.iinfo(np.int16).max else np.int32
+    return SMOTE(random_state=random_state).fit_resample(X.astype(smote_dtype), y)
+
+
+def random_oversampling_weights(y: np.ndarray, random_state: Optional[int] = 42) -> np.ndarray:
+    """
+    Random oversampling of the minority class expressed as sample weights: the minority
+    rows are drawn with replacement until both classes have the same size, and each row's
+    weight is the number of times it appears (1 + draws). No row is materialized.
+
+    Args:
+        y (np.ndarray): Binary labels.
+        random_state (int, optional): Seed of the draws.
+
+    Returns:
+        np.ndarray: Float weight per row.
+    """
+    y = np.asarray(y)
+    classes, counts = np.unique(y, return_counts=True)
+    weights = np.ones(len(y), dtype=np.float64)
+    if len(classes) < 2:
+        return weights
+    minority_idx = np.flatnonzero(y == classes[np.argmin(counts)])
+    draws = np.random.default_rng(random_state).choice(minority_idx, size=counts.max() - counts.min())
+    weights += np.bincount(draws, minlength=len(y))
+    return weights
+
+
+def prepare_training_data(
+    model: Any,
+    X: pd.DataFrame,
+    y: pd.Series,
+    resampling: str = "none",
+    random_state: Optional[int] = 42
+) -> Tuple[Any, pd.DataFrame, pd.Series, Dict[str, Any]]:
+    """
+    Applies a class-balancing strategy to training data only.
+
+    Args:
+        model (Any): Unfitted classifier (parameters may be set on it).
+        X (pd.DataFrame): Training features.
+        y (pd.Series): Training target.
+        resampling (str): One of RESAMPLING_STRATEGIES.
+        random_state (int, optional): Seed of SMOTE and of the random draws.
+
+    Returns:
+        Tuple[Any, pd.DataFrame, pd.Series, Dict[str, Any]]: The model, the (possibly resampled)
+        features and target, and extra keyword arguments for fit (e.g. sample_weight).
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if resampling == "smote":
+        X, y = smote_resample(X, y, random_state)
+    elif resampling == "random":
+        return model, X, y, {"sample_weight": random_oversampling_weights(y, random_state)}
+    elif resampling == "class_weight":
+        model.set_params(class_weight="balanced")
+    elif resampling == "scale_pos_weight":
+        n_pos = int(np.sum(np.asarray(y) == 1))
+        model.set_params(scale_pos_weight=(len(y) - n_pos) / max(n_pos, 1))
+    elif resampling != "none":
+        raise ValueError(f"Estratégia de balanceamento desconhecida: {resampling}. Use uma de {RESAMPLING_STRATEGIES}.")
+    return model, X, y, {}
+
+
+def booster_params(model: Any) -> Dict[str, Any]:
+    """
+    Returns the parameters of an LGBMClassifier as native LightGBM parameters (the sklearn
+    names are LightGBM aliases), without the ones the wrapper handles itself.
+    """
+    params = {
+        name: value for name, value in model.get_params().items()
+        if value is not None and name not in ("class_weight", "importance_type")
+    }
+    params.setdefault("objective", "binary")
+    return params
+
+
+def fit_lgbm_on_dataset(model: Any, dataset: Any, sample_weight: Optional[np.ndarray] = None) -> BoosterClassifier:
+    """
+    Fits the configured LGBMClassifier on an already constructed LightGBM Dataset (e.g. one
+    loaded from the feature store cache, see load_lgb_dataset), producing the same trees
+    as model.fit on the same rows.
+
+    Args:
+        model (Any): Unfitted LGBMClassifier, after prepare_training_data.
+        dataset (lightgbm.Dataset): Constructed Dataset with the labels.
+        sample_weight (np.ndarray, optional): Row weights (e.g. from random oversampling).
+
+    Returns:
+        BoosterClassifier: Classifier over the trained booster.
+    """
+    import lightgbm as lgb
+
+    y = dataset.get_label()
+    class_weight = model.get_params().get("class_weight")
+    if class_weight is not None:
+        class_sample_weight = compute_sample_weight(class_weight, y)
+        sample_weight = class_sample_weight if sample_weight is None else sample_weight * class_sample_weight
+    if sample_weight is not None:
+        dataset.set_weight(sample_weight)
+
+    params = booster_params(model)
+    num_boost_round = params.pop("n_estimators", 100)
+    booster = lgb.train(params, dataset, num_boost_round=num_boost_round)
+    return BoosterClassifier(booster, np.unique(y).astype(int).tolist(), dataset.get_feature_name())
+
+
+def _fit_fold(
+    model: Any,
+    X: pd.DataFrame,
+    y: pd.Series,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    resampling: str,
+    random_state: Optional[int]
+) -> np.ndarray:
+    # Balanceamento só no treino do fold; o fold de teste fica com a distribuição real
+    model, X_train, y_train, fit_kwargs = prepare_training_data(
+        model, X.iloc[train_idx], y.iloc[train_idx], resampling, random_state
+    )
+    model.fit(X_train, y_train, **fit_kwargs)
+    return model.predict_proba(X.iloc[test_idx])[:, 1]
+
+
+def cross_validate_oof(
+    model: Any,
+    X: pd.DataFrame,
+    y: pd.Series,
+    cv_folds: int = 5,
+    n_jobs: int = 1,
+    random_state: Optional[int] = 42,
+    resampling: str = "none"
+) -> Tuple[Dict[str, float], np.ndarray, np.ndarray]:
+    """
+    Stratified cross-validation that fits the model once per fold and keeps the
+    out-of-fold (OOF) probabilities; every metric is computed from them.
+
+    The folds run in n_jobs threads (LightGBM releases the GIL while training) and each
+    fold's model gets n_jobs=threads_per_fold(n_jobs), so the total number of threads
+    stays within the available cores. Class balancing (resampling) is applied to each
+    fold's training rows only, so the held-out rows keep the real class distribution.
+
+    Args:
+        model (Any): Unfitted classifier with fit/predict_proba (cloned per fold).
+        X (pd.DataFrame): Features.
+        y (pd.Series): Binary target.
+        cv_folds (int): Number of folds.
+        n_jobs (int): Number of folds trained concurrently.
+        random_state (int, optional): Seed of the fold shuffling and of the resampling.
+        resampling (str): Class-balancing strategy, one of RESAMPLING_STRATEGIES.
+
+    Returns:
+        Tuple[Dict[str, float], np.ndarray, np.ndarray]: Mean of each metric over the folds,
+        the OOF probability of every row, and the fold index of every row.
+    """
+    if resampling not in RESAMPLING_STRATEGIES:
+        raise ValueError(f"Estratégia de balanceamento desconhecida: {resampling}. Use uma de {RESAMPLING_STRATEGIES}.")
+
+    skf = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+    splits = list(skf.split(X, y))
+
+    fold_model = clone(model)
+    if "n_jobs" in fold_model.get_params():
+        fold_model.set_params(n_jobs=threads_per_fold(n_jobs))
+
+    fold_probas = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_fit_fold)(clone(fold_model), X, y, train_idx, test_idx, resampling, random_state)
+        for train_idx, test_idx in splits
+    )
+
+    y_true = np.asarray(y)
+    oof = np.empty(len(y_true), dtype=np.float64)
+    folds = np.empty(len(y_true), dtype=np.int16)
+    fold_metrics: List[Dict[str, float]] = []
+    for fold, ((_, test_idx), proba) in enumerate(zip(splits, fold_probas)):
+        oof[test_idx] = proba
+        folds[test_idx] = fold
+        fold_metrics.append(classification_metrics(y_true[test_idx], proba))
+
+    # Média por fold, como o cross_val_score
+    metrics = {name: float(np.mean([m[name] for m in fold_metrics])) for name in fold_metrics[0]}
+    return metrics, oof, folds
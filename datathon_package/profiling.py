@@ -0,0 +1,275 @@
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Profiler ativo no processo (None: profile_stage não mede nada)
+_ACTIVE: Optional["StageProfiler"] = None
+
+
+def _memory_mb() -> Tuple[Optional[float], float]:
+    """
+    Returns the current and peak RSS of the process in MB. The current RSS is None
+    where /proc is not available.
+    """
+    try:
+        rss = hwm = None
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    hwm = int(line.split()[1]) / 1024
+        if hwm is not None:
+            return rss, hwm
+    except OSError:
+        pass
+    # ru_maxrss está em KB no Linux e em bytes no macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return None, maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Stage:
+    """
+    Handle of a running stage; set rows_in / rows_out on it inside the with block.
+    """
+
+    __slots__ = ("rows_in", "rows_out", "skip")
+
+    def __init__(self, rows_in: Optional[int] = None):
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.skip = False
+
+
+class StageProfiler:
+    """
+    Lightweight per-stage profiler for the data pipelines.
+
+    Each stage records wall time, process CPU time, the change in RSS, the growth of the
+    peak RSS (how much the stage pushed the process high-water mark) and optional row
+    counts. Stages nest: a stage opened inside another is recorded as 'outer/inner', and
+    repeated stages (e.g. one per streamed batch) are aggregated under the same path with
+    a call count. Records from child processes are merged with merge().
+
+    CPU time is the whole process's CPU time, so stages that overlap with background
+    threads (e.g. the PostgreSQL writer) include the CPU of those threads.
+
+    If cprofile_path is set, the whole activation also runs under cProfile and the stats
+    are dumped to that file (view with `python -m pstats`, snakeviz, or convert to a
+    flamegraph with flameprof).
+
+    Example:
+        profiler = StageProfiler("bootstrap", cprofile_path="bootstrap.prof")
+        with profiler.activate():
+            with profile_stage("merge", rows_in=len(df)) as stage:
+                df = merge(df)
+                stage.rows_out = len(df)
+        profiler.write_report("bootstrap_profile.json")
+    """
+
+    def __init__(self, name: str = "pipeline", cprofile_path: Optional[str] = None):
+        self.name = name
+        self.cprofile_path = cprofile_path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_at: Optional[float] = None
+        self._elapsed: Tuple[float, float] = (0.0, 0.0)
+
+    @contextmanager
+    def activate(self) -> Iterator["StageProfiler"]:
+        """
+        Makes this profiler the one used by profile_stage in the current process
+        (restoring the previous one on exit) and, if configured, runs cProfile.
+        """
+        global _ACTIVE
+        if _ACTIVE is self:
+            yield self
+            return
+
+        previous, _ACTIVE = _ACTIVE, self
+        profile = cProfile.Profile() if self.cprofile_path else None
+        if self._started_at is None:
+            self._started_at = time.time()
+        start = (time.perf_counter(), time.process_time())
+        if profile is not None:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile is not None:
+                profile.disable()
+                os.makedirs(os.path.dirname(os.path.abspath(self.cprofile_path)), exist_ok=True)
+                profile.dump_stats(self.cprofile_path)
+            wall, cpu = self._elapsed
+            self._elapsed = (wall + time.perf_counter() - start[0], cpu + time.process_time() - start[1])
+            _ACTIVE = previous
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[Stage]:
+        """
+        Measures the enclosed block as a stage (see profile_stage).
+        """
+        stack = self._stack()
+        stack.append(name)
+        path = "/".join(stack)
+        handle = Stage(rows_in)
+        rss_start, hwm_start = _memory_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield handle
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            rss_end, hwm_end = _memory_mb()
+            stack.pop()
+            if not handle.skip:
+                rss_delta = rss_end - rss_start if rss_start is not None and rss_end is not None else None
+                self._add(path, {
+                    "calls": 1,
+                    "wall_s": wall,
+                    "cpu_s": cpu,
+                    "rss_delta_mb": rss_delta,
+                    "peak_rss_delta_mb": max(0.0, hwm_end - hwm_start),
+                    "peak_rss_mb": hwm_end,
+                    "rows_in": handle.rows_in,
+                    "rows_out": handle.rows_out,
+                    "pid": os.getpid(),
+                })
+
+    def merge(self, records: List[Dict[str, Any]], prefix: Optional[str] = None) -> None:
+        """
+        Adds the stage records of another profiler (e.g. returned by a child process).
+
+        Args:
+            records (List[Dict[str, Any]]): Output of records().
+            prefix (str, optional): Path prepended to the merged stages.
+        """
+        for record in records:
+            record = dict(record)
+            stage = record.pop("stage")
+            self._add(f"{prefix}/{stage}" if prefix else stage, record)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Returns one aggregated record per stage path, in order of first execution.
+        """
+        with self._lock:
+            return [{"stage": path, **dict(record)} for path, record in self._records.items()]
+
+    def wall(self, stage: str) -> float:
+        """
+        Returns the total wall time of a stage path (0 if it did not run).
+        """
+        with self._lock:
+            record = self._records.get(stage)
+            return record["wall_s"] if record else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns the run report: totals of the activations plus the stage records.
+        """
+        wall, cpu = self._elapsed
+        _, peak = _memory_mb()
+        return {
+            "name": self.name,
+            "pid": os.getpid(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self._started_at or time.time())),
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "peak_rss_mb": peak,
+            "cprofile_path": self.cprofile_path,
+            "stages": self.records(),
+        }
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        """
+        Writes the run report as JSON and returns it.
+        """
+        report = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+    def print_summary(self) -> None:
+        """
+        Prints one line per stage: calls, wall and CPU time, peak RSS growth and rows.
+        """
+        print(f"[PROFILE] {self.name}")
+        print(f"{'etapa':<44} {'n':>5} {'wall (s)':>9} {'cpu (s)':>9} {'pico +MB':>9} {'linhas':>10}")
+        for record in self.records():
+            rows = record["rows_out"] if record["rows_out"] is not None else ""
+            print(
+                f"{record['stage']:<44} {record['calls']:>5} {record['wall_s']:>9.2f} {record['cpu_s']:>9.2f} "
+                f"{record['peak_rss_delta_mb']:>9.1f} {rows:>10}"
+            )
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, path: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            current = self._records.get(path)
+            if current is None:
+                self._records[path] = dict(record)
+                return
+            current["calls"] += record["calls"]
+            for key in ("wall_s", "cpu_s", "rss_delta_mb", "rows_in", "rows_out"):
+                if record.get(key) is not None:
+                    current[key] = (current.get(key) or 0) + record[key]
+            for key in ("peak_rss_delta_mb", "peak_rss_mb"):
+                current[key] = max(current[key], record[key])
+
+
+@contextmanager
+def profile_stage(name: str, rows_in: Optional[int] = None) -> Iterator[Stage]:
+    """
+    Measures the enclosed block as a stage of the active StageProfiler; does nothing
+    (beyond creating the handle) when no profiler is active.
+
+    Args:
+        name (str): Stage name (nested stages are recorded as 'outer/inner').
+        rows_in (int, optional): Number of input rows.
+
+    Yields:
+        Stage: Handle on which rows_in / rows_out can be set.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        yield Stage(rows_in)
+        return
+    with profiler.stage(name, rows_in) as handle:
+        yield handle
+
+
+def profile_iter(name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+    """
+    Yields the items of iterable, measuring the production of each one (e.g. reading a
+    batch from a streamed file) as a call of the stage name, with len(item) as rows_out.
+    """
+    iterator = iter(iterable)
+    while True:
+        with profile_stage(name) as stage:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stage.skip = True
+                return
+            stage.rows_out = len(item)
+        yield item
+
+
+def active_profiler() -> Optional[StageProfiler]:
+    """
+    Returns the active StageProfiler of the process, if any.
+    """
+    return _ACTIVE
@@ -1,88 +1,225 @@
+import numpy as np
 import pandas as pd
-from typing import List, Optional
-from datathon_package.utils import transpose_and_prepare_dataframe, expand_dict_column, detect_nulls_and_nans, remove_invalid_prospect_codigo, ingest_dataframe_to_postgres
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Set
+from datathon_package.join import int32_keys
+from datathon_package.profiling import profile_iter, profile_stage
+from datathon_package.utils import (
+    transpose_and_prepare_dataframe,
+    detect_nulls_and_nans,
+    remove_invalid_prospect_codigo,
+    ingest_dataframe_to_postgres,
+    iter_json_batches,
+    parallel_map,
+    split_by_id_ranges
+)
+
+# Campos de cada vaga usados no processamento
+VAGA_FIELDS = ['titulo', 'modalidade', 'prospects']
+
+# Situações do candidato que definem o target
+SITUACOES_APROVADO = [
+    'Aprovado',
+    'Contratado pela Decision',
+    'Contratado como Hunting',
+    'Proposta Aceita',
+    'Encaminhar Proposta'
+]
+
+SITUACOES_REPROVADO = [
+    'Não Aprovado pelo Cliente',
+    'Não Aprovado pelo RH',
+    'Não Aprovado pelo Requisitante',
+    'Recusado',
+    'Desistiu',
+    'Desistiu da Contratação',
+    'Sem interesse nesta vaga'
+]
+
+TARGET_BY_SITUACAO = {
+    **{situacao: 1 for situacao in SITUACOES_APROVADO},
+    **{situacao: 0 for situacao in SITUACOES_REPROVADO},
+}
+
+
+def build_prospects_frame(df: pd.DataFrame, keep_vaga_id: bool = False) -> pd.DataFrame:
+    """
+    Turns one row per vaga (with its list of prospects) into one labeled row per prospect.
+
+    The nested prospects lists are walked once, collecting only the fields that are kept,
+    so no wide one-column-per-prospect frame is built.
+
+    Args:
+        df (pd.DataFrame): DataFrame with the columns 'ID' and 'prospects' (other columns are ignored).
+        keep_vaga_id (bool): If True, keeps the vaga ID as a 'vaga_id' column.
+
+    Returns:
+        pd.DataFrame: One row per labeled prospect with an int32 'prospect_codigo', 'prospect_situacao_candidado'
+                      and a uint8 'target' (preceded by 'vaga_id' if keep_vaga_id), ordered by vaga ID
+                      and by position in the vaga's list.
+    """
+    # Step 1: Percorre as listas de prospects uma única vez
+    with profile_stage('flatten', rows_in=len(df)) as stage:
+        df = df.sort_values(by='ID', kind='stable')
+        vaga_positions: List[int] = []
+        codigos: List[Any] = []
+        situacoes: List[Any] = []
+        for position, prospects in enumerate(df['prospects'].tolist()):
+            if not isinstance(prospects, list):
+                continue
+            for prospect in prospects:
+                if isinstance(prospect, dict):
+                    vaga_positions.append(position)
+                    codigos.append(prospect.get('codigo'))
+                    situacoes.append(prospect.get('situacao_candidado'))
+
+        df = pd.DataFrame({
+            # Mantém o tipo original do ID da vaga
+            'vaga_id': df['ID'].to_numpy()[np.asarray(vaga_positions, dtype=np.intp)],
+            'prospect_codigo': pd.Series(codigos, dtype=object),
+            'prospect_situacao_candidado': pd.Series(situacoes, dtype=object),
+        })
+        df = remove_invalid_prospect_codigo(df)
+        # Códigos como int32 (as chaves do join com os candidatos); os não numéricos, que
+        # nunca casariam com um ID de candidato, são descartados
+        codigos, rows = int32_keys(df['prospect_codigo'])
+        df = df.iloc[rows].reset_index(drop=True)
+        df['prospect_codigo'] = codigos
+        stage.rows_out = len(df)
+
+    # Step 2: Target por map vetorizado; situações fora das duas listas são descartadas
+    with profile_stage('target', rows_in=len(df)) as stage:
+        target = df['prospect_situacao_candidado'].map(TARGET_BY_SITUACAO)
+        labeled = target.notna().to_numpy()
+        df = df[labeled].reset_index(drop=True)
+        df['target'] = target.to_numpy()[labeled].astype(np.uint8)
+        stage.rows_out = len(df)
+
+    if not keep_vaga_id:
+        df = df.drop(columns=['vaga_id'])
+
+    return df
+
+
+def empty_prospects_frame(keep_vaga_id: bool = False) -> pd.DataFrame:
+    """
+    Returns a frame with no prospects and the same columns and dtypes as build_prospects_frame.
+    """
+    return build_prospects_frame(
+        pd.DataFrame({'ID': pd.Series([], dtype=object), 'prospects': pd.Series([], dtype=object)}),
+        keep_vaga_id=keep_vaga_id
+    )
+
+
+def concat_prospect_batches(batches: List[pd.DataFrame], keep_vaga_id: bool = False) -> pd.DataFrame:
+    """
+    Concatenates labeled prospect batches; with no batches (no vaga has prospects)
+    returns an empty frame with the usual columns.
+    """
+    if not batches:
+        return empty_prospects_frame(keep_vaga_id)
+    return pd.concat(batches, ignore_index=True)
 
 
-def process_prospects_data(prospects_path: str) -> pd.DataFrame:
+def iter_vaga_batches(
+    prospects_path: str,
+    batch_size: int,
+    ids: Optional[Set[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the prospects JSON file and yields one row per vaga, one batch at a time.
+
+    Args:
+        prospects_path (str): Path to the prospects JSON file.
+        batch_size (int): Number of vagas per batch.
+        ids (Set[str], optional): If set, only these vaga IDs are kept.
+
+    Yields:
+        pd.DataFrame: DataFrame with the columns 'ID', 'titulo', 'modalidade' and 'prospects'.
+    """
+    for batch in profile_iter('read_json', iter_json_batches(prospects_path, batch_size)):
+        rows = [
+            {'ID': vaga_id, **{field: record.get(field) for field in VAGA_FIELDS}}
+            for vaga_id, record in batch
+            if ids is None or vaga_id in ids
+        ]
+        if not rows:
+            continue
+        # Sem ordenar aqui: build_prospects_frame ordena as vagas por ID
+        df = pd.DataFrame(rows, columns=['ID'] + VAGA_FIELDS)
+        if any(df['prospects'].map(bool)):
+            yield df
+
+
+def iter_prospect_batches(
+    prospects_path: str,
+    batch_size: int,
+    ids: Optional[Set[str]] = None,
+    keep_vaga_id: bool = False,
+    n_jobs: int = 1
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the prospects JSON file and yields labeled prospects one batch of vagas at a time.
+    Only the current batch of raw records is kept in memory; there is no transpose step.
+
+    Args:
+        prospects_path (str): Path to the prospects JSON file.
+        batch_size (int): Number of vagas per batch.
+        ids (Set[str], optional): If set, only these vaga IDs are processed.
+        keep_vaga_id (bool): If True, keeps the vaga ID as a 'vaga_id' column.
+        n_jobs (int): Number of processes labeling different batches.
+
+    Yields:
+        pd.DataFrame: Processed DataFrame for each batch.
+    """
+    vaga_batches = iter_vaga_batches(prospects_path, batch_size, ids=ids)
+    yield from parallel_map(partial(build_prospects_frame, keep_vaga_id=keep_vaga_id), vaga_batches, n_jobs)
+
+
+def process_prospects_data(
+    prospects_path: str,
+    chunksize: Optional[int] = None,
+    ingest: bool = True,
+    n_partitions: int = 1
+) -> pd.DataFrame:
     """
     Processes a JSON prospects file and returns a cleaned DataFrame with a binary target label.
 
     Args:
         prospects_path (str): Path to the prospects JSON file.
+        chunksize (int, optional): If set, streams the file in batches of this many vagas
+                                   instead of loading it whole with pd.read_json.
+        ingest (bool): If False, skips the ingestion into PostgreSQL (e.g. to run it in background).
+        n_partitions (int): If greater than 1, processes contiguous vaga ID ranges
+                            (or the streamed batches) in this many processes.
 
     Returns:
         pd.DataFrame: Processed DataFrame with columns expanded, melted, and target labeled.
     """
-    # Step 1: Read and transpose
-    df = pd.read_json(prospects_path)
-    df = transpose_and_prepare_dataframe(df)
-    df = expand_dict_column(df, 'prospects', 'prospects_')
-
-    # Step 2: Melt prospects
-    fixed_columns = ['ID', 'titulo', 'modalidade']
-    prospect_columns = [col for col in df.columns if col.startswith("prospect")]
-
-    df_long = df.melt(
-        id_vars=fixed_columns,
-        value_vars=prospect_columns,
-        var_name='prospect_num',
-        value_name='prospect'
-    )
-
-    # Step 3: Clean null or empty
-    df_long = df_long.dropna(subset=['prospect'])
-    df_long = df_long[df_long['prospect'] != ""]
-    df_long = df_long[fixed_columns + ['prospect']]
-
-    # Step 4: Expand nested dict
-    df = expand_dict_column(df_long, 'prospect', 'prospect_')
-    df = df.sort_values(by='ID')
-
-    df = remove_invalid_prospect_codigo(df)
-
-    # Step 5: Drop unused fields
-    cols_to_drop = [
-        'ID',
-        'prospect_nome',
-        'prospect_data_candidatura',
-        'prospect_ultima_atualizacao',
-        'prospect_comentario',
-        'titulo',
-        'modalidade',
-        'prospect_recrutador'
-    ]
-    df = df.drop(columns=cols_to_drop, errors='ignore')
-
-    # Step 6: Apply target classification
-    aprovados = [
-        'Aprovado',
-        'Contratado pela Decision',
-        'Contratado como Hunting',
-        'Proposta Aceita',
-        'Encaminhar Proposta'
-    ]
-
-    reprovados = [
-        'Não Aprovado pelo Cliente',
-        'Não Aprovado pelo RH',
-        'Não Aprovado pelo Requisitante',
-        'Recusado',
-        'Desistiu',
-        'Desistiu da Contratação',
-        'Sem interesse nesta vaga'
-    ]
-
-    def classify_target(status: Optional[str]) -> Optional[int]:
-        if status in aprovados:
-            return 1
-        elif status in reprovados:
-            return 0
-        return None
-
-    df['target'] = df['prospect_situacao_candidado'].apply(classify_target)
-    df = df.dropna(subset=['target'])
-
-    ingest_dataframe_to_postgres(df, local=True, table_name="propects", if_exists="replace")
+    if chunksize:
+        batches = list(iter_prospect_batches(prospects_path, chunksize, n_jobs=n_partitions))
+        with profile_stage('concat') as stage:
+            df = concat_prospect_batches(batches)
+            stage.rows_out = len(df)
+    else:
+        # Step 1: Read and transpose
+        with profile_stage('read_json') as stage:
+            df = pd.read_json(prospects_path)
+            stage.rows_out = df.shape[1]
+        with profile_stage('transpose') as stage:
+            df = transpose_and_prepare_dataframe(df)
+            stage.rows_out = len(df)
+        if n_partitions > 1:
+            partitions = split_by_id_ranges(df, n_partitions)
+            # Os estágios dentro dos processos filhos ficam contidos em 'label'
+            with profile_stage('label', rows_in=len(df)) as stage:
+                df = concat_prospect_batches(list(parallel_map(build_prospects_frame, partitions, n_partitions)))
+                stage.rows_out = len(df)
+        else:
+            df = build_prospects_frame(df)
+
+    if ingest:
+        ingest_dataframe_to_postgres(df, local=True, table_name="propects", if_exists="replace")
 
     return df
 
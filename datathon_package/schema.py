@@ -0,0 +1,119 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import List, Optional
+
+# Colunas de identificação da master table (não entram no treino)
+MASTER_ID_COLUMNS = ['ID', 'prospect_codigo']
+MASTER_TARGET_COLUMN = 'target'
+
+# Contagens (não binárias) e seus tipos
+MASTER_COUNT_COLUMNS = {'certificacoes_count': 'uint16'}
+
+# Parquet: ~100k linhas por row group mantém as leituras projetadas eficientes sem
+# fragmentar as estatísticas; zstd comprime bem as flags (dicionário + RLE)
+MASTER_ROW_GROUP_SIZE = 100000
+MASTER_COMPRESSION = 'zstd'
+MASTER_COMPRESSION_LEVEL = 3
+
+
+def apply_master_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts the master table to its compact schema:
+      - 'ID' and 'prospect_codigo' as nullable Int32;
+      - 'target' and every 0/1 flag as uint8;
+      - known count columns as uint16;
+      - remaining string columns as category.
+
+    Args:
+        df (pd.DataFrame): Master table (output of merge_master_table).
+
+    Returns:
+        pd.DataFrame: DataFrame with the same columns and values in compact dtypes.
+
+    Raises:
+        ValueError: If an ID or count does not fit in its target dtype.
+    """
+    dtypes = {}
+    for col in df.columns:
+        series = df[col]
+        if col in MASTER_ID_COLUMNS:
+            values = pd.to_numeric(series, errors='coerce')
+            if values.notna().any() and values.abs().max() > np.iinfo(np.int32).max:
+                raise ValueError(f"Coluna '{col}' não cabe em Int32.")
+            dtypes[col] = 'Int32'
+        elif col in MASTER_COUNT_COLUMNS:
+            target_dtype = MASTER_COUNT_COLUMNS[col]
+            if series.max() > np.iinfo(target_dtype).max:
+                raise ValueError(f"Coluna '{col}' não cabe em {target_dtype}.")
+            dtypes[col] = target_dtype
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            dtypes[col] = 'category'
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not series.isna().any() and series.isin([0, 1]).all():
+            dtypes[col] = 'uint8'
+
+    return df.astype(dtypes)
+
+
+def write_master_parquet(
+    df: pd.DataFrame,
+    output_path: str,
+    row_group_size: int = MASTER_ROW_GROUP_SIZE,
+    compression: str = MASTER_COMPRESSION,
+    compression_level: Optional[int] = MASTER_COMPRESSION_LEVEL
+) -> None:
+    """
+    Writes the master table to Parquet with an explicit Arrow schema, dictionary encoding,
+    row-group sizing and compression. The file is written to a temporary path and renamed,
+    so readers never see a partial file.
+
+    Args:
+        df (pd.DataFrame): Master table already in the compact schema.
+        output_path (str): Destination Parquet file.
+        row_group_size (int): Maximum number of rows per row group.
+        compression (str): Parquet compression codec.
+        compression_level (int, optional): Codec compression level.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{output_path}.tmp"
+    pq.write_table(
+        table,
+        tmp_path,
+        row_group_size=row_group_size,
+        compression=compression,
+        compression_level=compression_level,
+        use_dictionary=True,
+        write_statistics=True
+    )
+    os.replace(tmp_path, output_path)
+
+
+def master_feature_columns(path: str) -> List[str]:
+    """
+    Returns the columns of a master table file used for training (features and target),
+    reading only the Parquet footer.
+
+    Args:
+        path (str): Master table Parquet file.
+
+    Returns:
+        List[str]: Column names without the ID columns.
+    """
+    names = pq.read_schema(path).names
+    return [col for col in names if col not in MASTER_ID_COLUMNS and not col.startswith('__index_level_')]
+
+
+def read_master_parquet(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads the master table, optionally projecting only some columns.
+
+    Args:
+        path (str): Master table Parquet file.
+        columns (List[str], optional): Columns to read; all when None.
+
+    Returns:
+        pd.DataFrame: Master table with the dtypes stored in the file.
+    """
+    return pd.read_parquet(path, columns=columns)
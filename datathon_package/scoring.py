@@ -0,0 +1,169 @@
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Any, Dict, Optional, Tuple
+from datathon_package.applicants import iter_flat_applicant_batches
+from datathon_package.artifact import artifact_mtime, load_serving_artifact
+from datathon_package.cache import file_checksum
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.profiling import profile_stage
+from datathon_package.serving import PredictionService
+from datathon_package.utils import ingest_dataframe_to_postgres, parallel_map
+
+# Lote padrão do scoring em massa (candidatos por chamada ao modelo)
+SCORING_BATCH_SIZE = 10000
+
+# Esquema do arquivo de scores
+SCORES_SCHEMA = pa.schema([
+    ("applicant_id", pa.string()),
+    ("prediction", pa.int8()),
+    ("probability", pa.float64()),
+])
+
+# Serviço de cada processo do pool (ver _init_scoring_worker)
+_WORKER_SERVICE: Optional[PredictionService] = None
+
+
+def load_scoring_model(
+    artifact_dir: Optional[str] = None,
+    model_path: Optional[str] = None,
+    featurizer_path: Optional[str] = None
+) -> Tuple[Any, ApplicantFeaturizer, str]:
+    """
+    Loads the model used for offline scoring, with the same precedence as the API: the
+    serving artifact when artifact_dir has one, otherwise the pickled model and featurizer.
+
+    Args:
+        artifact_dir (str, optional): Serving artifact directory (see export_serving_artifact).
+        model_path (str, optional): Pickled model, used when there is no artifact.
+        featurizer_path (str, optional): Pickled featurizer; if missing, the model's own
+                                         feature names are used.
+
+    Returns:
+        Tuple[Any, ApplicantFeaturizer, str]: Model, featurizer and model version.
+
+    Raises:
+        FileNotFoundError: If neither an artifact nor a model file exists.
+    """
+    if artifact_dir and artifact_mtime(artifact_dir) is not None:
+        artifact = load_serving_artifact(artifact_dir)
+        return artifact.model, artifact.featurizer, artifact.version
+    if not model_path or not os.path.exists(model_path):
+        raise FileNotFoundError(f"Nenhum artefato em {artifact_dir} nem modelo em {model_path}.")
+
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    if featurizer_path and os.path.exists(featurizer_path):
+        featurizer = ApplicantFeaturizer.load(featurizer_path)
+    else:
+        featurizer = ApplicantFeaturizer().fit(pd.DataFrame(columns=model.feature_name_))
+    return model, featurizer, file_checksum(model_path)
+
+
+def _init_scoring_worker(
+    artifact_dir: Optional[str],
+    model_path: Optional[str],
+    featurizer_path: Optional[str],
+    num_threads: int
+) -> None:
+    # Cada processo carrega o modelo uma única vez
+    global _WORKER_SERVICE
+    model, featurizer, _ = load_scoring_model(artifact_dir, model_path, featurizer_path)
+    _WORKER_SERVICE = PredictionService(model, featurizer, num_threads=num_threads)
+
+
+def score_flat_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Featurizes and scores a batch of flattened applicants (see iter_flat_applicant_batches)
+    with the model of the current worker, in a single vectorized call.
+
+    Args:
+        df (pd.DataFrame): DataFrame with the columns in SELECTED_COLUMNS.
+
+    Returns:
+        pd.DataFrame: 'applicant_id', 'prediction' and 'probability' of each row, in input order.
+    """
+    if _WORKER_SERVICE is None:
+        raise RuntimeError("Worker de scoring não inicializado.")
+    X = _WORKER_SERVICE.featurizer.transform_flat(df)
+    labels, probabilities = _WORKER_SERVICE.score(X)
+    return pd.DataFrame({
+        "applicant_id": df["ID"].astype(str).to_numpy(),
+        "prediction": np.asarray(labels).astype(np.int8),
+        "probability": np.asarray(probabilities, dtype=np.float64),
+    })
+
+
+def score_applicants_file(
+    applicants_path: str,
+    output_path: str,
+    artifact_dir: Optional[str] = None,
+    model_path: Optional[str] = None,
+    featurizer_path: Optional[str] = None,
+    batch_size: int = SCORING_BATCH_SIZE,
+    n_jobs: int = 1,
+    postgres_table: Optional[str] = None,
+    local=False
+) -> Dict[str, Any]:
+    """
+    Scores every applicant of a raw applicants export, without going through the API.
+
+    The file is streamed in batches of batch_size applicants (see iter_flat_applicant_batches);
+    each batch is featurized with the fitted featurizer and scored in one call, in a pool
+    of n_jobs processes that load the model once each and split the cores between their
+    LightGBM threads. Scores are appended to a Parquet file as they arrive (in file order)
+    and the file is moved into place only when complete. If postgres_table is set, the
+    scores then replace that table in a single COPY load.
+
+    Args:
+        applicants_path (str): Path to the applicants JSON file.
+        output_path (str): Path of the scores Parquet file.
+        artifact_dir (str, optional): Serving artifact directory (see load_scoring_model).
+        model_path (str, optional): Pickled model, used when there is no artifact.
+        featurizer_path (str, optional): Pickled featurizer saved with the model.
+        batch_size (int): Applicants per batch.
+        n_jobs (int): Number of scoring processes.
+        postgres_table (str, optional): If set, table that receives the scores.
+
+    Returns:
+        Dict[str, Any]: rows, seconds, rows_per_second and the model version.
+    """
+    # Carregado aqui também para falhar cedo e registrar a versão usada
+    _, _, version = load_scoring_model(artifact_dir, model_path, featurizer_path)
+    num_threads = max(1, (os.cpu_count() or 1) // max(1, n_jobs))
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    start = time.perf_counter()
+    n_rows = 0
+
+    with pq.ParquetWriter(tmp_path, SCORES_SCHEMA) as writer:
+        batches = iter_flat_applicant_batches(applicants_path, batch_size)
+        results = parallel_map(
+            score_flat_batch, batches, n_jobs,
+            initializer=_init_scoring_worker,
+            initargs=(artifact_dir, model_path, featurizer_path, num_threads)
+        )
+        for scores in results:
+            with profile_stage("write_parquet", rows_in=len(scores)):
+                writer.write_table(pa.Table.from_pandas(scores, schema=SCORES_SCHEMA, preserve_index=False))
+            n_rows += len(scores)
+    os.replace(tmp_path, output_path)
+    elapsed = time.perf_counter() - start
+
+    if postgres_table:
+        with profile_stage(f"postgres_{postgres_table}", rows_in=n_rows):
+            ingest_dataframe_to_postgres(pd.read_parquet(output_path), local, table_name=postgres_table, if_exists="replace")
+
+    stats = {
+        "rows": n_rows,
+        "seconds": elapsed,
+        "rows_per_second": n_rows / max(elapsed, 1e-9),
+        "model_version": version,
+    }
+    print(f"[SCORING] {n_rows} candidatos em {elapsed:.2f}s ({stats['rows_per_second']:,.0f} linhas/s), modelo {version}")
+    return stats
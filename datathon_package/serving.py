@@ -0,0 +1,389 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+from datathon_package.applicants import SELECTED_COLUMNS, flatten_applicant_record
+from datathon_package.artifact import ServingArtifact, artifact_mtime, load_serving_artifact
+from datathon_package.cache import PredictionCache
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.utils import sort_ids
+
+
+def native_booster(model: Any, feature_names: List[str]) -> Optional[Any]:
+    """
+    Returns the LightGBM Booster behind a binary classifier when it can be called directly
+    on the featurizer output, or None when the wrapper's predict_proba must be used.
+
+    The fast path requires a binary model (one tree per iteration, two classes) whose
+    booster columns are exactly feature_names, in the same order.
+
+    Args:
+        model (Any): Fitted LGBMClassifier, BoosterClassifier or any other classifier.
+        feature_names (List[str]): Featurizer output columns.
+
+    Returns:
+        Optional[Any]: The lightgbm.Booster, or None.
+    """
+    booster = getattr(model, "booster", None)
+    if booster is None:
+        try:
+            booster = getattr(model, "booster_", None)
+        except Exception:
+            # LGBMClassifier não ajustado
+            return None
+    if booster is None or not hasattr(booster, "num_model_per_iteration"):
+        return None
+    if booster.num_model_per_iteration() != 1 or len(getattr(model, "classes_", ())) != 2:
+        return None
+    if booster.feature_name() != list(feature_names):
+        return None
+    return booster
+
+
+class ModelStore:
+    """
+    Holds the serving artifact of a directory, loaded lazily on first use and reloaded
+    when a new artifact is exported there.
+
+    At most once every check_interval seconds, get() compares the modification time of
+    the artifact metadata with the loaded one; if it changed, the new artifact is loaded
+    and swapped in atomically. Requests already running keep the artifact they started
+    with. If the new artifact fails to load (e.g. checksum mismatch), the current one is
+    kept and the error is logged.
+
+    Example:
+        store = ModelStore("models/serving", check_interval=5)
+        artifact = store.get()
+    """
+
+    def __init__(
+        self,
+        artifact_dir: str,
+        check_interval: float = 5.0,
+        loader: Callable[[str], ServingArtifact] = load_serving_artifact
+    ):
+        self.artifact_dir = artifact_dir
+        self.check_interval = check_interval
+        self.loader = loader
+        self.reloads = 0
+        self._artifact: Optional[ServingArtifact] = None
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> ServingArtifact:
+        """
+        Returns the current artifact, loading it on the first call and reloading it if it changed.
+
+        Raises:
+            FileNotFoundError: If the directory has no artifact yet.
+        """
+        artifact = self._artifact
+        if artifact is not None and (self.check_interval <= 0 or time.monotonic() < self._next_check):
+            return artifact
+
+        with self._lock:
+            if self._artifact is None or time.monotonic() >= self._next_check:
+                self._refresh()
+            return self._artifact
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._artifact.version if self._artifact is not None else None
+
+    def _refresh(self) -> None:
+        self._next_check = time.monotonic() + self.check_interval
+        mtime = artifact_mtime(self.artifact_dir)
+        if self._artifact is not None and mtime == self._mtime:
+            return
+        if mtime is None:
+            if self._artifact is None:
+                raise FileNotFoundError(f"Nenhum artefato de serving em {self.artifact_dir}.")
+            return
+
+        try:
+            artifact = self.loader(self.artifact_dir)
+        except Exception as e:
+            if self._artifact is None:
+                raise
+            print(f"[ERRO] Falha ao recarregar o artefato de {self.artifact_dir}; mantendo a versão {self.version}: {e}")
+            self._mtime = mtime
+            return
+
+        if self._artifact is not None:
+            self.reloads += 1
+            print(f"[INFO] Artefato recarregado: {self.version} -> {artifact.version}")
+        self._artifact = artifact
+        self._mtime = mtime
+
+
+class PredictionService:
+    """
+    Scores raw applicant payloads with a fitted featurizer and model.
+
+    Any number of payloads (each shaped like the /predict body, {ID: {section: {...}}})
+    is featurized into a single array and scored with a single predict_proba call;
+    the labels are derived from the same probabilities. If a PredictionCache is given,
+    only the applicants not found in it are featurized and scored. Each result carries the
+    applicant's position in its payload (applicant_id, in ID order) and its ID (id).
+
+    The model and featurizer are either given directly or taken from a ModelStore; with a
+    store, each call uses the artifact current at its start, and the cache follows the
+    artifact version so a reloaded model never serves scores cached for the previous one.
+
+    Binary LightGBM models are scored by calling the native booster on the contiguous
+    float32 feature array (see native_booster), skipping the sklearn/pandas validation of
+    predict_proba, with num_threads LightGBM threads per call. fast_path tells whether the
+    current model uses it, and native_calls / fallback_calls count the scoring calls of each path.
+
+    If stage_observer is given, it is called as stage_observer(stage, seconds, n_rows) after
+    the 'featurize' and 'predict' stages of each call that scores at least one applicant.
+
+    Example:
+        service = PredictionService(model, featurizer)
+        service = PredictionService(store=ModelStore("models/serving"))
+        results = service.predict(payload)
+    """
+
+    def __init__(
+        self,
+        model: Any = None,
+        featurizer: Optional[ApplicantFeaturizer] = None,
+        cache: Optional[PredictionCache] = None,
+        store: Optional[ModelStore] = None,
+        num_threads: Optional[int] = 1,
+        use_native: bool = True,
+        stage_observer: Optional[Callable[[str, float, int], None]] = None
+    ):
+        if store is None and (model is None or featurizer is None):
+            raise ValueError("Informe model e featurizer, ou um ModelStore.")
+        self.model = model
+        self.featurizer = featurizer
+        self.cache = cache
+        self.store = store
+        self.num_threads = num_threads
+        self.use_native = use_native
+        self.stage_observer = stage_observer
+        self.ready = False
+        self.native_calls = 0
+        self.fallback_calls = 0
+        # Os contadores são incrementados pelas threads das requisições
+        self._counters_lock = threading.Lock()
+        self._native: tuple = (None, None)
+
+    @property
+    def fast_path(self) -> bool:
+        """
+        Whether the current model is scored through the native booster.
+        """
+        model, featurizer, _ = self._current()
+        return self._booster_for(model, featurizer) is not None
+
+    def warm_up(self) -> None:
+        """
+        Scores a blank applicant once so the first real request does not pay for lazy
+        initialization (model thread pool, pandas/numpy code paths), then marks the service ready.
+        """
+        # Direto no modelo, sem passar pelo cache
+        model, featurizer, _ = self._current()
+        df = pd.DataFrame([flatten_applicant_record('0', {})], columns=SELECTED_COLUMNS)
+        self.score(featurizer.transform_flat(df), model, featurizer)
+        self.ready = True
+
+    def predict(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scores the applicants of a single payload.
+
+        Args:
+            payload (Dict[str, Any]): Decoded applicants payload ({ID: {section: {...}}}).
+
+        Returns:
+            List[Dict[str, Any]]: One result per applicant, in ID order.
+        """
+        return self.predict_many([payload])[0]
+
+    def predict_many(self, payloads: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Scores several payloads in one vectorized featurize-and-score call.
+
+        Args:
+            payloads (List[Dict[str, Any]]): Decoded applicants payloads.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results of each payload, in the same order.
+        """
+        # Modelo, featurizer e versão lidos juntos: um reload no meio da chamada não mistura versões no cache
+        model, featurizer, version = self._current()
+        rows = []
+        sizes = []
+        for payload in payloads:
+            # Mesma ordem do pipeline em lote (ordenado por ID numérico)
+            ids = sort_ids(payload)
+            rows.extend(flatten_applicant_record(applicant_id, payload[applicant_id]) for applicant_id in ids)
+            sizes.append(len(ids))
+
+        scored: List[Optional[tuple]] = self.cache.get_many(rows, version) if self.cache else [None] * len(rows)
+        missing = [i for i, value in enumerate(scored) if value is None]
+
+        if missing:
+            missing_rows = [rows[i] for i in missing]
+            start = time.perf_counter()
+            X = featurizer.transform_flat(pd.DataFrame(missing_rows, columns=SELECTED_COLUMNS))
+            featurized = time.perf_counter()
+            labels, probabilities = self.score(X, model, featurizer)
+            if self.stage_observer is not None:
+                self.stage_observer("featurize", featurized - start, len(missing_rows))
+                self.stage_observer("predict", time.perf_counter() - featurized, len(missing_rows))
+            values = [(int(label), round(float(p), 4)) for label, p in zip(labels, probabilities)]
+            for i, value in zip(missing, values):
+                scored[i] = value
+            if self.cache:
+                self.cache.set_many(missing_rows, values, version)
+
+        results = []
+        offset = 0
+        for size in sizes:
+            # applicant_id mantém o contrato original (posição no payload, em ordem de ID); o ID vai em 'id'
+            results.append([
+                {
+                    "applicant_id": position,
+                    "id": rows[i]['ID'],
+                    "prediction": scored[i][0],
+                    "probability": scored[i][1]
+                }
+                for position, i in enumerate(range(offset, offset + size))
+            ])
+            offset += size
+        return results
+
+    def score(self, X: np.ndarray, model: Any = None, featurizer: Optional[ApplicantFeaturizer] = None):
+        """
+        Returns the predicted labels and positive-class probabilities from a single predict_proba pass.
+        """
+        if model is None or featurizer is None:
+            model, featurizer, _ = self._current()
+        if len(X) == 0:
+            return np.empty(0, dtype=int), np.empty(0, dtype=float)
+
+        booster = self._booster_for(model, featurizer)
+        if booster is not None:
+            with self._counters_lock:
+                self.native_calls += 1
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            kwargs = {"num_threads": self.num_threads} if self.num_threads else {}
+            positive = booster.predict(X, **kwargs)
+            # argmax entre [1 - p, p]: empate fica com a primeira classe
+            labels = np.asarray(model.classes_)[(positive > 0.5).astype(np.intp)]
+            return labels, positive
+
+        with self._counters_lock:
+            self.fallback_calls += 1
+        probas = model.predict_proba(pd.DataFrame(X, columns=featurizer.feature_names_, copy=False))
+        # Mesmo critério do predict() do classificador: argmax entre as classes
+        labels = np.asarray(model.classes_)[np.argmax(probas, axis=1)]
+        return labels, probas[:, 1]
+
+    def _booster_for(self, model: Any, featurizer: ApplicantFeaturizer) -> Optional[Any]:
+        if not self.use_native:
+            return None
+        cached_model, booster = self._native
+        if cached_model is not model:
+            booster = native_booster(model, featurizer.feature_names_)
+            self._native = (model, booster)
+        return booster
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """
+        Version of the current model (part of the prediction cache keys).
+        """
+        return self._current()[2]
+
+    def _current(self):
+        if self.store is None:
+            return self.model, self.featurizer, self.cache.model_version if self.cache is not None else None
+        # A versão do artefato faz parte da chave do cache
+        artifact = self.store.get()
+        return artifact.model, artifact.featurizer, artifact.version
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single requests into one call of a batch function.
+
+    A worker thread waits for the first queued item, then keeps collecting items for up to
+    max_wait_ms or until max_batch_size items are gathered, and calls batch_fn once with all
+    of them. If the batch call fails, the items are retried one by one so that a single bad
+    request does not fail its neighbours. The worker is started lazily (and restarted after
+    a fork), so the batcher can be created before a preforking server forks its workers.
+
+    Example:
+        batcher = MicroBatcher(service.predict_many, max_batch_size=64, max_wait_ms=5)
+        results = batcher.submit(payload).result()
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: "queue.Queue" = queue.Queue()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queues an item and returns a Future with its result.
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Depois de um fork a thread do processo pai não existe mais
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, name="micro-batcher", daemon=True).start()
+                self._pid = os.getpid()
+
+    def _collect(self) -> List[Any]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+            except Exception:
+                # Reprocessa individualmente para isolar a requisição com erro
+                for item, future in batch:
+                    try:
+                        future.set_result(self.batch_fn([item])[0])
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,237 @@
+import inspect
+import threading
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from lightgbm import LGBMClassifier, early_stopping
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from typing import Any, Callable, Dict, List, Optional
+from datathon_package.model_selection import prepare_training_data, threads_per_fold
+
+# Teto de árvores por fold; o early stopping decide quantas são usadas
+TUNING_MAX_ESTIMATORS = 2000
+TUNING_EARLY_STOPPING_ROUNDS = 50
+
+# LightGBM >= 4.6 recebe o conjunto de validação em eval_X/eval_y (eval_set está depreciado)
+_FIT_ACCEPTS_EVAL_X = "eval_X" in inspect.signature(LGBMClassifier.fit).parameters
+
+
+def _eval_kwargs(X_valid: pd.DataFrame, y_valid: pd.Series) -> Dict[str, Any]:
+    if _FIT_ACCEPTS_EVAL_X:
+        return {"eval_X": (X_valid,), "eval_y": (y_valid,)}
+    return {"eval_set": [(X_valid, y_valid)]}
+
+
+def sample_lgbm_params(rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Draws one set of LightGBM parameters from the search space.
+
+    Args:
+        rng (np.random.Generator): Random generator of the trial.
+
+    Returns:
+        Dict[str, Any]: LGBMClassifier parameters.
+    """
+    return {
+        "learning_rate": float(10 ** rng.uniform(-2, np.log10(0.3))),
+        "num_leaves": int(rng.integers(8, 256)),
+        "min_child_samples": int(rng.integers(5, 200)),
+        "subsample": float(rng.uniform(0.5, 1.0)),
+        "subsample_freq": 1,
+        "colsample_bytree": float(rng.uniform(0.4, 1.0)),
+        "reg_lambda": float(10 ** rng.uniform(-3, 1)),
+        "reg_alpha": float(10 ** rng.uniform(-3, 1)),
+    }
+
+
+class _SearchState:
+    """Best completed trial, shared by the worker threads for pruning."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.best_score = -np.inf
+        self.best_fold_scores: List[float] = []
+
+    def should_prune(self, fold_scores: List[float], margin: float) -> bool:
+        with self.lock:
+            if not self.best_fold_scores:
+                return False
+            k = len(fold_scores)
+            return float(np.mean(fold_scores)) < float(np.mean(self.best_fold_scores[:k])) - margin
+
+    def update(self, score: float, fold_scores: List[float]) -> None:
+        with self.lock:
+            if score > self.best_score:
+                self.best_score = score
+                self.best_fold_scores = list(fold_scores)
+
+
+def run_trial(
+    params: Dict[str, Any],
+    X: pd.DataFrame,
+    y: pd.Series,
+    splits: List[Any],
+    resampling: str = "none",
+    n_threads: int = 1,
+    early_stopping_rounds: int = TUNING_EARLY_STOPPING_ROUNDS,
+    prune: Optional[Callable[[List[float]], bool]] = None,
+    prune_after_folds: int = 2,
+    deadline: Optional[float] = None,
+    random_state: Optional[int] = 42
+) -> Dict[str, Any]:
+    """
+    Evaluates one parameter set with early stopping on each validation fold.
+
+    After prune_after_folds folds (and after every following fold) the running mean AUC
+    is passed to prune; if it returns True the trial stops as 'pruned'. A trial that
+    reaches the deadline between folds stops as 'stopped'.
+
+    Args:
+        params (Dict[str, Any]): LGBMClassifier parameters.
+        X (pd.DataFrame): Features.
+        y (pd.Series): Binary target.
+        splits (List[Any]): (train_idx, valid_idx) pairs.
+        resampling (str): Class-balancing strategy applied to each training fold.
+        n_threads (int): LightGBM threads.
+        early_stopping_rounds (int): Rounds without AUC improvement before stopping a fold.
+        prune (Callable, optional): Receives the fold AUCs so far and decides whether to prune.
+        prune_after_folds (int): Number of folds evaluated before pruning is considered.
+        deadline (float, optional): time.monotonic() value after which no new fold starts.
+        random_state (int, optional): Seed of the model and of the resampling.
+
+    Returns:
+        Dict[str, Any]: 'params', 'status' ('completed', 'pruned' or 'stopped'), 'score'
+        (mean fold AUC), 'fold_scores', 'best_iterations' and 'seconds'.
+    """
+    start = time.perf_counter()
+    fold_scores: List[float] = []
+    best_iterations: List[int] = []
+    status = "completed"
+
+    for train_idx, valid_idx in splits:
+        if deadline is not None and time.monotonic() > deadline:
+            status = "stopped"
+            break
+
+        model = LGBMClassifier(
+            n_estimators=TUNING_MAX_ESTIMATORS, random_state=random_state, n_jobs=n_threads, verbose=-1, **params
+        )
+        model, X_train, y_train, fit_kwargs = prepare_training_data(
+            model, X.iloc[train_idx], y.iloc[train_idx], resampling, random_state
+        )
+        X_valid, y_valid = X.iloc[valid_idx], y.iloc[valid_idx]
+        model.fit(
+            X_train, y_train,
+            eval_metric="auc",
+            callbacks=[early_stopping(early_stopping_rounds, verbose=False)],
+            **_eval_kwargs(X_valid, y_valid),
+            **fit_kwargs
+        )
+        fold_scores.append(float(roc_auc_score(y_valid, model.predict_proba(X_valid)[:, 1])))
+        best_iterations.append(int(model.best_iteration_ or TUNING_MAX_ESTIMATORS))
+
+        if prune is not None and len(fold_scores) >= prune_after_folds and len(fold_scores) < len(splits):
+            if prune(fold_scores):
+                status = "pruned"
+                break
+
+    return {
+        "params": params,
+        "status": status,
+        "score": float(np.mean(fold_scores)) if fold_scores else float("nan"),
+        "fold_scores": fold_scores,
+        "best_iterations": best_iterations,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def random_search(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_trials: Optional[int] = 20,
+    time_budget: Optional[float] = None,
+    n_jobs: int = 1,
+    cv_folds: int = 5,
+    resampling: str = "none",
+    prune_after_folds: int = 2,
+    prune_margin: float = 0.01,
+    sample_params: Callable[[np.random.Generator], Dict[str, Any]] = sample_lgbm_params,
+    on_trial_end: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    random_state: int = 42
+) -> Dict[str, Any]:
+    """
+    Random search over LightGBM parameters under a trial and/or wall-clock budget.
+
+    Trials run in n_jobs threads, each LightGBM using threads_per_fold(n_jobs) threads.
+    Every trial uses the same stratified folds and early stopping, and is pruned once its
+    mean AUC over the first folds is more than prune_margin below the best completed
+    trial over the same folds.
+
+    Args:
+        X (pd.DataFrame): Features.
+        y (pd.Series): Binary target.
+        n_trials (int, optional): Maximum number of trials (None for no limit).
+        time_budget (float, optional): Wall-clock budget in seconds (None for no limit).
+        n_jobs (int): Number of trials evaluated concurrently.
+        cv_folds (int): Number of folds.
+        resampling (str): Class-balancing strategy applied to each training fold.
+        prune_after_folds (int): Folds evaluated before a trial can be pruned.
+        prune_margin (float): AUC margin below the best trial that triggers pruning.
+        sample_params (Callable): Draws a parameter set from a random generator.
+        on_trial_end (Callable, optional): Called with (trial number, trial result), e.g. to log it.
+        random_state (int): Seed of the folds and of the parameter draws.
+
+    Returns:
+        Dict[str, Any]: 'best' (best completed trial, with 'n_estimators' set from the
+        mean best iteration) and 'trials' (every trial result, in trial order).
+
+    Raises:
+        ValueError: If neither n_trials nor time_budget is set.
+    """
+    if n_trials is None and time_budget is None:
+        raise ValueError("Defina n_trials e/ou time_budget.")
+
+    splits = list(StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=random_state).split(X, y))
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    n_threads = threads_per_fold(n_jobs)
+    state = _SearchState()
+    trials: Dict[int, Dict[str, Any]] = {}
+
+    def evaluate(trial_number: int) -> Dict[str, Any]:
+        params = sample_params(np.random.default_rng(random_state + trial_number))
+        result = run_trial(
+            params, X, y, splits, resampling=resampling, n_threads=n_threads,
+            prune=lambda scores: state.should_prune(scores, prune_margin),
+            prune_after_folds=prune_after_folds, deadline=deadline, random_state=random_state
+        )
+        if result["status"] == "completed":
+            state.update(result["score"], result["fold_scores"])
+        if on_trial_end is not None:
+            on_trial_end(trial_number, result)
+        return result
+
+    def budget_left(submitted: int) -> bool:
+        if n_trials is not None and submitted >= n_trials:
+            return False
+        return deadline is None or time.monotonic() < deadline
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        running = {}
+        submitted = 0
+        while running or budget_left(submitted):
+            while len(running) < n_jobs and budget_left(submitted):
+                running[executor.submit(evaluate, submitted)] = submitted
+                submitted += 1
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                trials[running.pop(future)] = future.result()
+
+    ordered = [trials[i] for i in sorted(trials)]
+    completed = [t for t in ordered if t["status"] == "completed"]
+    best = None
+    if completed:
+        best = dict(max(completed, key=lambda t: t["score"]))
+        best["n_estimators"] = int(np.mean(best["best_iterations"]))
+    return {"best": best, "trials": ordered}
@@ -1,9 +1,19 @@
+import numpy as np
 import pandas as pd
-from typing import Any, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine
 from dotenv import load_dotenv
+import ijson
+from datathon_package.profiling import profile_stage
+import io
 import os
+import queue
+import threading
+import time
 
 
 
@@ -39,13 +49,132 @@ def expand_dict_column(df: pd.DataFrame, column: str, prefix: str) -> pd.DataFra
     """
     if column in df.columns:
         try:
-            expanded = pd.json_normalize(df[column]).add_prefix(prefix)
+            expanded = pd.json_normalize(df[column].tolist()).add_prefix(prefix)
+            # json_normalize descarta o índice original; realinha com as linhas de df
+            expanded.index = df.index
             df = df.drop(columns=[column])
             df = pd.concat([df, expanded], axis=1)
         except Exception as e:
             print(f"Error expanding column '{column}': {e}")
     return df
 
+def iter_json_records(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterates over the top-level ID -> record mapping of a JSON file without loading it whole.
+
+    Args:
+        path (str): Path to a JSON file shaped as {ID: {...}, ...}.
+
+    Yields:
+        Tuple[str, Any]: (ID, decoded record) pairs, in file order.
+    """
+    with open(path, "rb") as f:
+        yield from ijson.kvitems(f, '', use_float=True)
+
+
+def iter_json_batches(path: str, batch_size: int) -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Groups the records yielded by iter_json_records into fixed-size batches.
+
+    Args:
+        path (str): Path to a JSON file shaped as {ID: {...}, ...}.
+        batch_size (int): Maximum number of records per batch.
+
+    Yields:
+        List[Tuple[str, Any]]: Lists with up to batch_size (ID, record) pairs.
+    """
+    batch = []
+    for item in iter_json_records(path):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parallel_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    n_jobs: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = ()
+) -> Iterator[Any]:
+    """
+    Applies fn to each item in a process pool and yields the results in input order.
+    At most 2 * n_jobs items are in flight, so a streamed input is never fully materialized.
+    With n_jobs <= 1 everything runs in the current process.
+
+    Args:
+        fn (Callable): Picklable (module-level) function.
+        items (Iterable): Inputs for fn.
+        n_jobs (int): Number of worker processes.
+        initializer (Callable, optional): Picklable function run once in each worker
+                                          (or once in the current process) before fn.
+        initargs (Tuple): Arguments of initializer.
+
+    Yields:
+        Any: fn(item) for each item, in order.
+    """
+    if n_jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield fn(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=initializer, initargs=initargs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def split_by_id_ranges(df: pd.DataFrame, n_partitions: int) -> List[pd.DataFrame]:
+    """
+    Splits a DataFrame sorted by ID into contiguous ID ranges of similar size.
+
+    Args:
+        df (pd.DataFrame): DataFrame sorted by ID.
+        n_partitions (int): Number of partitions.
+
+    Returns:
+        List[pd.DataFrame]: Non-empty partitions, in ID order.
+    """
+    bounds = np.linspace(0, len(df), num=max(n_partitions, 1) + 1, dtype=int)
+    return [
+        df.iloc[start:end].reset_index(drop=True)
+        for start, end in zip(bounds[:-1], bounds[1:])
+        if end > start
+    ]
+
+
+def coerce_numeric_ids(series: pd.Series) -> pd.Series:
+    """
+    Converts string IDs to integers when all of them are numeric, mirroring
+    what pd.read_json does with the keys of the raw exports.
+    """
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.notna().all():
+        return numeric.astype('int64')
+    return series
+
+
+def sort_ids(ids: Iterable[Any]) -> List[Any]:
+    """
+    Sorts IDs in the same order as coerce_numeric_ids + sort: numerically when all of
+    them are numeric (so '2' comes before '10'), otherwise as strings.
+    """
+    ids = list(ids)
+    try:
+        return sorted(ids, key=int)
+    except ValueError:
+        return sorted(ids, key=str)
+
+
 def remove_invalid_prospect_codigo(df: pd.DataFrame) -> pd.DataFrame:
     return df[
         (~df['prospect_codigo'].astype(str).str.strip().isin(['', 'nan', 'na', 'none']))
@@ -108,9 +237,95 @@ def drop_constant_binary_columns(df: pd.DataFrame) -> pd.DataFrame:
 import pandas as pd
 
 
+# Um engine (com pool de conexões) por processo e URL
+_ENGINES: Dict[Tuple[int, str], Engine] = {}
+
+# Linhas serializadas por bloco enviado ao COPY
+COPY_CHUNKSIZE = 50000
+# Marcador de nulo no CSV do COPY (o mesmo do formato texto do PostgreSQL)
+COPY_NULL = "\\N"
+
+
+def get_database_url(local) -> str:
+    """
+    Monta a URL de conexão do PostgreSQL a partir do .env (ou de valores default).
+    Se DATABASE_URL estiver definida, ela é usada diretamente (ex.: SQLite nos testes).
+
+    Parâmetros:
+        local (bool): se True, força a conexão em localhost
+    """
+    # Carrega variáveis de ambiente, se existir um .env
+    load_dotenv()
+    if os.getenv("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
+
+    # Coleta configs do .env (ou usa valores default)
+    DB_USER = os.getenv("POSTGRES_USER", "leonardo")
+    DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "123456")
+    DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
+    DB_PORT = os.getenv("POSTGRES_PORT", "5432")
+    DB_NAME = os.getenv("POSTGRES_DB", "meubanco")
+
+    if local:
+        DB_HOST = "localhost"
+
+    # Cria a string de conexão
+    return f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+def get_engine(local) -> Engine:
+    """
+    Retorna o engine SQLAlchemy do processo atual, criando-o na primeira chamada.
+    Processos filhos (fork) criam o próprio engine em vez de herdar conexões do pai.
+
+    Parâmetros:
+        local (bool): se True, força a conexão em localhost
+    """
+    url = get_database_url(local)
+    key = (os.getpid(), url)
+    if key not in _ENGINES:
+        _ENGINES[key] = create_engine(url, pool_pre_ping=True)
+    return _ENGINES[key]
+
+
+def copy_dataframe(conn: Connection, df: pd.DataFrame, table_name: str, chunksize: int = COPY_CHUNKSIZE) -> None:
+    """
+    Carrega as linhas de df em uma tabela existente.
+    No PostgreSQL usa COPY FROM STDIN (CSV) em blocos; em outros bancos usa to_sql.
+
+    Parâmetros:
+        conn (Connection): conexão SQLAlchemy com transação aberta
+        df (pd.DataFrame): linhas a inserir (colunas com os mesmos nomes da tabela)
+        table_name (str): tabela de destino
+        chunksize (int): linhas serializadas por bloco
+    """
+    if conn.dialect.name != "postgresql":
+        df.to_sql(name=table_name, con=conn, if_exists="append", index=False, chunksize=chunksize)
+        return
+
+    quote = conn.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(str(col)) for col in df.columns)
+    # Nulos são gravados como \N: com o NULL padrão (campo vazio) o COPY leria strings
+    # vazias como NULL, diferente do to_sql
+    copy_sql = f"COPY {quote(table_name)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+    cursor = conn.connection.cursor()
+    try:
+        for start in range(0, len(df), chunksize):
+            buffer = io.StringIO()
+            df.iloc[start:start + chunksize].to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+    finally:
+        cursor.close()
+
+
 def ingest_dataframe_to_postgres(df: pd.DataFrame, local, table_name: str, if_exists: str = "replace"):
     """
-    Insere um DataFrame em uma tabela PostgreSQL.
+    Insere um DataFrame em uma tabela PostgreSQL via COPY, usando o engine do processo.
+
+    Com 'replace', os dados são carregados em uma tabela de staging que substitui a
+    tabela de destino na mesma transação: leitores veem a tabela antiga até o commit.
 
     Parâmetros:
         df (pd.DataFrame): o DataFrame a ser ingerido
@@ -121,27 +336,123 @@ def ingest_dataframe_to_postgres(df: pd.DataFrame, local, table_name: str, if_ex
                          - 'append': insere os dados sem apagar a tabela
     """
     try:
-        # Carrega variáveis de ambiente, se existir um .env
-        load_dotenv()
-        # Coleta configs do .env (ou usa valores default)
-        DB_USER = os.getenv("POSTGRES_USER", "leonardo")
-        DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "123456")
-        DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
-        DB_PORT = os.getenv("POSTGRES_PORT", "5432")
-        DB_NAME = os.getenv("POSTGRES_DB", "meubanco")
+        start = time.perf_counter()
+        engine = get_engine(local)
+
+        with engine.begin() as conn:
+            exists = inspect(conn).has_table(table_name)
+            if exists and if_exists == "fail":
+                raise ValueError(f"Tabela '{table_name}' já existe.")
+
+            if if_exists == "replace":
+                staging_table = f"{table_name}__staging"
+                quote = conn.dialect.identifier_preparer.quote
+
+                # Cria a staging com o schema inferido pelo pandas e carrega os dados
+                df.head(0).to_sql(name=staging_table, con=conn, if_exists="replace", index=False)
+                copy_dataframe(conn, df, staging_table)
+
+                # Troca atômica: drop + rename dentro da mesma transação
+                conn.execute(text(f"DROP TABLE IF EXISTS {quote(table_name)}"))
+                conn.execute(text(f"ALTER TABLE {quote(staging_table)} RENAME TO {quote(table_name)}"))
+            else:
+                if not exists:
+                    df.head(0).to_sql(name=table_name, con=conn, index=False)
+                copy_dataframe(conn, df, table_name)
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"Tabela '{table_name}' atualizada com sucesso ({len(df)} registros, "
+            f"{len(df) / max(elapsed, 1e-9):,.0f} registros/s)."
+        )
 
-        if local:
-            DB_HOST = "localhost"
+    except Exception as e:
+        print("Erro ao inserir dados no PostgreSQL:")
+        print(e)
 
-        # Cria a string de conexão
-        DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        engine = create_engine(DATABASE_URL)
 
-        # Envia o DataFrame
-        df.to_sql(name=table_name, con=engine, if_exists=if_exists, index=False, method="multi")
+def upsert_dataframe_to_postgres(df: pd.DataFrame, local, table_name: str, key_column: str, keys: Iterable[Any]):
+    """
+    Atualiza parte de uma tabela PostgreSQL: remove as linhas cujas chaves estão em keys
+    e insere as linhas de df (via COPY), em uma única transação.
 
-        print(f"Tabela '{table_name}' atualizada com sucesso ({len(df)} registros).")
+    Parâmetros:
+        df (pd.DataFrame): linhas novas ou alteradas
+        table_name (str): nome da tabela de destino no PostgreSQL
+        key_column (str): coluna usada como chave
+        keys (Iterable): chaves a substituir (inclui chaves removidas, que não estão em df)
+    """
+    try:
+        start = time.perf_counter()
+        engine = get_engine(local)
+        # psycopg2 não adapta tipos numpy
+        keys = [key.item() if hasattr(key, 'item') else key for key in keys]
+
+        with engine.begin() as conn:
+            quote = conn.dialect.identifier_preparer.quote
+            if inspect(conn).has_table(table_name):
+                delete = text(f"DELETE FROM {quote(table_name)} WHERE {quote(key_column)} IN :keys")
+                conn.execute(delete.bindparams(bindparam('keys', expanding=True)), {'keys': keys})
+            else:
+                df.head(0).to_sql(name=table_name, con=conn, index=False)
+            copy_dataframe(conn, df, table_name)
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"Tabela '{table_name}' atualizada com sucesso ({len(keys)} chaves, {len(df)} registros, "
+            f"{len(df) / max(elapsed, 1e-9):,.0f} registros/s)."
+        )
 
     except Exception as e:
-        print("Erro ao inserir dados no PostgreSQL:")
+        print("Erro ao atualizar dados no PostgreSQL:")
         print(e)
+
+
+class PostgresWriter:
+    """
+    Background writer that runs the PostgreSQL ingests off the critical path.
+
+    Each submitted DataFrame is written by a single worker thread, in submission order,
+    through ingest_dataframe_to_postgres. close() waits for the pending writes and
+    returns the time spent writing each table.
+
+    Example:
+        writer = PostgresWriter(local=True)
+        writer.submit(df, table_name="applicants")
+        timings = writer.close()
+    """
+
+    def __init__(self, local):
+        self.local = local
+        self.timings: Dict[str, float] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="postgres-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, df: pd.DataFrame, table_name: str, if_exists: str = "replace") -> None:
+        """
+        Queues a DataFrame to be written. The DataFrame must not be modified afterwards.
+        """
+        self._queue.put((df, table_name, if_exists))
+
+    def close(self) -> Dict[str, float]:
+        """
+        Waits for all queued writes to finish.
+
+        Returns:
+            Dict[str, float]: Seconds spent writing each table.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self.timings
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            df, table_name, if_exists = item
+            start = time.perf_counter()
+            with profile_stage(f"postgres_{table_name}", rows_in=len(df)):
+                ingest_dataframe_to_postgres(df, self.local, table_name=table_name, if_exists=if_exists)
+            self.timings[table_name] = time.perf_counter() - start
@@ -0,0 +1,38 @@
+# Configuração do gunicorn para servir api/app.py em produção:
+#   gunicorn -c gunicorn.conf.py api.app:app
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5007")
+
+# Workers pré-forkados, cada um com um pool de threads (o micro-batcher agrupa as requisições concorrentes)
+workers = int(os.getenv("GUNICORN_WORKERS", str(max(1, multiprocessing.cpu_count()))))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+worker_class = "gthread"
+
+# Modelo e featurizer (o artefato de serving ou o .pkl) são carregados uma vez no master,
+# antes do fork, e compartilhados entre os workers por copy-on-write; um artefato novo é
+# recarregado depois em cada worker
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", None)
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def pre_fork(server, worker):
+    # Congela os objetos já carregados para o GC não tocar nas páginas compartilhadas
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # O aquecimento roda em cada worker: /ready responde 503 até aqui
+    from api.app import warm_up
+    warm_up()
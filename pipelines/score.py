@@ -0,0 +1,34 @@
+import argparse
+import os
+from datathon_package.profiling import StageProfiler
+from datathon_package.scoring import SCORING_BATCH_SIZE, score_applicants_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring em massa de todos os candidatos do export bruto")
+    parser.add_argument("--applicants-path", default="./data/raw/applicants/applicants.json")
+    parser.add_argument("--output-path", default="./data/processed/applicant_scores.parquet")
+    parser.add_argument("--artifact-dir", default=os.getenv("SERVING_ARTIFACT_DIR", "./models/serving"))
+    parser.add_argument("--model-path", default="./models/lgbm_oversample_model.pkl",
+                        help="Usado quando não há artefato de serving")
+    parser.add_argument("--featurizer-path", default="./models/applicant_featurizer.pkl")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("SCORING_BATCH_SIZE", str(SCORING_BATCH_SIZE))))
+    parser.add_argument("--n-jobs", type=int, default=int(os.getenv("SCORING_N_JOBS", str(os.cpu_count() or 1))),
+                        help="Processos de scoring")
+    parser.add_argument("--postgres-table", default=None, help="Também carrega os scores nesta tabela do PostgreSQL")
+    parser.add_argument("--local", action="store_true", help="PostgreSQL local (ver get_database_url)")
+    parser.add_argument("--profile-report", default=None, help="Grava o relatório de etapas (JSON)")
+    args = parser.parse_args()
+
+    profiler = StageProfiler("score")
+    with profiler.activate():
+        score_applicants_file(
+            args.applicants_path, args.output_path, artifact_dir=args.artifact_dir,
+            model_path=args.model_path, featurizer_path=args.featurizer_path, batch_size=args.batch_size,
+            n_jobs=args.n_jobs, postgres_table=args.postgres_table, local=args.local
+        )
+
+    profiler.print_summary()
+    if args.profile_report:
+        profiler.write_report(args.profile_report)
+    print(f"Scores salvos em {args.output_path}")
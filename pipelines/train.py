@@ -1,75 +1,279 @@
+import argparse
+import os
+import tempfile
+import numpy as np
 import pandas as pd
 import pickle
 import mlflow
+import mlflow.lightgbm
 import mlflow.sklearn
+from mlflow.tracking import MlflowClient
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
 from lightgbm import LGBMClassifier
-from sklearn.model_selection import StratifiedKFold, cross_val_score
-from imblearn.over_sampling import SMOTE
-from typing import Tuple
+from typing import Optional, Tuple, Union
+from datathon_package.artifact import BoosterClassifier, export_serving_artifact
+from datathon_package.feature_store import (
+    FeatureStore,
+    feature_store_exists,
+    feature_store_is_stale,
+    load_feature_store,
+    load_lgb_dataset,
+)
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.profiling import StageProfiler, profile_stage
+from datathon_package.schema import master_feature_columns, read_master_parquet
+from datathon_package.model_selection import (
+    booster_params,
+    cross_validate_oof,
+    fit_lgbm_on_dataset,
+    prepare_training_data,
+    RESAMPLING_STRATEGIES
+)
+from datathon_package.tuning import random_search
 
 
-def evaluate_model_cv(model, X: pd.DataFrame, y: pd.Series, cv_folds: int = 5) -> dict:
+def evaluate_model_cv(model, X: pd.DataFrame, y: pd.Series, cv_folds: int = 5, n_jobs: int = 1) -> dict:
     """
-    Realiza validação cruzada e retorna as métricas médias.
+    Realiza validação cruzada (um ajuste por fold) e retorna as métricas médias.
     """
-    skf = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
+    metrics, _, _ = cross_validate_oof(model, X, y, cv_folds=cv_folds, n_jobs=n_jobs)
+    return metrics
 
-    return {
-        "accuracy": cross_val_score(model, X, y, cv=skf, scoring="accuracy").mean(),
-        "precision": cross_val_score(model, X, y, cv=skf, scoring="precision").mean(),
-        "recall": cross_val_score(model, X, y, cv=skf, scoring="recall").mean(),
-        "f1": cross_val_score(model, X, y, cv=skf, scoring="f1").mean(),
-        "roc_auc": cross_val_score(model, X, y, cv=skf, scoring="roc_auc").mean(),
-    }
+
+def log_oof_predictions(y: pd.Series, oof: np.ndarray, folds: np.ndarray) -> None:
+    """
+    Loga as probabilidades out-of-fold no MLflow (artefato cv/oof_predictions.parquet).
+    """
+    oof_df = pd.DataFrame({"fold": folds, "target": np.asarray(y), "oof_proba": oof})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "oof_predictions.parquet")
+        oof_df.to_parquet(path, index=False)
+        mlflow.log_artifact(path, artifact_path="cv")
+
+
+def training_data(
+    df: Optional[pd.DataFrame] = None,
+    feature_store: Optional[FeatureStore] = None
+) -> Tuple[pd.DataFrame, pd.Series, ApplicantFeaturizer]:
+    """
+    Separa features e target da master table ou, se feature_store for informado, usa a
+    matriz mapeada em memória sem copiá-la. Retorna X, y e o featurizer ajustado em X.
+    """
+    if feature_store is not None:
+        X = feature_store.frame()
+        y = pd.Series(feature_store.y, name="target").astype(int)
+    else:
+        df = df.dropna(subset=["target"])
+        X = df.drop(columns=["ID", "prospect_codigo", "target"], errors="ignore")
+        y = df["target"].astype(int)
+
+    # Congela a ordem das colunas para a API gerar exatamente as mesmas features
+    featurizer = ApplicantFeaturizer().fit(X)
+    if list(X.columns) != featurizer.feature_names_:
+        X = X[featurizer.feature_names_]
+    return X, y, featurizer
 
 
 def train_lgbm_with_oversampling(
-    df: pd.DataFrame,
+    df: Optional[pd.DataFrame] = None,
     model_output_path: str = "./models/lgbm_oversample_model.pkl",
-    experiment_name: str = "lgbm_candidate_prediction_oversampled"
-) -> Tuple[LGBMClassifier, dict]:
+    featurizer_output_path: str = "./models/applicant_featurizer.pkl",
+    serving_output_dir: Optional[str] = "./models/serving",
+    experiment_name: str = "lgbm_candidate_prediction_oversampled",
+    cv_folds: int = 5,
+    n_jobs: int = 1,
+    resampling: str = "smote",
+    model_params: Optional[dict] = None,
+    feature_store: Optional[FeatureStore] = None
+) -> Tuple[Union[LGBMClassifier, BoosterClassifier], dict]:
     """
     Treina modelo LightGBM com oversampling e validação cruzada.
+    n_jobs controla quantos folds treinam em paralelo (as threads do LightGBM são divididas entre eles).
+    resampling escolhe o balanceamento de classes (ver RESAMPLING_STRATEGIES), aplicado
+    só nos dados de treino de cada fold e do modelo final.
+    model_params sobrescreve os parâmetros padrão do LGBMClassifier (ex.: os melhores do --tune).
+    serving_output_dir recebe o artefato enxuto de serving (booster nativo + metadados), que a
+    API recarrega sem reiniciar; None não exporta.
+    feature_store (mapeado em memória, ver load_feature_store) substitui df: o treino lê a
+    matriz sem copiá-la e o modelo final usa o Dataset do LightGBM em cache ao lado do store
+    (exceto com smote, que materializa as amostras sintéticas). Nesse caso o modelo retornado,
+    salvo em model_output_path e logado com mlflow.lightgbm, é um BoosterClassifier (booster
+    nativo com predict/predict_proba/classes_) em vez de um LGBMClassifier.
     """
-    # Preparar dados
-    df = df.dropna(subset=["target"])
-    X = df.drop(columns=["ID", "prospect_codigo", "target"])
-    y = df["target"].astype(int)
-
-    # Aplicar SMOTE (oversampling apenas no treino)
-    smote = SMOTE(random_state=42)
-    X_resampled, y_resampled = smote.fit_resample(X, y)
+    X, y, featurizer = training_data(df, feature_store)
 
-    print(f" Oversampling aplicado: {y.value_counts().to_dict()} ➡ {pd.Series(y_resampled).value_counts().to_dict()}")
+    print(f" Distribuição do target: {y.value_counts().to_dict()} | balanceamento: {resampling}")
 
     mlflow.set_experiment(experiment_name)
     with mlflow.start_run():
-        model = LGBMClassifier(
-            n_estimators=300,
-            random_state=42
-        )
+        params = {"n_estimators": 300, "random_state": 42, **(model_params or {})}
+        model = LGBMClassifier(**params)
 
-        metrics = evaluate_model_cv(model, X_resampled, y_resampled)
+        # Um ajuste por fold; o balanceamento é aplicado só no treino de cada fold
+        # e todas as métricas saem das probabilidades out-of-fold
+        with profile_stage("cv", rows_in=len(y)):
+            metrics, oof, folds = cross_validate_oof(
+                model, X, y, cv_folds=cv_folds, n_jobs=n_jobs, resampling=resampling
+            )
 
-        # Treina modelo final
-        model.fit(X_resampled, y_resampled)
+        # Treina modelo final com todos os dados e a mesma estratégia
+        with profile_stage("final_fit", rows_in=len(y)):
+            if feature_store is not None and resampling != "smote":
+                # Pula a construção dos histogramas quando o Dataset já está em cache
+                model, _, _, fit_kwargs = prepare_training_data(model, X, y, resampling)
+                dataset = load_lgb_dataset(feature_store, booster_params(model))
+                model = fit_lgbm_on_dataset(model, dataset, fit_kwargs.get("sample_weight"))
+            else:
+                model, X_train, y_train, fit_kwargs = prepare_training_data(model, X, y, resampling)
+                model.fit(X_train, y_train, **fit_kwargs)
 
         # Loga métricas no MLflow
         for name, val in metrics.items():
             mlflow.log_metric(name, val)
-        mlflow.sklearn.log_model(model, artifact_path="lgbm_model_oversampled")
+        mlflow.log_params({"cv_folds": cv_folds, "cv_n_jobs": n_jobs, "resampling": resampling})
+        mlflow.log_params({f"lgbm_{name}": value for name, value in params.items()})
+        log_oof_predictions(y, oof, folds)
+        if isinstance(model, BoosterClassifier):
+            mlflow.lightgbm.log_model(model.booster, artifact_path="lgbm_model_oversampled")
+        else:
+            mlflow.sklearn.log_model(model, artifact_path="lgbm_model_oversampled")
 
         # Salvar local para API
         with open(model_output_path, "wb") as f:
             pickle.dump(model, f)
+        featurizer.save(featurizer_output_path)
+        if serving_output_dir:
+            metadata = export_serving_artifact(model, featurizer, serving_output_dir)
+            mlflow.log_param("serving_checksum", metadata["checksum"][:16])
+            print(f"Artefato de serving exportado em {serving_output_dir} ({metadata['checksum'][:16]})")
 
-        print("Modelo treinado com SMOTE e salvo com sucesso!")
+        print(f"Modelo treinado ({resampling}) e salvo com sucesso!")
         for k, v in metrics.items():
             print(f"{k}: {v:.4f}")
 
     return model, metrics
 
 
+def tune_lgbm(
+    df: Optional[pd.DataFrame] = None,
+    n_trials: Optional[int] = 30,
+    time_budget: Optional[float] = None,
+    n_jobs: int = 1,
+    cv_folds: int = 5,
+    resampling: str = "smote",
+    experiment_name: str = "lgbm_candidate_prediction_tuning",
+    feature_store: Optional[FeatureStore] = None
+) -> dict:
+    """
+    Busca aleatória de hiperparâmetros do LightGBM com early stopping por fold e poda
+    dos trials claramente piores. Cada trial vira um run aninhado no MLflow.
+    Retorna os melhores parâmetros (incluindo n_estimators).
+    """
+    X, y, _ = training_data(df, feature_store)
+
+    mlflow.set_experiment(experiment_name)
+    client = MlflowClient()
+    with mlflow.start_run(run_name="random_search") as parent:
+        mlflow.log_params({
+            "n_trials": n_trials, "time_budget": time_budget, "n_jobs": n_jobs,
+            "cv_folds": cv_folds, "resampling": resampling
+        })
+
+        # Os trials rodam em threads: cada um loga pelo client, com a tag de run pai
+        def log_trial(trial_number: int, result: dict) -> None:
+            run = client.create_run(
+                parent.info.experiment_id,
+                run_name=f"trial_{trial_number:03d}",
+                tags={MLFLOW_PARENT_RUN_ID: parent.info.run_id, "status": result["status"]}
+            )
+            run_id = run.info.run_id
+            for name, value in result["params"].items():
+                client.log_param(run_id, name, value)
+            for fold, (score, iterations) in enumerate(zip(result["fold_scores"], result["best_iterations"])):
+                client.log_metric(run_id, "fold_roc_auc", score, step=fold)
+                client.log_metric(run_id, "fold_best_iteration", iterations, step=fold)
+            if result["fold_scores"]:
+                client.log_metric(run_id, "roc_auc", result["score"])
+            client.log_metric(run_id, "seconds", result["seconds"])
+            client.set_terminated(run_id)
+            print(f" trial {trial_number:03d}: {result['status']:>9} roc_auc={result['score']:.4f} "
+                  f"({len(result['fold_scores'])} folds, {result['seconds']:.1f}s)")
+
+        search = random_search(
+            X, y, n_trials=n_trials, time_budget=time_budget, n_jobs=n_jobs,
+            cv_folds=cv_folds, resampling=resampling, on_trial_end=log_trial
+        )
+
+        best = search["best"]
+        if best is None:
+            raise RuntimeError("Nenhum trial completo dentro do orçamento.")
+        statuses = pd.Series([t["status"] for t in search["trials"]]).value_counts().to_dict()
+        best_params = {**best["params"], "n_estimators": best["n_estimators"]}
+        mlflow.log_metric("best_roc_auc", best["score"])
+        mlflow.log_params({f"best_{name}": value for name, value in best_params.items()})
+        mlflow.log_metrics({f"trials_{status}": count for status, count in statuses.items()})
+
+    print(f"Melhor roc_auc: {best['score']:.4f} | trials: {statuses}")
+    print(f"Melhores parâmetros: {best_params}")
+    return best_params
+
+
 if __name__ == "__main__":
-    df = pd.read_parquet("./data/processed/master_table.parquet")
-    train_lgbm_with_oversampling(df)
+    parser = argparse.ArgumentParser(description="Treino do modelo LightGBM")
+    parser.add_argument("--master-path", default="./data/processed/master_table.parquet")
+    parser.add_argument("--cv-folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=int(os.getenv("TRAIN_N_JOBS", "1")),
+                        help="Folds treinados em paralelo")
+    parser.add_argument("--resampling", choices=RESAMPLING_STRATEGIES, default=os.getenv("TRAIN_RESAMPLING", "smote"))
+    parser.add_argument("--tune", action="store_true", help="Busca hiperparâmetros antes do treino final")
+    parser.add_argument("--n-trials", type=int, default=30)
+    parser.add_argument("--time-budget", type=float, default=None, help="Orçamento da busca em segundos")
+    parser.add_argument("--feature-store", default=os.getenv("TRAIN_FEATURE_STORE") or None,
+                        help="Feature store mapeado em memória no lugar de --master-path (ex.: ./data/processed/feature_store)")
+    parser.add_argument("--profile-report", default=None, help="Grava o relatório de etapas (JSON)")
+    parser.add_argument("--tracking-uri", default=os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns"),
+                        help="Store do MLflow (local por padrão, sem servidor)")
+    args = parser.parse_args()
+    if args.feature_store:
+        if not feature_store_exists(args.feature_store):
+            parser.error(f"Feature store não encontrado em {args.feature_store}.")
+        # Um store mais antigo que a master table não reflete a versão atual dos dados
+        if feature_store_is_stale(args.feature_store, args.master_path):
+            parser.error(
+                f"Feature store em {args.feature_store} é anterior a {args.master_path}; "
+                "gere-o de novo ou treine sem --feature-store."
+            )
+
+    mlflow.set_tracking_uri(args.tracking_uri)
+
+    # Tempo de carga e pico de RSS de cada etapa do treino
+    profiler = StageProfiler("train")
+    with profiler.activate():
+        df, feature_store = None, None
+        with profile_stage("load") as stage:
+            if args.feature_store:
+                feature_store = load_feature_store(args.feature_store)
+                stage.rows_out = len(feature_store.y)
+            else:
+                # Lê só as colunas usadas no treino (sem os IDs), nos tipos compactos gravados no arquivo
+                df = read_master_parquet(args.master_path, columns=master_feature_columns(args.master_path))
+                stage.rows_out = len(df)
+
+        model_params = None
+        if args.tune:
+            n_trials = args.n_trials if args.n_trials > 0 else None
+            with profile_stage("tune"):
+                model_params = tune_lgbm(
+                    df, n_trials=n_trials, time_budget=args.time_budget, n_jobs=args.n_jobs,
+                    cv_folds=args.cv_folds, resampling=args.resampling, feature_store=feature_store
+                )
+
+        train_lgbm_with_oversampling(
+            df, cv_folds=args.cv_folds, n_jobs=args.n_jobs, resampling=args.resampling,
+            model_params=model_params, feature_store=feature_store
+        )
+
+    print(f"Dados carregados de {'feature store' if feature_store is not None else 'Parquet'}")
+    profiler.print_summary()
+    if args.profile_report:
+        profiler.write_report(args.profile_report)
@@ -1,6 +1,7 @@
 # app/bootstrap.py
 
 from datathon_package.generate_master_table import generate_master_table
+from datathon_package.profiling import StageProfiler
 import os
 
 if __name__ == "__main__":
@@ -8,5 +9,25 @@ if __name__ == "__main__":
     print("[BOOTSTRAP] Gerando tabela mestra...")
     applicants_path = './data/raw/applicants/applicants.json'
     prospects_path = './data/raw/prospects/prospects.json'
-    df_master = generate_master_table(applicants_path, prospects_path,local=True)
+    # Lê os JSONs brutos em lotes para manter a memória limitada
+    chunksize = int(os.getenv("BOOTSTRAP_CHUNKSIZE", "10000"))
+    # Modo incremental: reprocessa só candidatos e vagas novos ou alterados
+    incremental = os.getenv("BOOTSTRAP_INCREMENTAL", "0") == "1"
+    # Applicants e prospects em processos separados, cada um com BOOTSTRAP_PARTITIONS processos internos
+    n_jobs = int(os.getenv("BOOTSTRAP_N_JOBS", "2"))
+    n_partitions = int(os.getenv("BOOTSTRAP_PARTITIONS", str(max(1, (os.cpu_count() or 2) // 2))))
+    # Relatório por etapa (tempo, CPU, memória, linhas) e, opcionalmente, dump do cProfile
+    profile_report = os.getenv("BOOTSTRAP_PROFILE_REPORT", "./data/processed/bootstrap_profile.json")
+    # Features e target também em um feature store mapeável em memória (vazio desativa)
+    feature_store_dir = os.getenv("BOOTSTRAP_FEATURE_STORE", "./data/processed/feature_store") or None
+    profiler = StageProfiler("bootstrap", cprofile_path=os.getenv("BOOTSTRAP_CPROFILE") or None)
+    df_master = generate_master_table(
+        applicants_path, prospects_path, local=True, chunksize=chunksize,
+        incremental=incremental, n_jobs=n_jobs, n_partitions=n_partitions, profiler=profiler,
+        feature_store_dir=feature_store_dir
+    )
+    profiler.print_summary()
+    if profile_report:
+        profiler.write_report(profile_report)
+        print(f"[BOOTSTRAP] Relatório de etapas salvo em {profile_report}")
     print("[BOOTSTRAP] Concluído.")
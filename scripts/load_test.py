@@ -0,0 +1,123 @@
+# scripts/load_test.py
+"""
+Teste de carga local da API: dispara requisições concorrentes contra /predict e
+reporta requisições/s e percentis de latência.
+
+Uso:
+    python scripts/load_test.py --url http://localhost:5007/predict --requests 2000 --concurrency 32
+    python scripts/load_test.py --applicants ./data/raw/applicants/applicants.json --per-request 1
+"""
+import argparse
+import itertools
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from datathon_package.utils import iter_json_records
+
+# Candidato de exemplo usado quando nenhum arquivo de applicants é informado
+SAMPLE_APPLICANT = {
+    "infos_basicas": {"sabendo_de_nos_por": "Site"},
+    "informacoes_pessoais": {"estado_civil": "Casado"},
+    "informacoes_profissionais": {
+        "certificacoes": "PMP, ITIL",
+        "remuneracao": "R$ 8.000,00",
+        "nivel_profissional": "Sênior",
+    },
+    "formacao_e_idiomas": {"nivel_academico": "Ensino Superior Completo"},
+    "cargo_atual": {},
+}
+
+
+def build_payloads(applicants_path: Optional[str], per_request: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Builds the request bodies, each with per_request applicants.
+
+    Args:
+        applicants_path (str, optional): Raw applicants.json to sample records from.
+        per_request (int): Number of applicants in each request body.
+        limit (int): Maximum number of distinct bodies to build.
+
+    Returns:
+        List[Dict[str, Any]]: Request bodies in the /predict layout.
+    """
+    if applicants_path:
+        records = itertools.islice(iter_json_records(applicants_path), limit * per_request)
+    else:
+        records = ((str(i), SAMPLE_APPLICANT) for i in range(limit * per_request))
+
+    payloads = []
+    for batch in iter(lambda: list(itertools.islice(records, per_request)), []):
+        payloads.append(dict(batch))
+    return payloads
+
+
+def send(url: str, body: bytes, timeout: float) -> Tuple[float, bool]:
+    start = time.perf_counter()
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def wait_until_ready(ready_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(ready_url, timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"API não ficou pronta em {timeout:.0f}s ({ready_url})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do /predict")
+    parser.add_argument("--url", default="http://localhost:5007/predict")
+    parser.add_argument("--ready-url", default=None, help="Padrão: <host>/ready")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--per-request", type=int, default=1, help="Candidatos por requisição")
+    parser.add_argument("--applicants", default=None, help="applicants.json bruto usado como payload")
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    ready_url = args.ready_url or args.url.rsplit("/predict", 1)[0] + "/ready"
+    wait_until_ready(ready_url, args.timeout)
+
+    bodies = [json.dumps(p).encode("utf-8") for p in build_payloads(args.applicants, args.per_request, args.requests)]
+    jobs = [bodies[i % len(bodies)] for i in range(args.requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(lambda body: send(args.url, body, args.timeout), jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for latency, _ in outcomes)
+    errors = sum(1 for _, ok in outcomes if not ok)
+
+    print(f"[LOAD TEST] {args.requests} requisições, concorrência {args.concurrency}, "
+          f"{args.per_request} candidato(s) por requisição")
+    print(f" - req/s: {args.requests / elapsed:.1f}")
+    print(f" - candidatos/s: {args.requests * args.per_request / elapsed:.1f}")
+    print(f" - latência p50: {percentile(latencies, 0.50):.1f} ms")
+    print(f" - latência p90: {percentile(latencies, 0.90):.1f} ms")
+    print(f" - latência p99: {percentile(latencies, 0.99):.1f} ms")
+    print(f" - erros: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import pytest
+from typing import Any, Dict
+
+
+def make_applicant(
+    sabendo: str = 'Site',
+    estado_civil: str = 'Casado',
+    certificacoes: str = 'AWS',
+    remuneracao: str = '5000',
+    nivel_profissional: str = 'Pleno',
+    nivel_academico: str = 'Mestrado Completo'
+) -> Dict[str, Any]:
+    """
+    Builds a raw applicant record in the applicants.json layout ({section: {field: value}}),
+    with only the fields used by the features.
+    """
+    return {
+        'infos_basicas': {'sabendo_de_nos_por': sabendo},
+        'informacoes_pessoais': {'estado_civil': estado_civil},
+        'informacoes_profissionais': {
+            'certificacoes': certificacoes,
+            'remuneracao': remuneracao,
+            'nivel_profissional': nivel_profissional,
+        },
+        'formacao_e_idiomas': {'nivel_academico': nivel_academico},
+        'cargo_atual': {},
+    }
+
+
+# Payload pequeno usado pelos testes das APIs
+API_PAYLOAD = {
+    '1': make_applicant('Site', 'Solteiro', '', 'R$115 p/h', 'Pleno'),
+    '2': make_applicant('Indicação de cliente', 'Casado', 'AWS, Azure', 'R$ 2.500,00 mensal', 'Sênior'),
+    '3': make_applicant('Indicação de colaborador', '', 'PMP', '22000', 'NA'),
+}
+
+
+@pytest.fixture(scope='session')
+def api_module(tmp_path_factory):
+    """
+    Imports api.app serving a small LightGBM artifact exported to a temporary directory.
+    """
+    from lightgbm import LGBMClassifier
+    from datathon_package.applicants import transform_applicants
+    from datathon_package.artifact import export_serving_artifact
+    from datathon_package.featurizer import ApplicantFeaturizer
+
+    payload = {str(i): API_PAYLOAD[str(i % 3 + 1)] for i in range(1, 31)}
+    X = transform_applicants(payload).drop(columns=['ID'])
+    featurizer = ApplicantFeaturizer().fit(X)
+    model = LGBMClassifier(n_estimators=5, min_child_samples=2, verbose=-1).fit(X, [i % 2 for i in range(len(X))])
+    artifact_dir = str(tmp_path_factory.mktemp('serving'))
+    export_serving_artifact(model, featurizer, artifact_dir)
+
+    # As variáveis só são lidas no import do módulo; depois voltam aos valores originais
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('SERVING_ARTIFACT_DIR', artifact_dir)
+        mp.setenv('MODEL_RELOAD_INTERVAL_SECONDS', '0')
+        import api.app
+    api.app.service.warm_up()
+    return api.app
@@ -0,0 +1,34 @@
+from concurrent.futures import Future
+from conftest import API_PAYLOAD
+
+
+def test_predict_returns_results(api_module):
+    response = api_module.app.test_client().post('/predict', json=API_PAYLOAD)
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['id'] for r in results] == ['1', '2', '3']
+    assert [r['applicant_id'] for r in results] == [0, 1, 2]
+
+
+def test_predict_orders_ids_numerically(api_module):
+    payload = {'10': API_PAYLOAD['1'], '2': API_PAYLOAD['2'], '9': API_PAYLOAD['3']}
+
+    results = api_module.app.test_client().post('/predict', json=payload).get_json()['results']
+
+    # applicant_id é a posição em ordem numérica de ID, como no pd.read_json
+    assert [(r['applicant_id'], r['id']) for r in results] == [(0, '2'), (1, '9'), (2, '10')]
+
+
+def test_predict_times_out_when_batcher_stalls(api_module, monkeypatch):
+    # Micro-batcher travado: o Future nunca é resolvido
+    monkeypatch.setattr(api_module, 'PREDICT_BATCH_WINDOW_MS', 5.0)
+    monkeypatch.setattr(api_module, 'PREDICT_TIMEOUT_SECONDS', 0.05)
+    monkeypatch.setattr(api_module.batcher, 'submit', lambda item: Future())
+    errors = api_module.ERRORS.value(endpoint='/predict')
+
+    response = api_module.app.test_client().post('/predict', json=API_PAYLOAD)
+
+    assert response.status_code == 504
+    assert api_module.ERRORS.value(endpoint='/predict') == errors + 1
+    assert api_module.REQUESTS.value(endpoint='/predict', status=504) >= 1
@@ -0,0 +1,94 @@
+import asyncio
+import json
+from concurrent.futures import Future
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from datathon_package.async_serving import BoundedExecutor
+from conftest import API_PAYLOAD
+
+
+@pytest.fixture
+def async_module(api_module, monkeypatch):
+    import api.async_app
+    # Pool novo por teste: o cleanup da aplicação desliga o executor
+    monkeypatch.setattr(api.async_app, 'executor', BoundedExecutor(max_workers=2, max_pending=8, timeout_seconds=5))
+    return api.async_app
+
+
+def _call(async_module, method, path, **kwargs):
+    async def run():
+        async with TestClient(TestServer(async_module.create_app())) as client:
+            response = await client.request(method, path, **kwargs)
+            return response.status, response.headers, await response.json()
+    return asyncio.run(run())
+
+
+def test_predict_matches_flask(async_module, api_module):
+    status, _, body = _call(async_module, 'POST', '/predict', json=API_PAYLOAD)
+
+    assert status == 200
+    assert body == api_module.app.test_client().post('/predict', json=API_PAYLOAD).get_json()
+    assert [r['id'] for r in body['results']] == ['1', '2', '3']
+
+
+def test_batch_accepts_list_of_payloads(async_module):
+    status, _, body = _call(async_module, 'POST', '/predict/batch', json=[API_PAYLOAD, {'9': API_PAYLOAD['2']}])
+
+    assert status == 200
+    assert [len(results) for results in body['results']] == [3, 1]
+
+
+@pytest.mark.parametrize('path, payload', [('/predict', {}), ('/predict', []), ('/predict/batch', [{}])])
+def test_invalid_payload_returns_400(async_module, api_module, path, payload):
+    status, _, body = _call(async_module, 'POST', path, json=payload)
+
+    assert status == 400 == api_module.app.test_client().post(path, json=payload).status_code
+    assert body == {'error': 'Formato de JSON inválido'}
+
+
+@pytest.mark.parametrize('data, content_type', [
+    ('{"1": ', 'application/json'),
+    ('', 'application/json'),
+    (json.dumps(API_PAYLOAD), 'text/plain'),
+])
+def test_unparseable_body_returns_500_like_flask(async_module, api_module, data, content_type):
+    headers = {'Content-Type': content_type}
+    status, _, body = _call(async_module, 'POST', '/predict', data=data, headers=headers)
+    flask = api_module.app.test_client().post('/predict', data=data, headers=headers)
+
+    assert status == 500 == flask.status_code
+    assert body['error'] == flask.get_json()['error']
+    assert 'trace' in body
+
+
+def test_full_queue_returns_429(async_module, monkeypatch):
+    monkeypatch.setattr(async_module, 'executor', BoundedExecutor(max_workers=1, max_pending=0))
+    errors = async_module.ERRORS.value(endpoint='/predict')
+
+    status, headers, body = _call(async_module, 'POST', '/predict', json=API_PAYLOAD)
+
+    assert status == 429
+    assert headers['Retry-After'] == '1'
+    assert async_module.ERRORS.value(endpoint='/predict') == errors + 1
+
+
+def test_slow_prediction_returns_504(async_module, monkeypatch):
+    monkeypatch.setattr(async_module, 'executor', BoundedExecutor(max_workers=1, timeout_seconds=0.05))
+    monkeypatch.setattr(async_module, 'PREDICT_BATCH_WINDOW_MS', 5.0)
+    monkeypatch.setattr(async_module, 'PREDICT_TIMEOUT_SECONDS', 0.5)
+    monkeypatch.setattr(async_module, 'SERVER_TIMING_HEADERS', True)
+    monkeypatch.setattr(async_module.batcher, 'submit', lambda item: Future())
+
+    status, headers, body = _call(async_module, 'POST', '/predict', json=API_PAYLOAD)
+
+    assert status == 504
+    assert body == {'error': 'Tempo limite da predição excedido.'}
+    assert 'total;dur=' in headers['Server-Timing']
+
+
+@pytest.mark.parametrize('path', ['/model', '/cache/stats'])
+def test_status_routes_match_flask(async_module, api_module, path):
+    status, _, body = _call(async_module, 'GET', path)
+
+    assert status == 200
+    assert body.keys() == api_module.app.test_client().get(path).get_json().keys()
@@ -0,0 +1,59 @@
+import json
+import pandas as pd
+import pandas.testing as pdt
+from datathon_package import applicants
+from datathon_package.applicants import transform_applicants
+from conftest import make_applicant
+
+
+def test_transform_applicants_from_dict():
+    # Payload decodificado, no mesmo formato do applicants.json
+    payload = {
+        '10': make_applicant('Site', 'Casado', 'AWS, Azure', 'R$ 2.500,00 mensal', 'Sênior', ''),
+        '2': make_applicant('Indicação de cliente', 'Solteiro', '', 'R$115 p/h', 'Pleno', 'Mestrado Completo'),
+    }
+
+    result_df = transform_applicants(payload)
+
+    # Linhas ordenadas por ID numérico (como no pd.read_json) e alinhadas com as respectivas features
+    assert result_df['ID'].tolist() == [2, 10]
+    assert result_df['ind_outros'].tolist() == [0, 1]
+    assert result_df['ind_cliente'].tolist() == [1, 0]
+    assert result_df['estado_civil_casado'].tolist() == [0, 1]
+    assert result_df['nivel_academico_nivel_academico_vazio'].tolist() == [0, 1]
+    assert result_df['nivel_profissional_sênior'].tolist() == [0, 1]
+    assert result_df['certificacoes_count'].tolist() == [0, 2]
+    assert result_df['horista_100_300'].tolist() == [1, 0]
+    assert result_df['mensalista1000_5000'].tolist() == [0, 1]
+
+
+def test_transform_applicants_dict_matches_dataframe():
+    payload = {
+        '10': make_applicant('Indicação de colaborador', '', 'PMP', '5000', 'Analista', 'Doutorado Completo'),
+        '11': make_applicant('', 'Viúvo', '', '', 'NA', 'Ensino Médio Completo'),
+    }
+
+    from_dict = transform_applicants(payload)
+    from_frame = transform_applicants(pd.DataFrame.from_dict(payload))
+
+    pdt.assert_frame_equal(from_dict, from_frame)
+
+
+def test_process_applicants_data_chunked_matches_full(tmp_path, monkeypatch):
+    # Sem Postgres nos testes
+    monkeypatch.setattr(applicants, 'ingest_dataframe_to_postgres', lambda *args, **kwargs: None)
+
+    payload = {
+        '3': make_applicant('Site', 'Casado', 'AWS', '350', 'Pleno', 'Mestrado Completo'),
+        '1': make_applicant('Indicação de cliente', '', '', '', 'Sênior', ''),
+        '2': make_applicant('', 'Solteiro', 'PMP, ITIL', '9000', 'Júnior', 'Doutorado Completo'),
+    }
+    path = tmp_path / "applicants.json"
+    path.write_text(json.dumps(payload))
+
+    full_df = applicants.process_applicants_data(str(path))
+    chunked_df = applicants.process_applicants_data(str(path), chunksize=2)
+
+    # Lotes com níveis profissionais diferentes geram as mesmas colunas
+    assert set(chunked_df.columns) == set(full_df.columns)
+    pdt.assert_frame_equal(chunked_df[full_df.columns], full_df.reset_index(drop=True))
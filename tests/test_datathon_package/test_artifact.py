@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from datathon_package.artifact import (
+    BOOSTER_FILE,
+    export_serving_artifact,
+    load_serving_artifact,
+)
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.serving import ModelStore, PredictionService
+
+
+def _fit_model(seed=0, n_estimators=20):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.integers(0, 2, size=(200, 4)), columns=['ind_site', 'casado', 'certificacoes_count', 'pmp'])
+    y = (X['ind_site'] + rng.random(200) > 1).astype(int)
+    featurizer = ApplicantFeaturizer().fit(X)
+    model = LGBMClassifier(n_estimators=n_estimators, min_child_samples=5, verbose=-1, random_state=seed).fit(X, y)
+    return model, featurizer, X
+
+
+def test_artifact_round_trip_matches_model(tmp_path):
+    model, featurizer, X = _fit_model()
+
+    metadata = export_serving_artifact(model, featurizer, str(tmp_path))
+    artifact = load_serving_artifact(str(tmp_path))
+
+    assert artifact.featurizer.feature_names_ == featurizer.feature_names_
+    assert artifact.metadata == metadata
+    assert artifact.model.classes_.tolist() == [0, 1]
+    np.testing.assert_allclose(artifact.model.predict_proba(X), model.predict_proba(X), atol=1e-12)
+
+
+def test_artifact_with_wrong_checksum_is_rejected(tmp_path):
+    model, featurizer, _ = _fit_model()
+    export_serving_artifact(model, featurizer, str(tmp_path))
+
+    with open(os.path.join(tmp_path, BOOSTER_FILE), "a") as f:
+        f.write("\n")
+
+    with pytest.raises(ValueError):
+        load_serving_artifact(str(tmp_path))
+
+
+def test_model_store_loads_lazily_and_reloads_new_artifact(tmp_path):
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return load_serving_artifact(path)
+
+    model, featurizer, X = _fit_model(seed=0)
+    export_serving_artifact(model, featurizer, str(tmp_path))
+    store = ModelStore(str(tmp_path), check_interval=3600, loader=loader)
+    service = PredictionService(store=store)
+    assert loads == []
+
+    first = store.get()
+    assert store.get() is first
+    assert len(loads) == 1
+
+    # Um novo artefato no mesmo diretório é carregado sem recriar o serviço
+    new_model, new_featurizer, _ = _fit_model(seed=1, n_estimators=5)
+    metadata = export_serving_artifact(new_model, new_featurizer, str(tmp_path))
+    os.utime(os.path.join(tmp_path, "metadata.json"), ns=(0, 10 ** 18))
+    store._next_check = 0.0
+
+    _, probabilities = service.score(X.to_numpy(dtype=np.float32))
+    assert store.version == metadata["checksum"][:16]
+    assert store.reloads == 1
+    np.testing.assert_allclose(probabilities, new_model.predict_proba(X)[:, 1], atol=1e-6)
+
+
+def test_model_store_keeps_current_artifact_when_reload_fails(tmp_path):
+    model, featurizer, _ = _fit_model()
+    export_serving_artifact(model, featurizer, str(tmp_path))
+    store = ModelStore(str(tmp_path), check_interval=3600)
+    version = store.get().version
+
+    with open(os.path.join(tmp_path, BOOSTER_FILE), "a") as f:
+        f.write("\n")
+    os.utime(os.path.join(tmp_path, "metadata.json"), ns=(0, 10 ** 18))
+    store._next_check = 0.0
+
+    assert store.get().version == version
+    assert store.reloads == 0
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import pytest
+from datathon_package.async_serving import BoundedExecutor, QueueFullError
+
+
+def test_bounded_executor_runs_off_the_event_loop():
+    executor = BoundedExecutor(max_workers=2, max_pending=4)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        results = await asyncio.gather(*(executor.run(lambda x: (x * 2, threading.get_ident()), i) for i in range(4)))
+        return loop_thread, results
+
+    loop_thread, results = asyncio.run(main())
+
+    assert [value for value, _ in results] == [0, 2, 4, 6]
+    assert all(thread != loop_thread for _, thread in results)
+    assert executor.pending == 0
+
+
+def test_bounded_executor_rejects_when_full():
+    executor = BoundedExecutor(max_workers=1, max_pending=1, timeout_seconds=5)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        # A segunda chamada passa do limite sem entrar na fila
+        with pytest.raises(QueueFullError):
+            await executor.run(lambda: None)
+        release.set()
+        await running
+        # Com a fila livre volta a aceitar
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    assert executor.rejected == 1
+    assert executor.pending == 0
+
+
+def test_bounded_executor_times_out_and_keeps_slot_until_call_ends():
+    executor = BoundedExecutor(max_workers=1, max_pending=2, timeout_seconds=0.05)
+    release = threading.Event()
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(release.wait)
+        # A chamada ainda roda na thread e continua contando na fila
+        pending_after_timeout = executor.pending
+        release.set()
+        await asyncio.sleep(0.05)
+        return pending_after_timeout
+
+    assert asyncio.run(main()) == 1
+    assert executor.timeouts == 1
+    assert executor.pending == 0
@@ -0,0 +1,120 @@
+from datathon_package import cache as cache_module
+from datathon_package.applicants import flatten_applicant_record
+from datathon_package.cache import (
+    applicant_cache_key,
+    file_checksum,
+    LocalCacheBackend,
+    RedisCacheBackend,
+    PredictionCache
+)
+
+RECORD = {
+    'infos_basicas': {'sabendo_de_nos_por': 'Site', 'nome': 'Fulano'},
+    'informacoes_profissionais': {'certificacoes': 'PMP', 'remuneracao': '8.000,00'},
+}
+
+
+def test_cache_key_ignores_unused_fields_order_and_id():
+    reordered = {
+        'informacoes_profissionais': {'remuneracao': '8.000,00', 'certificacoes': 'PMP'},
+        'infos_basicas': {'sabendo_de_nos_por': 'Site', 'nome': 'Beltrano'},
+    }
+    key = applicant_cache_key(flatten_applicant_record('1', RECORD), 'v1')
+
+    assert key == applicant_cache_key(flatten_applicant_record('2', reordered), 'v1')
+    assert key != applicant_cache_key(flatten_applicant_record('1', RECORD), 'v2')
+    changed = {**RECORD, 'informacoes_profissionais': {'certificacoes': 'PMP, ITIL', 'remuneracao': '8.000,00'}}
+    assert key != applicant_cache_key(flatten_applicant_record('1', changed), 'v1')
+
+
+def test_file_checksum_changes_with_content(tmp_path):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(b'modelo-1')
+    first = file_checksum(str(path))
+    path.write_bytes(b'modelo-2')
+
+    assert first != file_checksum(str(path))
+
+
+def test_local_backend_evicts_least_recently_used():
+    backend = LocalCacheBackend(max_entries=2, ttl_seconds=None)
+    backend.set_many({'a': 1, 'b': 2})
+    backend.get_many(['a'])
+    backend.set_many({'c': 3})
+
+    assert backend.get_many(['a', 'b', 'c']) == [1, None, 3]
+    assert len(backend) == 2
+
+
+def test_local_backend_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    backend = LocalCacheBackend(max_entries=10, ttl_seconds=60)
+    backend.set_many({'a': 1})
+
+    now[0] += 59
+    assert backend.get_many(['a']) == [1]
+    now[0] += 2
+    assert backend.get_many(['a']) == [None]
+    assert len(backend) == 0
+
+
+class FakeRedis:
+    """Stand-in em memória com a parte da API do redis-py usada pelo backend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode('utf-8')
+
+    def execute(self):
+        pass
+
+
+def test_prediction_cache_counts_hits_and_misses_with_shared_backend():
+    client = FakeRedis()
+    rows = [flatten_applicant_record('1', RECORD), flatten_applicant_record('2', {})]
+    cache = PredictionCache(RedisCacheBackend(client=client), model_version='v1')
+
+    assert cache.get_many(rows) == [None, None]
+    cache.set_many(rows, [(1, 0.9), (0, 0.1)])
+
+    # Outro worker com o mesmo backend compartilhado
+    other = PredictionCache(RedisCacheBackend(client=client), model_version='v1')
+    assert other.get_many(rows) == [(1, 0.9), (0, 0.1)]
+    assert PredictionCache(RedisCacheBackend(client=client), model_version='v2').get_many(rows) == [None, None]
+
+    assert cache.stats()['misses'] == 2
+    assert other.stats()['hits'] == 2
+    assert other.stats()['hit_rate'] == 1.0
+
+
+class BrokenRedis:
+    """Cliente que falha como um Redis fora do ar."""
+
+    def mget(self, keys):
+        raise ConnectionError('Redis indisponível')
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError('Redis indisponível')
+
+
+def test_redis_errors_become_misses_and_are_counted():
+    errors = []
+    backend = RedisCacheBackend(client=BrokenRedis(), error_observer=lambda op, e: errors.append(op))
+    cache = PredictionCache(backend, model_version='v1')
+    rows = [flatten_applicant_record('1', RECORD), flatten_applicant_record('2', {})]
+
+    assert cache.get_many(rows) == [None, None]
+    cache.set_many(rows, [(1, 0.9), (0, 0.1)])
+
+    assert errors == ['get', 'set']
+    stats = cache.stats()
+    assert stats['errors'] == 2 and stats['misses'] == 2
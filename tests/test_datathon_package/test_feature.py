@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+from datathon_package.feature import (
+    generate_flags_and_category_column,
+    process_salary_column,
+    extract_salary_values,
+    process_certification_column
+)
+
+
+def test_generate_flags_and_category_column():
+    # DataFrame de entrada com valores mapeados, não mapeados e nulos
+    input_df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'origem': ['Indicação de cliente', 'Site', None, 'Indicação de colaborador']
+    })
+    mapping = {
+        'Indicação de colaborador': 'ind_colaborador',
+        'Indicação de cliente': 'ind_cliente'
+    }
+
+    # Esperado: flags uint8 na ordem do mapping, seguidas da coluna default
+    expected_df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'ind_colaborador': np.array([0, 0, 0, 1], dtype=np.uint8),
+        'ind_cliente': np.array([1, 0, 0, 0], dtype=np.uint8),
+        'ind_outros': np.array([0, 1, 1, 0], dtype=np.uint8),
+    })
+
+    result_df = generate_flags_and_category_column(input_df, 'origem', mapping, default_flag_column='ind_outros')
+
+    pdt.assert_frame_equal(result_df, expected_df)
+    # O DataFrame original não é alterado
+    assert 'origem' in input_df.columns
+
+
+def test_generate_flags_and_category_column_without_default():
+    input_df = pd.DataFrame({'estado_civil': ['', 'Casado', 'Outro']}, index=[10, 20, 30])
+    mapping = {'': 'estado_civil_vazio', 'Casado': 'estado_civil_casado'}
+
+    expected_df = pd.DataFrame({
+        'estado_civil_vazio': np.array([1, 0, 0], dtype=np.uint8),
+        'estado_civil_casado': np.array([0, 1, 0], dtype=np.uint8),
+    }, index=[10, 20, 30])
+
+    result_df = generate_flags_and_category_column(input_df, 'estado_civil', mapping)
+
+    pdt.assert_frame_equal(result_df, expected_df)
+
+
+def test_process_salary_column():
+    # Formatos mistos de remuneração, incluindo vazios e nulos
+    input_df = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6, 7, 8],
+        'remuneracao': ['', None, 'R$115 p/h', '350', 'R$ 2.500,00 mensal', '8.000,00', '17000', '22000 mensais']
+    })
+
+    flag_columns = [
+        'horista0_100', 'horista_100_300', 'horista300_500', 'horista500_1000',
+        'mensalista1000_5000', 'mensalista_5000_10000', 'mensalista_10k_15k', 'mensalista20k_mais'
+    ]
+    # Posição da faixa de cada linha (None para a faixa 15k-20k, que não tem coluna)
+    expected_bins = [0, 0, 1, 2, 4, 5, None, 7]
+    expected_flags = np.zeros((8, len(flag_columns)), dtype=np.uint8)
+    for row, position in enumerate(expected_bins):
+        if position is not None:
+            expected_flags[row, position] = 1
+
+    expected_df = pd.concat([
+        pd.DataFrame({'id': [1, 2, 3, 4, 5, 6, 7, 8]}),
+        pd.DataFrame(expected_flags, columns=flag_columns)
+    ], axis=1)
+
+    result_df = process_salary_column(input_df, 'remuneracao')
+
+    pdt.assert_frame_equal(result_df, expected_df)
+
+
+def test_extract_salary_values():
+    series = pd.Series(['R$ 1.000.000,00', '0,50', 'abc', '0', 99, 2500.0])
+
+    result = extract_salary_values(series)
+
+    # Valores não textuais passam por str(), como no parser original ('2500.0' -> 25000)
+    np.testing.assert_array_equal(result, [1000000.0, 0.5, 0.0, 0.0, 99.0, 25000.0])
+
+
+CERTIFICACOES = [
+    'AWS, Azure', '', None, np.nan, '  ', 'PMP', 'A, ,B', ',A,', ' , ',
+    'A,,B,C,D,E', 'ITIL\t,\nScrum', 'A,B,C,D', 'nan', 5,
+]
+
+
+def _legacy_certification_counts(values):
+    def count(val):
+        if pd.isna(val) or str(val).strip() == '':
+            return 0
+        return len([x for x in str(val).split(',') if x.strip() != ''])
+    return [count(v) for v in values]
+
+
+def test_process_certification_column_matches_split_count():
+    input_df = pd.DataFrame({'id': range(len(CERTIFICACOES)), 'cert': pd.Series(CERTIFICACOES, dtype=object)})
+
+    result = process_certification_column(input_df, 'cert')
+
+    counts = _legacy_certification_counts(CERTIFICACOES)
+    assert list(result.columns) == [
+        'id', 'certificacoes_count', 'certificacoes_0', 'certificacoes_1_3', 'certificacoes_5_mais'
+    ]
+    assert result['certificacoes_count'].tolist() == counts
+    assert result['certificacoes_0'].tolist() == [int(c == 0) for c in counts]
+    assert result['certificacoes_1_3'].tolist() == [int(1 <= c <= 3) for c in counts]
+    assert result['certificacoes_5_mais'].tolist() == [int(c >= 5) for c in counts]
+    assert 'cert' in input_df.columns
+
+
+def test_process_certification_column_inplace():
+    input_df = pd.DataFrame({'cert': pd.Series(CERTIFICACOES, dtype=object)})
+    expected = process_certification_column(input_df, 'cert')
+
+    result = process_certification_column(input_df, 'cert', inplace=True)
+
+    assert result is input_df
+    pdt.assert_frame_equal(result, expected)
+
@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from datathon_package.feature_store import (
+    dataset_cache_path,
+    feature_store_exists,
+    feature_store_is_stale,
+    load_feature_store,
+    load_lgb_dataset,
+    write_feature_store,
+)
+from datathon_package.model_selection import booster_params, fit_lgbm_on_dataset, prepare_training_data
+
+
+def _master(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'ID': pd.array(np.arange(n_rows), dtype='Int32'),
+        'ind_site': rng.integers(0, 2, n_rows).astype(np.uint8),
+        'casado': rng.integers(0, 2, n_rows).astype(np.uint8),
+        'certificacoes_count': rng.integers(0, 6, n_rows).astype(np.uint16),
+        'prospect_codigo': pd.array(np.arange(n_rows), dtype='Int32'),
+    })
+    df['target'] = ((df['ind_site'] + rng.random(n_rows)) > 1).astype(float)
+    return df
+
+
+def test_feature_store_round_trip(tmp_path):
+    df = _master()
+    df.loc[[3, 7], 'target'] = np.nan
+
+    metadata = write_feature_store(df, str(tmp_path))
+    store = load_feature_store(str(tmp_path))
+
+    labeled = df.dropna(subset=['target'])
+    assert feature_store_exists(str(tmp_path))
+    assert store.feature_names == ['ind_site', 'casado', 'certificacoes_count'] == metadata['feature_names']
+    assert isinstance(store.X, np.memmap) and store.X.dtype == np.float32
+    np.testing.assert_array_equal(store.X, labeled[store.feature_names].to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(store.y, labeled['target'].to_numpy().astype(np.uint8))
+
+    # O DataFrame compartilha a memória mapeada
+    frame = store.frame()
+    assert np.shares_memory(frame.to_numpy(), store.X)
+    assert list(frame.columns) == store.feature_names
+
+
+def test_feature_store_rejects_mismatched_layout(tmp_path):
+    write_feature_store(_master(), str(tmp_path))
+    np.save(os.path.join(tmp_path, 'target.npy'), np.zeros(5, dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        load_feature_store(str(tmp_path))
+
+
+
+def test_feature_store_is_stale_when_master_table_is_newer(tmp_path):
+    store_dir = str(tmp_path / 'store')
+    master_path = str(tmp_path / 'master_table.parquet')
+    write_feature_store(_master(), store_dir)
+
+    assert not feature_store_is_stale(store_dir, master_path)
+    _master().to_parquet(master_path)
+    columns_mtime = os.path.getmtime(os.path.join(store_dir, 'columns.json'))
+    os.utime(master_path, (columns_mtime + 10, columns_mtime + 10))
+
+    assert feature_store_is_stale(store_dir, master_path)
+
+def test_lgb_dataset_is_cached_per_binning_params(tmp_path):
+    write_feature_store(_master(), str(tmp_path))
+    store = load_feature_store(str(tmp_path))
+
+    first = load_lgb_dataset(store, {'max_bin': 63, 'learning_rate': 0.1})
+    assert os.path.exists(dataset_cache_path(store, {'max_bin': 63}))
+    cached = load_lgb_dataset(store, {'max_bin': 63, 'learning_rate': 0.05})
+
+    np.testing.assert_array_equal(cached.get_label(), first.get_label())
+    assert cached.get_feature_name() == store.feature_names
+    # Parâmetros que mudam o binning têm outro arquivo; os demais não
+    assert dataset_cache_path(store, {'max_bin': 31}) != dataset_cache_path(store, {'max_bin': 63})
+    assert dataset_cache_path(store, {'learning_rate': 0.5}) == dataset_cache_path(store)
+
+
+
+def test_rewriting_store_removes_stale_lgb_datasets(tmp_path):
+    write_feature_store(_master(), str(tmp_path))
+    old = load_feature_store(str(tmp_path))
+    load_lgb_dataset(old, {'max_bin': 63})
+    load_lgb_dataset(old, {'max_bin': 31})
+
+    write_feature_store(_master(seed=1), str(tmp_path))
+    new = load_feature_store(str(tmp_path))
+    load_lgb_dataset(new, {'max_bin': 63})
+
+    cached = sorted(f for f in os.listdir(tmp_path) if f.endswith('.bin'))
+    assert cached == [os.path.basename(dataset_cache_path(new, {'max_bin': 63}))]
+
+@pytest.mark.parametrize('resampling', ['none', 'random', 'class_weight'])
+def test_fit_on_cached_dataset_matches_sklearn_fit(tmp_path, resampling):
+    write_feature_store(_master(), str(tmp_path))
+    store = load_feature_store(str(tmp_path))
+    X, y = store.frame(), pd.Series(store.y).astype(int)
+
+    params = dict(n_estimators=20, min_child_samples=5, verbose=-1, random_state=0)
+    expected, X_train, y_train, fit_kwargs = prepare_training_data(LGBMClassifier(**params), X, y, resampling)
+    expected.fit(X_train, y_train, **fit_kwargs)
+
+    model, _, _, fit_kwargs = prepare_training_data(LGBMClassifier(**params), X, y, resampling)
+    # Segunda chamada lê o Dataset do cache binário
+    load_lgb_dataset(store, booster_params(model))
+    dataset = load_lgb_dataset(store, booster_params(model))
+    fitted = fit_lgbm_on_dataset(model, dataset, fit_kwargs.get('sample_weight'))
+
+    assert fitted.classes_.tolist() == [0, 1]
+    np.testing.assert_allclose(fitted.predict_proba(X), expected.predict_proba(X), atol=1e-10)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datathon_package.applicants import transform_applicants
+from datathon_package.featurizer import ApplicantFeaturizer
+from conftest import make_applicant
+
+
+TRAIN_PAYLOAD = {
+    '1': make_applicant('Indicação de cliente', 'Solteiro', '', 'R$115 p/h', 'Pleno', 'Mestrado Completo'),
+    '2': make_applicant('Site', 'Casado', 'AWS, Azure', 'R$ 2.500,00 mensal', 'Sênior', ''),
+    '3': make_applicant('Indicação de colaborador', '', 'PMP', '22000', 'NA', 'Doutorado Completo'),
+}
+
+
+def test_featurizer_matches_batch_features():
+    train_df = transform_applicants(TRAIN_PAYLOAD)
+    featurizer = ApplicantFeaturizer().fit(train_df)
+
+    result = featurizer.transform(TRAIN_PAYLOAD)
+
+    # Mesmas colunas (sem ID) e mesmos valores do pipeline em lote
+    assert 'ID' not in featurizer.feature_names_
+    expected = train_df.set_index('ID')[featurizer.feature_names_].astype(np.float32)
+    pd.testing.assert_frame_equal(result, expected, check_names=False)
+
+
+def test_featurizer_single_row_keeps_training_columns():
+    featurizer = ApplicantFeaturizer().fit(transform_applicants(TRAIN_PAYLOAD))
+
+    # Uma única linha, com nível profissional desconhecido no treino
+    result = featurizer.transform({'9': make_applicant('Site', 'Viúvo', '', '', 'Gerente', '')})
+
+    assert list(result.columns) == featurizer.feature_names_
+    assert result.index.tolist() == [9]
+    row = result.iloc[0]
+    assert row['ind_outros'] == 1
+    assert row['estado_civil_viúvo'] == 1
+    assert row['nivel_academico_nivel_academico_vazio'] == 1
+    assert row.filter(like='nivel_profissional_').sum() == 0
+
+
+def test_featurizer_requires_fit():
+    with pytest.raises(ValueError):
+        ApplicantFeaturizer().transform(TRAIN_PAYLOAD)
@@ -0,0 +1,186 @@
+import json
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+from datathon_package import generate_master_table as gmt
+from datathon_package import applicants, prospects, utils
+from datathon_package.feature_store import load_feature_store
+from datathon_package.profiling import StageProfiler
+from conftest import make_applicant
+
+
+def _vaga(*prospects_list):
+    return {
+        'titulo': 'Vaga',
+        'modalidade': '',
+        'prospects': [{'codigo': codigo, 'situacao_candidado': situacao} for codigo, situacao in prospects_list],
+    }
+
+
+@pytest.fixture
+def postgres_calls(monkeypatch):
+    # Registra as chamadas ao PostgreSQL em vez de conectar
+    calls = []
+    monkeypatch.setattr(gmt, 'ingest_dataframe_to_postgres', lambda df, local, table_name, if_exists='replace': calls.append(('replace', table_name, len(df))))
+    monkeypatch.setattr(gmt, 'upsert_dataframe_to_postgres', lambda df, local, table_name, key_column, keys: calls.append(('upsert', table_name, sorted(keys))))
+    monkeypatch.setattr(applicants, 'ingest_dataframe_to_postgres', lambda *args, **kwargs: None)
+    monkeypatch.setattr(prospects, 'ingest_dataframe_to_postgres', lambda *args, **kwargs: None)
+    # Ingestões do PostgresWriter (build completo)
+    monkeypatch.setattr(utils, 'ingest_dataframe_to_postgres', lambda df, local, table_name, if_exists='replace': calls.append(('replace', table_name, len(df))))
+    return calls
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload))
+    return str(path)
+
+
+def test_incremental_master_table_matches_full_build(tmp_path, postgres_calls):
+    applicants_payload = {
+        '1': make_applicant(nivel_profissional='Pleno', remuneracao='5000'),
+        '2': make_applicant(nivel_profissional='Sênior', remuneracao='350'),
+        '3': make_applicant(nivel_profissional='Júnior', remuneracao='22000'),
+    }
+    prospects_payload = {
+        '100': _vaga(('1', 'Aprovado'), ('2', 'Recusado')),
+        '200': _vaga(('3', 'Desistiu'), ('1', 'Não Aprovado pelo RH')),
+    }
+    applicants_path = _write(tmp_path / 'applicants.json', applicants_payload)
+    prospects_path = _write(tmp_path / 'prospects.json', prospects_payload)
+    output_path = str(tmp_path / 'master_table.parquet')
+
+    # Primeira execução: processa tudo e substitui as tabelas
+    gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+    assert {call[0] for call in postgres_calls} == {'replace'}
+
+    # Altera um candidato e uma vaga
+    applicants_payload['2'] = make_applicant(nivel_profissional='Sênior', remuneracao='R$ 400')
+    prospects_payload['200'] = _vaga(('3', 'Contratado pela Decision'))
+    _write(tmp_path / 'applicants.json', applicants_payload)
+    _write(tmp_path / 'prospects.json', prospects_payload)
+    postgres_calls.clear()
+
+    incremental_df = gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+
+    # Só as chaves afetadas vão para o PostgreSQL
+    assert ('upsert', 'applicants', [2]) in postgres_calls
+    assert ('upsert', 'propects', [1, 3]) in postgres_calls
+    assert ('upsert', 'master_table', [1, 2, 3]) in postgres_calls
+
+    full_df = gmt.generate_master_table(applicants_path, prospects_path, str(tmp_path / 'full.parquet'))
+
+    sort_keys = ['ID', 'target']
+    pdt.assert_frame_equal(
+        incremental_df.sort_values(sort_keys).reset_index(drop=True),
+        full_df[incremental_df.columns].sort_values(sort_keys).reset_index(drop=True)
+    )
+
+
+def test_incremental_master_table_without_changes(tmp_path, postgres_calls):
+    applicants_path = _write(tmp_path / 'applicants.json', {
+        '1': make_applicant(nivel_profissional='Pleno', remuneracao='5000'),
+        '2': make_applicant(nivel_profissional='Sênior', remuneracao='350'),
+    })
+    prospects_path = _write(tmp_path / 'prospects.json', {'100': _vaga(('1', 'Aprovado'), ('2', 'Recusado'))})
+    output_path = str(tmp_path / 'master_table.parquet')
+
+    first_df = gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+    postgres_calls.clear()
+    second_df = gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+
+    # Nada mudou: nenhuma escrita no PostgreSQL
+    assert postgres_calls == []
+    pdt.assert_frame_equal(first_df, second_df)
+
+
+def test_incremental_master_table_first_run_without_applicants(tmp_path, postgres_calls):
+    applicants_path = _write(tmp_path / 'applicants.json', {})
+    prospects_path = _write(tmp_path / 'prospects.json', {'100': _vaga(('1', 'Aprovado'), ('2', 'Recusado'))})
+    output_path = str(tmp_path / 'master_table.parquet')
+
+    # Sem candidatos: master table vazia, com as colunas de ID e target
+    empty_df = gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+    assert len(empty_df) == 0
+    assert {'ID', 'prospect_codigo', 'target'} <= set(empty_df.columns)
+
+    _write(tmp_path / 'applicants.json', {
+        '1': make_applicant(nivel_profissional='Pleno', remuneracao='5000'),
+        '2': make_applicant(nivel_profissional='Sênior', remuneracao='350'),
+    })
+    incremental_df = gmt.generate_master_table(applicants_path, prospects_path, output_path, incremental=True)
+    full_df = gmt.generate_master_table(applicants_path, prospects_path, str(tmp_path / 'full.parquet'))
+
+    pdt.assert_frame_equal(
+        incremental_df.sort_values('ID').reset_index(drop=True),
+        full_df[incremental_df.columns].sort_values('ID').reset_index(drop=True)
+    )
+
+
+def test_parallel_master_table_matches_sequential(tmp_path, postgres_calls):
+    applicants_path = _write(tmp_path / 'applicants.json', {
+        str(i): make_applicant(
+            nivel_profissional=['Pleno', 'Sênior', 'Júnior'][i % 3], remuneracao=['350', '5000', '22000'][i % 3]
+        )
+        for i in range(1, 31)
+    })
+    prospects_path = _write(tmp_path / 'prospects.json', {
+        str(100 + v): _vaga(*[(str(i), ['Aprovado', 'Recusado'][(i // 4) % 2]) for i in range(1 + v, 31, 4)])
+        for v in range(4)
+    })
+
+    sequential_df = gmt.generate_master_table(applicants_path, prospects_path, str(tmp_path / 'seq.parquet'))
+    profiler = StageProfiler('bootstrap')
+    parallel_df = gmt.generate_master_table(
+        applicants_path, prospects_path, str(tmp_path / 'par.parquet'), n_jobs=2, n_partitions=2, profiler=profiler
+    )
+
+    # Mesmas linhas; as três tabelas foram gravadas pelo writer em background
+    sort_keys = ['ID', 'target']
+    pdt.assert_frame_equal(
+        parallel_df[sequential_df.columns].sort_values(sort_keys).reset_index(drop=True),
+        sequential_df.sort_values(sort_keys).reset_index(drop=True)
+    )
+    assert [call[1] for call in postgres_calls[-3:]] == ['applicants', 'propects', 'master_table']
+    assert {'applicants', 'prospects', 'merge', 'parquet', 'total'} <= set(parallel_df.attrs['timings'])
+    # Registros dos processos filhos entram no mesmo relatório
+    stages = {record['stage'] for record in profiler.records()}
+    assert {'applicants', 'applicants/read_json', 'prospects/transpose', 'merge', 'postgres_master_table'} <= stages
+
+
+def test_master_table_writes_feature_store(tmp_path, postgres_calls):
+    applicants_path = _write(tmp_path / 'applicants.json', {
+        '1': make_applicant(nivel_profissional='Pleno', remuneracao='5000'),
+        '2': make_applicant(nivel_profissional='Sênior', remuneracao='350'),
+    })
+    prospects_path = _write(tmp_path / 'prospects.json', {'100': _vaga(('1', 'Aprovado'), ('2', 'Recusado'))})
+    store_dir = str(tmp_path / 'feature_store')
+
+    df_master = gmt.generate_master_table(
+        applicants_path, prospects_path, str(tmp_path / 'master_table.parquet'), feature_store_dir=store_dir
+    )
+    store = load_feature_store(store_dir)
+
+    labeled = df_master.dropna(subset=['target'])
+    assert store.feature_names == [col for col in df_master.columns if col not in ('ID', 'prospect_codigo', 'target')]
+    assert store.X.shape == (len(labeled), len(store.feature_names))
+    assert 'feature_store' in df_master.attrs['timings']
+
+
+def test_merge_master_table_matches_pandas_merge(monkeypatch):
+    monkeypatch.setattr(gmt, 'drop_constant_binary_columns', lambda df: df)
+    df_applicants = pd.DataFrame({'ID': [1, 2, 3, 5], 'pmp': [1, 0, 1, 0], 'salario': [5000.0, 1.0, 0.0, 7.5]})
+    df_prospects = pd.DataFrame({
+        'prospect_codigo': ['3', '1', 'abc', '3', '4', '5'],
+        'prospect_situacao_candidado': ['Aprovado'] * 6,
+        'target': pd.Series([1, 0, 1, 0, 1, 1], dtype='uint8'),
+    })
+
+    result = gmt.merge_master_table(df_applicants, df_prospects, applicants_sorted=True)
+
+    # Mesmo resultado do merge com IDs Int64
+    expected = pd.merge(
+        df_applicants,
+        df_prospects.assign(prospect_codigo=pd.to_numeric(df_prospects['prospect_codigo'], errors='coerce').astype('Int64')).dropna(subset=['prospect_codigo']),
+        left_on='ID', right_on='prospect_codigo', how='inner'
+    ).drop(columns=['prospect_situacao_candidado'])
+    pdt.assert_frame_equal(result, gmt.apply_master_schema(expected))
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datathon_package.join import build_key_index, inner_join_positions, int32_keys
+
+
+@pytest.mark.parametrize('assume_sorted', [False, True])
+@pytest.mark.parametrize('left_ids', [
+    ['3', '1', '2', '1', 'x'],       # chaves repetidas: busca binária com intervalos
+    ['3', '1', '2', '9000000', 'x'],  # únicas e esparsas: busca binária
+    ['3', '1', '2', '9', 'x'],       # únicas e densas: endereçamento direto
+])
+def test_inner_join_positions_follows_pd_merge_order(assume_sorted, left_ids):
+    # Esquerda fora de ordem, chaves repetidas na direita e IDs inválidos
+    left = pd.DataFrame({'ID': left_ids, 'a': range(5)})
+    right = pd.DataFrame({'codigo': ['1', '2', None, '1', '3', '9', '2'], 'b': range(7)})
+
+    index = build_key_index(left['ID'], assume_sorted=assume_sorted)
+    left_rows, right_rows, keys = inner_join_positions(index, right['codigo'])
+
+    expected = pd.merge(
+        left.assign(ID=pd.to_numeric(left['ID'], errors='coerce')).dropna(subset=['ID']),
+        right.assign(codigo=pd.to_numeric(right['codigo'], errors='coerce')).dropna(subset=['codigo']),
+        left_on='ID', right_on='codigo', how='inner'
+    )
+    assert left['a'].to_numpy()[left_rows].tolist() == expected['a'].tolist()
+    assert right['b'].to_numpy()[right_rows].tolist() == expected['b'].tolist()
+    assert (index.lookup is not None) == (left_ids[3] == '9')
+    assert keys.dtype == np.int32
+    assert keys.tolist() == expected['ID'].astype(int).tolist()
+
+
+def test_int32_keys_rejects_out_of_range_ids():
+    with pytest.raises(ValueError):
+        int32_keys(pd.Series([1, 2 ** 40], name='ID'))
@@ -0,0 +1,39 @@
+import pytest
+from datathon_package.metrics import MetricsRegistry
+
+
+def test_counter_renders_prometheus_text_per_label():
+    registry = MetricsRegistry()
+    requests = registry.counter("api_requests_total", "Requisições", ["endpoint", "status"])
+    requests.inc(endpoint="/predict", status=200)
+    requests.inc(endpoint="/predict", status=200)
+    requests.inc(endpoint="/predict", status=500)
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP api_requests_total Requisições", "# TYPE api_requests_total counter"]
+    assert 'api_requests_total{endpoint="/predict",status="200"} 2' in lines
+    assert 'api_requests_total{endpoint="/predict",status="500"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    registry = MetricsRegistry()
+    stages = registry.histogram("api_stage_seconds", "Tempo por etapa", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        stages.observe(value, stage="parse")
+
+    lines = registry.render().splitlines()
+
+    assert 'api_stage_seconds_bucket{stage="parse",le="0.1"} 2' in lines
+    assert 'api_stage_seconds_bucket{stage="parse",le="1"} 3' in lines
+    assert 'api_stage_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'api_stage_seconds_sum{stage="parse"} 3.65' in lines
+    assert stages.count(stage="parse") == 4
+
+
+def test_duplicate_metric_name_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("api_errors_total", "Erros")
+
+    with pytest.raises(ValueError):
+        registry.histogram("api_errors_total", "Erros")
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from datathon_package.model_selection import (
+    cross_validate_oof,
+    threads_per_fold,
+    prepare_training_data,
+    random_oversampling_weights,
+    RESAMPLING_STRATEGIES
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.integers(0, 2, size=(400, 6)), columns=[f"f{i}" for i in range(6)])
+    y = pd.Series(((X['f0'] + X['f1'] + rng.random(400)) > 1.5).astype(int))
+    return X, y
+
+
+def _model():
+    return LGBMClassifier(n_estimators=20, random_state=42, verbose=-1)
+
+
+def test_cross_validate_oof_matches_cross_val_score(data):
+    X, y = data
+
+    metrics, oof, folds = cross_validate_oof(_model(), X, y, cv_folds=5)
+
+    skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    for name in ["accuracy", "precision", "recall", "f1", "roc_auc"]:
+        expected = cross_val_score(_model(), X, y, cv=skf, scoring=name).mean()
+        assert metrics[name] == pytest.approx(expected)
+
+    # Cada linha recebe exatamente uma previsão out-of-fold
+    assert oof.shape == (len(X),)
+    assert ((oof >= 0) & (oof <= 1)).all()
+    assert sorted(np.unique(folds).tolist()) == [0, 1, 2, 3, 4]
+
+
+def test_cross_validate_oof_parallel_matches_sequential(data):
+    X, y = data
+
+    sequential = cross_validate_oof(_model(), X, y, n_jobs=1)
+    parallel = cross_validate_oof(_model(), X, y, n_jobs=3)
+
+    assert sequential[0] == pytest.approx(parallel[0])
+    np.testing.assert_allclose(sequential[1], parallel[1])
+
+
+def test_threads_per_fold_never_below_one(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+    assert threads_per_fold(1) == 8
+    assert threads_per_fold(3) == 2
+    assert threads_per_fold(16) == 1
+
+
+def test_random_oversampling_weights_balance_classes():
+    y = np.array([0] * 8 + [1] * 3)
+
+    weights = random_oversampling_weights(y, random_state=1)
+
+    assert weights[y == 0].tolist() == [1.0] * 8
+    assert weights[y == 1].sum() == 8
+    assert (weights[y == 1] >= 1).all()
+
+
+@pytest.mark.parametrize("resampling", RESAMPLING_STRATEGIES)
+def test_prepare_training_data_strategies(data, resampling):
+    X, y = data
+    y = y.copy()
+    y.iloc[:150] = 0
+
+    model, X_train, y_train, fit_kwargs = prepare_training_data(_model(), X, y, resampling)
+    model.fit(X_train, y_train, **fit_kwargs)
+
+    n_neg, n_pos = (y == 0).sum(), (y == 1).sum()
+    if resampling == "smote":
+        assert (y_train == 1).sum() == (y_train == 0).sum() == n_neg
+    else:
+        assert len(X_train) == len(X)
+    if resampling == "class_weight":
+        assert model.get_params()["class_weight"] == "balanced"
+    if resampling == "scale_pos_weight":
+        assert model.get_params()["scale_pos_weight"] == pytest.approx(n_neg / n_pos)
+    if resampling == "random":
+        assert fit_kwargs["sample_weight"][y.to_numpy() == 1].sum() == n_neg
+
+
+class RecordingModel(LGBMClassifier):
+    """LGBMClassifier que registra o tamanho de cada conjunto de treino."""
+
+    fitted_sizes = []
+
+    def fit(self, X, y, **kwargs):
+        RecordingModel.fitted_sizes.append((len(X), int((np.asarray(y) == 1).sum())))
+        return super().fit(X, y, **kwargs)
+
+
+def test_smote_is_applied_only_to_training_folds(data):
+    X, y = data
+    RecordingModel.fitted_sizes = []
+
+    metrics, oof, folds = cross_validate_oof(
+        RecordingModel(n_estimators=10, verbose=-1), X, y, cv_folds=4, resampling="smote"
+    )
+
+    # OOF só das linhas reais; cada treino de fold balanceado a partir de 3/4 dos dados
+    assert len(oof) == len(X)
+    n_majority = max((y == 0).sum(), (y == 1).sum())
+    for size, n_pos in RecordingModel.fitted_sizes:
+        assert size == 2 * n_pos
+        assert n_pos < n_majority
+
+
+def test_cross_validate_oof_rejects_unknown_strategy(data):
+    X, y = data
+
+    with pytest.raises(ValueError):
+        cross_validate_oof(_model(), X, y, resampling="undersample")
+
@@ -0,0 +1,50 @@
+import json
+import numpy as np
+from datathon_package.profiling import StageProfiler, profile_iter, profile_stage
+
+
+def test_profile_stage_is_a_no_op_without_active_profiler():
+    with profile_stage('merge', rows_in=3) as stage:
+        stage.rows_out = 2
+
+    assert stage.rows_in == 3
+
+
+def test_nested_and_repeated_stages_are_aggregated_by_path():
+    profiler = StageProfiler('teste')
+
+    with profiler.activate():
+        with profile_stage('applicants') as outer:
+            for batch in profile_iter('read_json', [[1, 2], [3]]):
+                with profile_stage('features', rows_in=len(batch)) as stage:
+                    data = np.ones((len(batch), 1000))
+                    stage.rows_out = data.shape[0]
+            outer.rows_out = 3
+
+    records = {record['stage']: record for record in profiler.records()}
+
+    assert list(records) == ['applicants/read_json', 'applicants/features', 'applicants']
+    assert records['applicants/read_json']['calls'] == 2
+    assert records['applicants/read_json']['rows_out'] == 3
+    assert (records['applicants/features']['rows_in'], records['applicants/features']['rows_out']) == (3, 3)
+    assert records['applicants']['wall_s'] >= records['applicants/features']['wall_s'] >= 0
+    assert profiler.wall('applicants') == records['applicants']['wall_s']
+
+
+def test_merge_and_json_report_with_cprofile_dump(tmp_path):
+    child = StageProfiler('prospects')
+    with child.activate():
+        with profile_stage('melt'):
+            pass
+
+    profiler = StageProfiler('bootstrap', cprofile_path=str(tmp_path / 'run.prof'))
+    with profiler.activate():
+        with profile_stage('merge'):
+            sum(range(1000))
+    profiler.merge(child.records(), prefix='prospects')
+
+    report = profiler.write_report(str(tmp_path / 'report.json'))
+
+    assert [record['stage'] for record in report['stages']] == ['merge', 'prospects/melt']
+    assert json.loads((tmp_path / 'report.json').read_text())['name'] == 'bootstrap'
+    assert (tmp_path / 'run.prof').stat().st_size > 0
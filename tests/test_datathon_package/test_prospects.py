@@ -0,0 +1,53 @@
+import json
+import pandas as pd
+import pandas.testing as pdt
+from datathon_package.prospects import TARGET_BY_SITUACAO, build_prospects_frame, process_prospects_data
+
+
+def _prospect(codigo, situacao):
+    return {'nome': 'Fulano', 'codigo': codigo, 'situacao_candidado': situacao, 'comentario': ''}
+
+
+def test_build_prospects_frame_flattens_and_labels():
+    df = pd.DataFrame({
+        'ID': ['2', '1', '3'],
+        'titulo': ['B', 'A', 'C'],
+        'modalidade': ['', '', ''],
+        'prospects': [
+            [_prospect('20', 'Contratado pela Decision'), _prospect('', 'Aprovado')],
+            [_prospect('10', 'Recusado'), _prospect('11', 'Em avaliação pelo RH'), _prospect('12', 'Proposta Aceita')],
+            [],
+        ],
+    })
+
+    result = build_prospects_frame(df, keep_vaga_id=True)
+
+    # Ordenado por vaga e posição na lista; código vazio e situação sem rótulo descartados
+    assert result.columns.tolist() == ['vaga_id', 'prospect_codigo', 'prospect_situacao_candidado', 'target']
+    assert result['vaga_id'].tolist() == ['1', '1', '2']
+    assert result['prospect_codigo'].tolist() == [10, 12, 20]
+    assert result['prospect_codigo'].dtype == 'int32'
+    assert result['target'].tolist() == [0, 1, 1]
+    assert result['target'].dtype == 'uint8'
+
+    without_vaga = build_prospects_frame(df)
+    assert without_vaga.columns.tolist() == ['prospect_codigo', 'prospect_situacao_candidado', 'target']
+
+
+def test_target_by_situacao_labels():
+    assert TARGET_BY_SITUACAO['Aprovado'] == 1
+    assert TARGET_BY_SITUACAO['Desistiu'] == 0
+    assert 'Prospect' not in TARGET_BY_SITUACAO
+
+
+def test_process_prospects_data_without_prospects(tmp_path):
+    path = tmp_path / 'prospects.json'
+    path.write_text(json.dumps({'100': {'titulo': 'Vaga', 'modalidade': '', 'prospects': []}}))
+
+    streamed = process_prospects_data(str(path), chunksize=10, ingest=False)
+    whole = process_prospects_data(str(path), ingest=False)
+
+    # Lido em lotes ou inteiro: frame vazio com as mesmas colunas
+    assert streamed.columns.tolist() == ['prospect_codigo', 'prospect_situacao_candidado', 'target']
+    assert len(streamed) == 0
+    pdt.assert_frame_equal(streamed, whole, check_index_type=False)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from datathon_package.schema import (
+    apply_master_schema,
+    write_master_parquet,
+    read_master_parquet,
+    master_feature_columns
+)
+
+
+def _master():
+    return pd.DataFrame({
+        'ID': pd.array([1, 2, 3], dtype='Int64'),
+        'ind_site': np.array([1, 0, 1], dtype=np.int64),
+        'certificacoes_count': np.array([0, 3, 7], dtype=np.int64),
+        'modalidade': ['PJ', 'CLT', 'PJ'],
+        'prospect_codigo': pd.array([1, 2, 3], dtype='Int64'),
+        'target': [1.0, 0.0, 1.0],
+    })
+
+
+def test_apply_master_schema_uses_compact_dtypes():
+    df = apply_master_schema(_master())
+
+    assert df.dtypes.astype(str).to_dict() == {
+        'ID': 'Int32',
+        'ind_site': 'uint8',
+        'certificacoes_count': 'uint16',
+        'modalidade': 'category',
+        'prospect_codigo': 'Int32',
+        'target': 'uint8',
+    }
+    pd.testing.assert_frame_equal(df.astype(str), _master().astype({'target': int}).astype(str))
+
+
+def test_apply_master_schema_rejects_ids_out_of_int32_range():
+    df = _master().assign(ID=pd.array([1, 2, 2 ** 40], dtype='Int64'))
+
+    with pytest.raises(ValueError):
+        apply_master_schema(df)
+
+
+def test_write_master_parquet_round_trips_schema(tmp_path):
+    path = str(tmp_path / 'master_table.parquet')
+    df = apply_master_schema(pd.concat([_master()] * 10, ignore_index=True))
+
+    write_master_parquet(df, path, row_group_size=8)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 4
+    assert metadata.row_group(0).column(0).compression == 'ZSTD'
+    pd.testing.assert_frame_equal(read_master_parquet(path), df)
+
+    columns = master_feature_columns(path)
+    assert columns == ['ind_site', 'certificacoes_count', 'modalidade', 'target']
+    assert list(read_master_parquet(path, columns=columns).columns) == columns
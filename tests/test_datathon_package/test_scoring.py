@@ -0,0 +1,75 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from datathon_package.applicants import transform_applicants
+from datathon_package.artifact import export_serving_artifact
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.scoring import load_scoring_model, score_applicants_file
+from datathon_package.serving import PredictionService
+from datathon_package.utils import get_engine
+from conftest import make_applicant
+
+
+PAYLOAD = {
+    str(i): make_applicant(
+        sabendo=['Site', 'Indicação de colaborador', 'Indicação de cliente'][i % 3],
+        estado_civil=['Casado', 'Solteiro', ''][i % 3],
+        certificacoes=['', 'AWS, Azure', 'PMP, ITIL, Scrum'][i % 3],
+        remuneracao=['R$115 p/h', '5000', '22000', '350'][i % 4],
+        nivel_profissional=['Pleno', 'Sênior', 'NA', 'Júnior'][i % 4],
+    )
+    for i in range(1, 41)
+}
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    X = transform_applicants(PAYLOAD).drop(columns=['ID'])
+    featurizer = ApplicantFeaturizer().fit(X)
+    y = np.arange(len(X)) % 2
+    model = LGBMClassifier(n_estimators=10, min_child_samples=2, verbose=-1, random_state=0).fit(X, y)
+    path = str(tmp_path / 'serving')
+    export_serving_artifact(model, featurizer, path)
+    return path
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_score_applicants_file_matches_prediction_service(tmp_path, artifact_dir, n_jobs):
+    applicants_path = tmp_path / 'applicants.json'
+    applicants_path.write_text(json.dumps(PAYLOAD))
+    output_path = str(tmp_path / 'scores.parquet')
+
+    stats = score_applicants_file(str(applicants_path), output_path, artifact_dir=artifact_dir, batch_size=7, n_jobs=n_jobs)
+    scores = pd.read_parquet(output_path)
+
+    model, featurizer, version = load_scoring_model(artifact_dir)
+    expected = PredictionService(model, featurizer).predict(PAYLOAD)
+
+    # Mesma ordem do arquivo e mesmos scores da API (que arredonda a probabilidade)
+    assert stats['rows'] == len(PAYLOAD) and stats['model_version'] == version
+    assert scores['applicant_id'].tolist() == list(PAYLOAD)
+    by_id = {result['id']: result for result in expected}
+    assert scores['prediction'].tolist() == [by_id[i]['prediction'] for i in PAYLOAD]
+    np.testing.assert_allclose(scores['probability'], [by_id[i]['probability'] for i in PAYLOAD], atol=5e-5)
+
+
+def test_score_applicants_file_loads_postgres(tmp_path, artifact_dir, monkeypatch):
+    # SQLite como substituto local do PostgreSQL
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+    applicants_path = tmp_path / 'applicants.json'
+    applicants_path.write_text(json.dumps(PAYLOAD))
+
+    score_applicants_file(
+        str(applicants_path), str(tmp_path / 'scores.parquet'), artifact_dir=artifact_dir, postgres_table='applicant_scores'
+    )
+    result = pd.read_sql('SELECT * FROM applicant_scores', get_engine(local=True))
+
+    assert len(result) == len(PAYLOAD)
+    assert set(result.columns) == {'applicant_id', 'prediction', 'probability'}
+
+
+def test_load_scoring_model_without_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_scoring_model(str(tmp_path / 'serving'), str(tmp_path / 'model.pkl'))
@@ -0,0 +1,190 @@
+import threading
+import numpy as np
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.linear_model import LogisticRegression
+from datathon_package.applicants import transform_applicants, flatten_applicant_record
+from datathon_package.featurizer import ApplicantFeaturizer
+from datathon_package.artifact import ServingArtifact
+from datathon_package.cache import PredictionCache, LocalCacheBackend
+from datathon_package.serving import PredictionService, MicroBatcher
+from conftest import make_applicant
+
+
+PAYLOAD = {
+    '1': make_applicant('Site', 'Solteiro', '', 'R$115 p/h', 'Pleno'),
+    '2': make_applicant('Site', 'Casado', 'AWS, Azure', 'R$ 2.500,00 mensal', 'Sênior'),
+    '3': make_applicant('Indicação de colaborador', '', 'PMP', '22000', 'NA'),
+    '4': make_applicant('Indicação de cliente', 'Casado', 'PMP, ITIL, Scrum', '8.000,00', 'Pleno'),
+}
+
+
+@pytest.fixture
+def service():
+    featurizer = ApplicantFeaturizer().fit(transform_applicants(PAYLOAD))
+    X = featurizer.transform(PAYLOAD)
+    model = LogisticRegression().fit(X, [0, 1, 0, 1])
+    return PredictionService(model, featurizer)
+
+
+def test_predict_matches_model_predict(service):
+    X = service.featurizer.transform(PAYLOAD)
+
+    results = service.predict(PAYLOAD)
+
+    # Rótulos e probabilidades de uma única passada equivalem a predict + predict_proba
+    assert [r['id'] for r in results] == [str(i) for i in X.index]
+    assert [r['applicant_id'] for r in results] == list(range(len(X)))
+    assert [r['prediction'] for r in results] == service.model.predict(X).tolist()
+    expected = np.round(service.model.predict_proba(X)[:, 1], 4)
+    np.testing.assert_allclose([r['probability'] for r in results], expected, atol=1e-4)
+
+
+def test_predict_many_splits_results_per_payload(service):
+    payloads = [{'2': PAYLOAD['2']}, {'3': PAYLOAD['3'], '1': PAYLOAD['1']}]
+
+    results = service.predict_many(payloads)
+
+    assert results == [service.predict(payload) for payload in payloads]
+    assert [r['id'] for r in results[1]] == ['1', '3']
+
+
+
+def test_positional_applicant_id_follows_numeric_id_order(service):
+    payload = {'10': PAYLOAD['1'], '2': PAYLOAD['2']}
+    X = service.featurizer.transform(payload)
+
+    results = service.predict(payload)
+
+    # Mesma ordem das linhas do pipeline em lote: '2' antes de '10'
+    assert X.index.tolist() == [2, 10]
+    assert [(r['applicant_id'], r['id']) for r in results] == [(0, '2'), (1, '10')]
+    assert [r['prediction'] for r in results] == service.model.predict(X).tolist()
+    assert service.predict_many([payload, {'3': PAYLOAD['3']}])[0] == results
+
+def test_micro_batcher_groups_concurrent_requests():
+    calls = []
+    release = threading.Event()
+
+    def batch_fn(items):
+        calls.append(list(items))
+        release.wait(1)
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(5)]
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == [0, 2, 4, 6, 8]
+    assert sum(len(c) for c in calls) == 5
+    assert len(calls) < 5
+
+
+def test_micro_batcher_isolates_failing_item():
+    def batch_fn(items):
+        if 'bad' in items:
+            raise ValueError('payload inválido')
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    good, bad = batcher.submit('ok'), batcher.submit('bad')
+
+    assert good.result(timeout=5) == 'OK'
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+
+
+def test_warm_up_marks_service_ready(service):
+    assert not service.ready
+
+    service.warm_up()
+
+    assert service.ready
+
+
+def test_cached_applicants_skip_the_model(service, monkeypatch):
+    service.cache = PredictionCache(LocalCacheBackend(max_entries=100), model_version='v1')
+    first = service.predict(PAYLOAD)
+
+    calls = []
+    original = service.model.predict_proba
+    monkeypatch.setattr(service.model, 'predict_proba', lambda X: calls.append(len(X)) or original(X))
+
+    # Mesmo conteúdo com outro ID reaproveita o resultado; só o candidato novo é pontuado
+    payload = {'10': PAYLOAD['1'], '5': make_applicant('Site', 'Viúvo', '', '', 'Júnior')}
+    results = service.predict(payload)
+
+    assert calls == [1]
+    assert results[1] == {**first[0], 'applicant_id': 1, 'id': '10'}
+    assert service.cache.stats()['hits'] == 1
+    assert service.predict(PAYLOAD) == first
+
+
+
+def test_reload_between_scoring_and_caching_keeps_scored_version(service, monkeypatch):
+    class SwappableStore:
+        def __init__(self, artifact):
+            self.artifact = artifact
+
+        def get(self):
+            return self.artifact
+
+    old = ServingArtifact(service.model, service.featurizer, {'checksum': 'old' * 6})
+    new = ServingArtifact(service.model, service.featurizer, {'checksum': 'new' * 6})
+    store = SwappableStore(old)
+    cache = PredictionCache(LocalCacheBackend(max_entries=100), model_version='boot')
+    reloading = PredictionService(store=store, cache=cache)
+
+    # O reload acontece depois da pontuação e antes da escrita no cache
+    original = reloading.score
+    monkeypatch.setattr(reloading, 'score', lambda *args: (setattr(store, 'artifact', new), original(*args))[1])
+    results = reloading.predict(PAYLOAD)
+
+    rows = [flatten_applicant_record(i, PAYLOAD[i]) for i in sorted(PAYLOAD)]
+    assert cache.model_version == 'boot'
+    assert cache.get_many(rows, old.version) == [(r['prediction'], r['probability']) for r in results]
+    assert cache.get_many(rows, new.version) == [None] * len(rows)
+    assert reloading.model_version == new.version
+
+def test_scoring_call_counters_are_exact_across_threads(service):
+    X = service.featurizer.transform(PAYLOAD).to_numpy()
+
+    threads = [threading.Thread(target=lambda: [service.score(X) for _ in range(50)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.fallback_calls == 400 and service.native_calls == 0
+
+
+def test_lightgbm_model_uses_native_booster_with_same_results():
+    payload = {str(i): PAYLOAD[str(i % 4 + 1)] for i in range(1, 41)}
+    featurizer = ApplicantFeaturizer().fit(transform_applicants(PAYLOAD))
+    X = featurizer.transform(payload)
+    y = [i % 2 for i in range(len(X))]
+    model = LGBMClassifier(n_estimators=10, min_child_samples=2, verbose=-1).fit(X, y)
+
+    native = PredictionService(model, featurizer)
+    wrapper = PredictionService(model, featurizer, use_native=False)
+
+    assert native.fast_path and not wrapper.fast_path
+    assert native.predict(payload) == wrapper.predict(payload)
+    assert (native.native_calls, native.fallback_calls) == (1, 0)
+    assert (wrapper.native_calls, wrapper.fallback_calls) == (0, 1)
+
+
+def test_non_lightgbm_model_falls_back_to_predict_proba(service):
+    service.predict(PAYLOAD)
+
+    assert not service.fast_path
+    assert (service.native_calls, service.fallback_calls) == (0, 1)
+
+
+def test_stage_observer_receives_featurize_and_predict(service):
+    stages = []
+    service.stage_observer = lambda stage, seconds, n_rows: stages.append((stage, n_rows, seconds >= 0))
+
+    service.predict(PAYLOAD)
+
+    assert stages == [('featurize', 4, True), ('predict', 4, True)]
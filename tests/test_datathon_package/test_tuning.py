@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datathon_package.tuning import random_search, sample_lgbm_params
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.integers(0, 2, size=(600, 6)), columns=[f"f{i}" for i in range(6)])
+    y = pd.Series(((X['f0'] + X['f1'] + rng.random(600)) > 1.5).astype(int))
+    return X, y
+
+
+GOOD_PARAMS = {"learning_rate": 0.1, "num_leaves": 15, "min_child_samples": 10}
+# Sem nenhum split possível: AUC 0.5
+BAD_PARAMS = {"learning_rate": 0.1, "num_leaves": 15, "min_child_samples": 10000}
+
+
+def test_sample_lgbm_params_within_space():
+    params = sample_lgbm_params(np.random.default_rng(1))
+
+    assert 0.01 <= params["learning_rate"] <= 0.3
+    assert 8 <= params["num_leaves"] < 256
+    assert 0.4 <= params["colsample_bytree"] <= 1.0
+
+
+def test_random_search_reports_every_trial_and_best(data):
+    X, y = data
+    logged = []
+
+    result = random_search(
+        X, y, n_trials=3, n_jobs=2, cv_folds=3,
+        on_trial_end=lambda number, trial: logged.append(number)
+    )
+
+    assert sorted(logged) == [0, 1, 2]
+    assert len(result["trials"]) == 3
+    best = result["best"]
+    assert best["status"] == "completed"
+    assert best["score"] == max(t["score"] for t in result["trials"] if t["status"] == "completed")
+    assert best["n_estimators"] >= 1
+
+
+def test_random_search_prunes_losing_trials(data):
+    X, y = data
+    params_by_trial = iter([GOOD_PARAMS, BAD_PARAMS, BAD_PARAMS])
+
+    result = random_search(
+        X, y, n_trials=3, n_jobs=1, cv_folds=4, prune_after_folds=2,
+        sample_params=lambda rng: dict(next(params_by_trial))
+    )
+
+    statuses = [t["status"] for t in result["trials"]]
+    assert statuses == ["completed", "pruned", "pruned"]
+    assert [len(t["fold_scores"]) for t in result["trials"]] == [4, 2, 2]
+    assert result["best"]["params"] == GOOD_PARAMS
+
+
+def test_random_search_requires_a_budget(data):
+    X, y = data
+
+    with pytest.raises(ValueError):
+        random_search(X, y, n_trials=None, time_budget=None)
+
+    # Orçamento já esgotado: nenhum trial
+    assert random_search(X, y, n_trials=None, time_budget=0)["best"] is None
@@ -1,6 +1,14 @@
+import csv
+import json
+import re
+import sqlite3
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
-from datathon_package.utils import transpose_and_prepare_dataframe, expand_dict_column, remove_invalid_prospect_codigo, detect_nulls_and_nans, drop_constant_binary_columns
+from sqlalchemy import create_engine, inspect
+from datathon_package import utils
+from datathon_package.utils import transpose_and_prepare_dataframe, expand_dict_column, remove_invalid_prospect_codigo, detect_nulls_and_nans, drop_constant_binary_columns, iter_json_batches, coerce_numeric_ids, sort_ids
+from datathon_package.utils import ingest_dataframe_to_postgres, upsert_dataframe_to_postgres, get_engine
 
 def test_transpose_and_prepare_dataframe():
     # DataFrame de entrada
@@ -107,3 +115,104 @@ def test_drop_constant_binary_columns():
 
     # Verifica igualdade ignorando índice
     pdt.assert_frame_equal(result_df.reset_index(drop=True), expected_df.reset_index(drop=True))
+
+
+def test_iter_json_batches(tmp_path):
+    # Arquivo no formato {ID: registro} dos exports brutos
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps({'1': {'a': 1}, '2': {'a': 2.5}, '3': {'a': None}}))
+
+    batches = list(iter_json_batches(str(path), batch_size=2))
+
+    # Lotes de tamanho fixo, na ordem do arquivo, com floats nativos
+    assert batches == [[('1', {'a': 1}), ('2', {'a': 2.5})], [('3', {'a': None})]]
+    assert isinstance(batches[0][1][1]['a'], float)
+
+
+def test_coerce_numeric_ids():
+    assert coerce_numeric_ids(pd.Series(['10', '2'])).tolist() == [10, 2]
+    assert coerce_numeric_ids(pd.Series(['10', 'abc'])).tolist() == ['10', 'abc']
+
+
+def test_sort_ids():
+    assert sort_ids(['10', '2', '1']) == ['1', '2', '10']
+    assert sort_ids(['10', 'abc', '2']) == ['10', '2', 'abc']
+
+
+def test_ingest_dataframe_to_postgres_replace_and_append(tmp_path, monkeypatch):
+    # SQLite como substituto local do PostgreSQL
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    df = pd.DataFrame({'ID': [1, 2], 'flag': [0, 1]})
+    ingest_dataframe_to_postgres(df, local=True, table_name="applicants", if_exists="replace")
+    # Replace troca a tabela inteira (inclusive o schema) pela staging
+    ingest_dataframe_to_postgres(df.assign(extra=['a', 'b']), local=True, table_name="applicants", if_exists="replace")
+    ingest_dataframe_to_postgres(df.assign(ID=[3, 4], extra=['c', 'd']), local=True, table_name="applicants", if_exists="append")
+
+    engine = get_engine(local=True)
+    result = pd.read_sql('SELECT * FROM applicants ORDER BY "ID"', engine)
+
+    assert result['ID'].tolist() == [1, 2, 3, 4]
+    assert result['extra'].tolist() == ['a', 'b', 'c', 'd']
+    assert not inspect(engine).has_table("applicants__staging")
+    # O mesmo engine é reutilizado no processo
+    assert get_engine(local=True) is engine
+
+
+
+class CopyCursor(sqlite3.Cursor):
+    """Cursor do SQLite que executa o COPY ... FROM STDIN (CSV) como o PostgreSQL e registra cada chamada."""
+
+    def copy_expert(self, sql, file):
+        payload = file.read()
+        self.connection.copies.append((sql, payload))
+        table, columns, null = re.match(r"COPY (\S+) \((.*)\) FROM STDIN WITH \(FORMAT csv, NULL '(.*)'\)", sql).groups()
+        rows = [[None if value == null else value for value in row] for row in csv.reader(payload.splitlines())]
+        placeholders = ", ".join("?" for _ in columns.split(", "))
+        self.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+
+class CopyConnection(sqlite3.Connection):
+    copies = []
+
+    def cursor(self, factory=CopyCursor):
+        return super().cursor(factory)
+
+
+def test_ingest_uses_copy_on_postgres_and_swaps_staging(tmp_path, monkeypatch):
+    path = str(tmp_path / 'db.sqlite')
+    engine = create_engine("sqlite://", creator=lambda: sqlite3.connect(path, factory=CopyConnection))
+    # Mesmo caminho do PostgreSQL (COPY) sobre o SQLite
+    engine.dialect.name = "postgresql"
+    monkeypatch.setattr(utils, 'get_engine', lambda local: engine)
+    monkeypatch.setattr(CopyConnection, 'copies', [])
+
+    ingest_dataframe_to_postgres(pd.DataFrame({'ID': [9], 'nome': ['antigo']}), local=True, table_name="applicants")
+    df = pd.DataFrame({'ID': [1, 2, 3], 'nome': ['a', '', None], 'valor': [1.5, np.nan, 3.0]})
+    ingest_dataframe_to_postgres(df, local=True, table_name="applicants", if_exists="replace")
+
+    sql, payload = CopyConnection.copies[-1]
+    assert sql == 'COPY applicants__staging ("ID", nome, valor) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+    assert payload == '1,a,1.5\n2,,\\N\n3,\\N,3.0\n'
+
+    result = pd.read_sql('SELECT * FROM applicants ORDER BY "ID"', engine)
+    # String vazia continua vazia e nulos continuam nulos, como no to_sql
+    assert result['ID'].tolist() == [1, 2, 3]
+    assert result['nome'].tolist() == ['a', '', None]
+    assert result['valor'].isna().tolist() == [False, True, False]
+    assert not inspect(engine).has_table("applicants__staging")
+
+def test_upsert_dataframe_to_postgres(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    ingest_dataframe_to_postgres(pd.DataFrame({'ID': [1, 2, 3], 'valor': [10, 20, 30]}), local=True, table_name="master_table")
+
+    # ID 2 alterado, ID 3 removido, ID 4 novo
+    upsert_dataframe_to_postgres(
+        pd.DataFrame({'ID': [2, 4], 'valor': [21, 40]}),
+        local=True, table_name="master_table", key_column='ID', keys=[2, 3, 4]
+    )
+
+    result = pd.read_sql('SELECT * FROM master_table ORDER BY "ID"', get_engine(local=True))
+    expected = pd.DataFrame({'ID': [1, 2, 4], 'valor': [10, 21, 40]})
+    pdt.assert_frame_equal(result, expected)